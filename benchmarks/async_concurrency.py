@@ -0,0 +1,111 @@
+"""Concurrent analytics requests: thread per request vs. one asyncio event loop.
+
+Both sides issue the same mix of analytics queries through a pool of
+--pool-size connections, with --requests of them in flight at once. The
+threaded side needs one thread per in-flight request; the asyncio side runs
+every request on a single thread. Expects data to be imported already and
+reads the usual DB_* environment variables:
+
+    python benchmarks/async_concurrency.py --requests 200 400 --pool-size 20
+"""
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+
+from mysql_room_manager.config.db_config import DbConfig
+from mysql_room_manager.database.conn_manager import ConnManager
+from mysql_room_manager.database.async_conn_manager import AsyncConnManager
+from mysql_room_manager.data.repositories.analytics_repo import AnalyticsRepo
+from mysql_room_manager.data.repositories.variant_repo import VariantRepo
+from mysql_room_manager.data.repositories.async_analytics_repo import AsyncAnalyticsRepo
+
+REQUEST_MIX = (
+    ('get_top_rooms_by_avg_age', (5,)),
+    ('get_top_rooms_by_age_diff', (5,)),
+    ('get_mixed_gender_rooms', ()),
+    ('get_rooms_with_student_count', ())
+)
+
+
+def summarize(latencies, wall, peak_threads) -> dict:
+    latencies.sort()
+    return {
+        'throughput': len(latencies) / wall,
+        'p50_ms': latencies[len(latencies) // 2] * 1000,
+        'p95_ms': latencies[int(len(latencies) * 0.95)] * 1000,
+        'mean_ms': statistics.mean(latencies) * 1000,
+        'threads': peak_threads
+    }
+
+
+def run_threaded(config: DbConfig, requests: int) -> dict:
+    conn_manager = ConnManager(config)
+    repo = AnalyticsRepo(conn_manager, VariantRepo(conn_manager))
+    peak_threads = [threading.active_count()]
+
+    def request(i):
+        method, args = REQUEST_MIX[i % len(REQUEST_MIX)]
+        started = time.perf_counter()
+        getattr(repo, method)(*args)
+        peak_threads[0] = max(peak_threads[0], threading.active_count())
+        return time.perf_counter() - started
+
+    try:
+        repo.get_query('rooms_with_student_count')
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=requests) as executor:
+            latencies = list(executor.map(request, range(requests)))
+        wall = time.perf_counter() - started
+    finally:
+        conn_manager.disconnect()
+    return summarize(latencies, wall, peak_threads[0])
+
+
+async def run_async(config: DbConfig, requests: int) -> dict:
+    conn_manager = AsyncConnManager(config)
+    repo = AsyncAnalyticsRepo(conn_manager)
+
+    async def request(i):
+        method, args = REQUEST_MIX[i % len(REQUEST_MIX)]
+        started = time.perf_counter()
+        await getattr(repo, method)(*args)
+        return time.perf_counter() - started
+
+    try:
+        # resolve variant choices once instead of in every task
+        await repo.get_query('rooms_with_student_count')
+        started = time.perf_counter()
+        latencies = await asyncio.gather(*(request(i) for i in range(requests)))
+        wall = time.perf_counter() - started
+    finally:
+        await conn_manager.disconnect()
+    return summarize(list(latencies), wall, threading.active_count())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, nargs='+', default=[50, 200, 500],
+                        help='concurrent requests per round')
+    parser.add_argument('--pool-size', type=int, default=20)
+    args = parser.parse_args()
+
+    base = DbConfig.from_env()
+    config = replace(base, pool_size=args.pool_size, pool_min_size=args.pool_size,
+                     pool_checkout_timeout=max(base.pool_checkout_timeout, 60.0))
+
+    for requests in args.requests:
+        for label, result in (
+            ("threads", run_threaded(replace(config, pool_name="bench_threads"), requests)),
+            ("asyncio", asyncio.run(run_async(replace(config, pool_name="bench_asyncio"), requests)))
+        ):
+            print(f"{requests:>5} in flight, {label}: {result['throughput']:8.1f} req/s  "
+                  f"p50 {result['p50_ms']:8.1f}ms  p95 {result['p95_ms']:8.1f}ms  "
+                  f"mean {result['mean_ms']:8.1f}ms  threads {result['threads']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""CLI startup cost per subcommand, measured with `python -X importtime`.
+
+Runs `python -m mysql_room_manager [COMMAND] --help` in fresh interpreters
+and reports wall time, total import time and how many modules were
+loaded. Exits with status 1 when a run is slower than --max-ms or loads
+one of the --forbid modules, so it doubles as a startup regression check:
+
+    python benchmarks/cli_startup.py --repeat 5 --max-ms 150
+
+--help never reaches a handler, so none of the runs should import
+mysql.connector, tabulate or the services.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Sequence
+
+from mysql_room_manager.constants import Commands
+
+FORBIDDEN = ['mysql.connector', 'tabulate', 'mysql_room_manager.services', 'mysql_room_manager.database']
+
+
+def commands() -> List[List[str]]:
+    names = [value for key, value in vars(Commands).items() if not key.startswith('_')]
+    return [['--help']] + [[name, '--help'] for name in names]
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """Module → self import time in microseconds."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = int(self_us)
+    return modules
+
+
+def measure(argv: Sequence[str], repeat: int) -> Dict[str, object]:
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    walls, imports, modules = [], [], {}
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-m', 'mysql_room_manager', *argv],
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, env=env
+        )
+        walls.append(time.perf_counter() - started)
+        modules = parse_importtime(result.stderr)
+        imports.append(sum(modules.values()) / 1e6)
+    return {
+        'wall_ms': statistics.median(walls) * 1000,
+        'import_ms': statistics.median(imports) * 1000,
+        'modules': len(modules),
+        'loaded': set(modules)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--max-ms', type=float, help='fail when the median wall time exceeds this')
+    parser.add_argument('--forbid', nargs='*', default=FORBIDDEN, metavar='MODULE',
+                        help='fail when one of these modules (or their submodules) is imported')
+    args = parser.parse_args()
+
+    failures = []
+    for argv in commands():
+        label = ' '.join(argv)
+        result = measure(argv, args.repeat)
+        forbidden = sorted(
+            name for name in result['loaded']
+            if any(name == prefix or name.startswith(prefix + '.') for prefix in args.forbid)
+        )
+        print(f"{label:<20} wall {result['wall_ms']:7.1f}ms  imports {result['import_ms']:7.1f}ms  "
+              f"{result['modules']:4d} modules")
+        if forbidden:
+            failures.append(f"{label}: imported {', '.join(forbidden[:5])}")
+        if args.max_ms is not None and result['wall_ms'] > args.max_ms:
+            failures.append(f"{label}: {result['wall_ms']:.1f}ms over the {args.max_ms:.0f}ms budget")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Load test for the `serve` command: keep-alive clients hammering a mix of endpoints.
+
+Start the server first (`python -m mysql_room_manager serve`), then:
+
+    python benchmarks/http_load.py --connections 50 --duration 10
+
+Each connection sends GET requests back to back for --duration seconds,
+cycling through --paths from a random offset. Prints throughput, latency
+percentiles, status codes and the server's /stats afterwards.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+DEFAULT_PATHS = [
+    '/analytics/room-counts',
+    '/analytics/youngest-rooms?limit=5',
+    '/analytics/age-gaps?limit=5',
+    '/analytics/mixed-gender',
+    '/analytics/age-percentiles',
+    '/rooms/1',
+    '/rooms/1/students',
+    '/students/1'
+]
+
+
+async def request(reader, writer, host: str, path: str):
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode('latin-1'))
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    body = await reader.readexactly(length)
+    return status, body
+
+
+async def client(host: str, port: int, paths, deadline: float, rng: random.Random, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    i = rng.randrange(len(paths))
+    try:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            status, _ = await request(reader, writer, host, paths[i % len(paths)])
+            latencies.append(time.perf_counter() - started)
+            statuses[status] += 1
+            i += 1
+    finally:
+        writer.close()
+
+
+async def run(args) -> None:
+    url = urlsplit(args.url)
+    host, port = url.hostname, url.port or 80
+    rng = random.Random(args.seed)
+    latencies, statuses = [], Counter()
+
+    started = time.perf_counter()
+    deadline = started + args.duration
+    await asyncio.gather(*(
+        client(host, port, args.paths, deadline, random.Random(rng.random()), latencies, statuses)
+        for _ in range(args.connections)
+    ))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    if not latencies:
+        print("No requests completed")
+        return
+    pct = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+    print(f"{len(latencies)} requests over {args.connections} connections in {wall:.1f}s: "
+          f"{len(latencies) / wall:.1f} req/s")
+    print(f"latency p50 {pct(0.50):.1f}ms  p95 {pct(0.95):.1f}ms  p99 {pct(0.99):.1f}ms  "
+          f"max {latencies[-1] * 1000:.1f}ms")
+    print(f"status codes: {dict(statuses)}")
+
+    reader, writer = await asyncio.open_connection(host, port)
+    _, body = await request(reader, writer, host, '/stats')
+    writer.close()
+    print(f"server stats: {json.dumps(json.loads(body), indent=2)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default='http://127.0.0.1:8080')
+    parser.add_argument('--connections', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=10.0, metavar='SECONDS')
+    parser.add_argument('--paths', nargs='+', default=DEFAULT_PATHS)
+    parser.add_argument('--seed', type=int, default=42)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
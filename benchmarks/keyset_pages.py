@@ -0,0 +1,106 @@
+"""Keyset pagination: does page N read as few rows as page 1?
+
+Walks `StudentRepo.query` to page --pages for each filter shape, then runs
+EXPLAIN ANALYZE on the first and the last page and compares the rows the
+index scan actually read, along with the access type from EXPLAIN and the
+best-of-N latency. Needs a large dataset in the database configured
+through the usual DB_* environment variables (see the `generate` command):
+
+    python benchmarks/keyset_pages.py --pages 200 --limit 100 --room-id 1
+
+Exits with status 1 when a deep page reads more than twice the rows of
+the first one, i.e. when the seek condition is not range-optimized and
+each page re-scans everything before its cursor.
+"""
+import argparse
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from mysql_room_manager.config.db_config import DbConfig
+from mysql_room_manager.database.conn_manager import ConnManager
+from mysql_room_manager.database.optimizer import Optimizer
+from mysql_room_manager.data.repositories.student_repo import StudentRepo
+from mysql_room_manager.models.query import StudentFilter
+
+
+def filter_cases(room_id: int, min_age: int, max_age: int) -> List[Tuple[str, StudentFilter]]:
+    return [
+        ('all students', StudentFilter()),
+        ('age range', StudentFilter(min_age=min_age, max_age=max_age)),
+        ('room', StudentFilter(room_id=room_id)),
+        ('room + sex', StudentFilter(room_id=room_id, sex='F')),
+        ('room + age range', StudentFilter(room_id=room_id, min_age=min_age, max_age=max_age))
+    ]
+
+
+def walk(repo: StudentRepo, filters: StudentFilter, pages: int, limit: int) -> Tuple[Optional[tuple], int]:
+    """Cursor of the last page reachable within ``pages`` pages, and that page's number."""
+    after, page = None, 1
+    while page < pages:
+        next_cursor = repo.query(filters, after, limit).next_cursor
+        if next_cursor is None:
+            break
+        after, page = next_cursor, page + 1
+    return after, page
+
+
+def measure(repo: StudentRepo, optimizer: Optimizer, filters: StudentFilter,
+            after: Optional[tuple], limit: int, repeat: int) -> Dict[str, Any]:
+    query, params, _, _ = repo.build_page_query(filters, after, limit)
+    tables = list(optimizer.iter_plan_tables(optimizer.explain_plan(query, params)))
+    analyzed = optimizer.explain_analyze(query, params)
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        repo.query(filters, after, limit)
+        timings.append(time.perf_counter() - started)
+
+    return {
+        'access_type': tables[0].get('access_type') if tables else '?',
+        'key': tables[0].get('key') if tables else '?',
+        # the scan is the deepest node; it reports what was read from the index
+        'rows_read': max((node['rows'] * max(node['loops'], 1) for node in analyzed['nodes']), default=0),
+        'ms': min(timings) * 1000
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=200, help='page to compare against the first one')
+    parser.add_argument('--limit', type=int, default=100)
+    parser.add_argument('--room-id', type=int, default=1)
+    parser.add_argument('--min-age', type=int, default=18)
+    parser.add_argument('--max-age', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    conn_manager = ConnManager(DbConfig.from_env())
+    conn_manager.query_timeout = None
+    repo = StudentRepo(conn_manager)
+    optimizer = Optimizer(conn_manager)
+    failures = []
+    try:
+        # EXPLAIN ANALYZE has to see the same data as the walk
+        with conn_manager.pin_primary():
+            for label, filters in filter_cases(args.room_id, args.min_age, args.max_age):
+                after, page = walk(repo, filters, args.pages, args.limit)
+                first = measure(repo, optimizer, filters, None, args.limit, args.repeat)
+                deep = measure(repo, optimizer, filters, after, args.limit, args.repeat)
+                for name, result in (("page 1", first), (f"page {page}", deep)):
+                    print(f"{label:<18} {name:>9}: {result['access_type']:<6} {result['key'] or '-':<22} "
+                          f"{result['rows_read']:8d} rows read  {result['ms']:7.2f}ms")
+                if page > 1 and deep['rows_read'] > 2 * max(first['rows_read'], args.limit + 1):
+                    failures.append(f"{label}: page {page} read {deep['rows_read']} rows, "
+                                    f"page 1 read {first['rows_read']}")
+    finally:
+        conn_manager.disconnect()
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
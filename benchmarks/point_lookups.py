@@ -0,0 +1,74 @@
+"""Point-lookup latency: text protocol vs. the prepared-statement cache.
+
+Runs against the database configured through the usual DB_* environment
+variables and expects data to be imported already. The cache is off by
+default; the prepared run uses DB_STMT_CACHE_SIZE, or 32 when it is unset:
+
+    python benchmarks/point_lookups.py --iterations 20000
+"""
+import argparse
+import random
+import statistics
+import time
+from dataclasses import replace
+
+from mysql_room_manager.config.db_config import DbConfig
+from mysql_room_manager.database.conn_manager import ConnManager
+from mysql_room_manager.data.repositories.student_repo import StudentRepo
+from mysql_room_manager.data.repositories.room_repo import RoomRepo
+
+
+def run_lookups(config: DbConfig, iterations: int, seed: int) -> dict:
+    conn_manager = ConnManager(config)
+    student_repo = StudentRepo(conn_manager)
+    room_repo = RoomRepo(conn_manager)
+    
+    student_total = student_repo.count_students()
+    room_total = room_repo.count_rooms()
+    rng = random.Random(seed)
+    latencies = []
+    
+    for i in range(iterations):
+        started = time.perf_counter()
+        if i % 10 == 9:
+            student_repo.count_students()
+        elif i % 2:
+            room_repo.get_room_by_id(rng.randrange(max(room_total, 1)))
+        else:
+            student_repo.get_student_by_id(rng.randrange(max(student_total, 1)))
+        latencies.append(time.perf_counter() - started)
+    
+    conn_manager.disconnect()
+    latencies.sort()
+    return {
+        'mean_us': statistics.mean(latencies) * 1e6,
+        'p50_us': latencies[len(latencies) // 2] * 1e6,
+        'p95_us': latencies[int(len(latencies) * 0.95)] * 1e6,
+        'p99_us': latencies[int(len(latencies) * 0.99)] * 1e6,
+        'stmt_cache': student_repo.stmt_cache.stats()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    
+    base = DbConfig.from_env()
+    variants = [
+        ("text protocol", replace(base, stmt_cache_size=0, pool_name="bench_text")),
+        ("prepared cache", replace(base, stmt_cache_size=base.stmt_cache_size or 32,
+                                   pool_name="bench_prepared"))
+    ]
+    
+    for label, config in variants:
+        result = run_lookups(config, args.iterations, args.seed)
+        print(f"{label:>15}: mean {result['mean_us']:8.1f}us  p50 {result['p50_us']:8.1f}us  "
+              f"p95 {result['p95_us']:8.1f}us  p99 {result['p99_us']:8.1f}us")
+        if config.stmt_cache_size:
+            print(f"{'':>15}  student stmt cache: {result['stmt_cache']}")
+
+
+if __name__ == '__main__':
+    main()
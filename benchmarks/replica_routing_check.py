@@ -0,0 +1,246 @@
+"""Replica routing check: ReplicaRouter and ConnManager driven by in-memory fake pools.
+
+No database is needed. Every pool is a FakePool handing out PooledConn
+wrappers around fake connections, so the checks exercise the real
+routing code:
+
+    python benchmarks/replica_routing_check.py
+
+Covers least-busy selection with round-robin ties, mark-down and retry
+after a failed checkout, the fallback to the primary when no replica can
+serve, pin_primary() and the read-your-writes window after a commit.
+Exits with status 1 when a check fails.
+"""
+import argparse
+import itertools
+import sys
+import time
+from collections import Counter
+from dataclasses import replace
+from typing import Callable, Dict, List, Optional, Tuple
+
+from mysql_room_manager.config.db_config import DbConfig
+from mysql_room_manager.database.conn_manager import ConnManager
+from mysql_room_manager.database.conn_pool import PooledConn
+from mysql_room_manager.database.replica_router import ReplicaRouter
+from mysql_room_manager.exceptions.exceptions import DbConnError
+
+REPLICAS = ['replica-a', 'replica-b', 'replica-c']
+_connection_ids = itertools.count(1)
+
+
+class FakeCnx:
+
+    def __init__(self, host: str):
+        self.host = host
+        self.connection_id = next(_connection_ids)
+
+    def is_connected(self) -> bool:
+        return True
+
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        pass
+
+
+class FakePool:
+    """Just enough of ConnPool for the router and PooledConn; ``down`` makes checkouts fail."""
+
+    def __init__(self, config: DbConfig, on_commit: Optional[Callable[[], None]] = None):
+        self.config = config
+        self.on_commit = on_commit
+        self.down = False
+        self.in_use = 0
+        self.checkouts = 0
+
+    def get_connection(self) -> PooledConn:
+        if self.down:
+            raise DbConnError(f"{self.config.host} is down", self.config.host, self.config.database)
+        self.in_use += 1
+        self.checkouts += 1
+        return PooledConn(self, FakeCnx(self.config.host))
+
+    def release(self, cnx: FakeCnx) -> None:
+        self.in_use -= 1
+
+    def close_all(self) -> None:
+        pass
+
+    def stats(self) -> Dict[str, int]:
+        return {'in_use': self.in_use, 'checkouts': self.checkouts}
+
+
+class FakePoolConnManager(ConnManager):
+    """ConnManager whose primary and replica pools are taken from ``pools``, keyed by host."""
+
+    pools: Dict[str, FakePool] = {}
+
+    @staticmethod
+    def _new_pool(config: DbConfig, prewarm: int, on_commit=None) -> FakePool:
+        pool = FakePoolConnManager.pools[config.host]
+        pool.on_commit = on_commit
+        return pool
+
+
+def fake_pools(config: DbConfig) -> Dict[str, FakePool]:
+    return {c.host: FakePool(c) for c in [config] + config.replica_configs()}
+
+
+def endpoint_stats(router: ReplicaRouter, host: str) -> Dict:
+    return router.stats()[f"{host}:{DbConfig().port}"]
+
+
+def make_router(retry_interval: float) -> Tuple[ReplicaRouter, Dict[str, FakePool]]:
+    config = DbConfig(replicas=REPLICAS)
+    pools = fake_pools(config)
+    router = ReplicaRouter(config.replica_configs(), lambda c: pools[c.host], retry_interval=retry_interval)
+    return router, pools
+
+
+def check_least_busy(retry_interval: float) -> List[str]:
+    router, _ = make_router(retry_interval)
+    failures = []
+
+    held = [router.checkout() for _ in range(len(REPLICAS) * 2)]
+    loads = Counter(conn.host for conn in held)
+    if sorted(loads.values()) != [2] * len(REPLICAS):
+        failures.append(f"least busy: {len(held)} held checkouts spread as {dict(loads)}")
+
+    # leave replica-a with 2 in use, replica-b with 1 and replica-c idle
+    for conn in [c for c in held if c.host == 'replica-c'] + [c for c in held if c.host == 'replica-b'][:1]:
+        held.remove(conn)
+        conn.close()
+    conn = router.checkout()
+    if conn.host != 'replica-c':
+        failures.append(f"least busy: expected replica-c with a=2, b=1, c=0 in use, got {conn.host}")
+    conn.close()
+    for conn in held:
+        conn.close()
+
+    hosts = Counter()
+    for _ in range(30):
+        conn = router.checkout()
+        hosts[conn.host] += 1
+        conn.close()
+    if sorted(hosts.values()) != [10, 10, 10]:
+        failures.append(f"round robin: 30 checkouts at equal load spread as {dict(hosts)}")
+    return failures
+
+
+def check_mark_down(retry_interval: float) -> List[str]:
+    router, pools = make_router(retry_interval)
+    failures = []
+
+    pools['replica-b'].down = True
+    hosts = set()
+    for _ in range(len(REPLICAS) * 3):
+        conn = router.checkout()
+        if conn is None:
+            failures.append("mark down: no replica served while two were healthy")
+            break
+        hosts.add(conn.host)
+        conn.close()
+    stats = endpoint_stats(router, 'replica-b')
+    if 'replica-b' in hosts:
+        failures.append("mark down: a failing replica served a checkout")
+    if stats['healthy'] or stats['failures'] != 1:
+        failures.append(f"mark down: expected replica-b down after one failure, got {stats}")
+
+    pools['replica-b'].down = False
+    time.sleep(retry_interval * 1.5)
+    hosts = set()
+    for _ in range(len(REPLICAS)):
+        conn = router.checkout()
+        hosts.add(conn.host)
+        conn.close()
+    if 'replica-b' not in hosts or not endpoint_stats(router, 'replica-b')['healthy']:
+        failures.append(f"retry: replica-b not back in rotation after {retry_interval:g}s")
+    return failures
+
+
+def make_conn_manager(retry_interval: float, window: float) -> FakePoolConnManager:
+    config = replace(DbConfig(), host='primary', replicas=REPLICAS,
+                     replica_retry_interval=retry_interval, read_your_writes_window=window)
+    FakePoolConnManager.pools = fake_pools(config)
+    conn_manager = FakePoolConnManager(config)
+    # no deadlines, so the watchdog never tries to open a killer connection
+    conn_manager.query_timeout = None
+    return conn_manager
+
+
+def read_host(conn_manager: ConnManager) -> str:
+    with conn_manager.get_conn(read_only=True) as conn:
+        return conn.host
+
+
+def check_primary_fallback(retry_interval: float) -> List[str]:
+    conn_manager = make_conn_manager(retry_interval, window=0.0)
+    failures = []
+    try:
+        if read_host(conn_manager) == 'primary':
+            failures.append("fallback: a read went to the primary while replicas were up")
+
+        for host in REPLICAS:
+            FakePoolConnManager.pools[host].down = True
+        hosts = [read_host(conn_manager) for _ in range(3)]
+        if hosts != ['primary'] * 3:
+            failures.append(f"fallback: with every replica down reads went to {hosts}")
+
+        with conn_manager.pin_primary():
+            FakePoolConnManager.pools['replica-a'].down = False
+            time.sleep(retry_interval * 1.5)
+            if read_host(conn_manager) != 'primary':
+                failures.append("pin_primary: a pinned read went to a replica")
+        if read_host(conn_manager) != 'replica-a':
+            failures.append("fallback: replica-a not used again once it came back")
+    finally:
+        conn_manager.disconnect()
+    return failures
+
+
+def check_read_your_writes(retry_interval: float, window: float) -> List[str]:
+    conn_manager = make_conn_manager(retry_interval, window)
+    failures = []
+    try:
+        with conn_manager.get_conn() as conn:
+            if conn.host != 'primary':
+                failures.append(f"writes: a read-write checkout went to {conn.host}")
+            conn.commit()
+        if read_host(conn_manager) != 'primary':
+            failures.append(f"read your writes: a read within {window:g}s of a commit went to a replica")
+        time.sleep(window * 1.5)
+        if read_host(conn_manager) == 'primary':
+            failures.append(f"read your writes: reads still on the primary {window * 1.5:g}s after the commit")
+    finally:
+        conn_manager.disconnect()
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--retry-interval', type=float, default=0.05, help='replica retry interval in seconds')
+    parser.add_argument('--window', type=float, default=0.05, help='read-your-writes window in seconds')
+    args = parser.parse_args()
+
+    checks = [
+        ('least busy', lambda: check_least_busy(args.retry_interval)),
+        ('mark down/retry', lambda: check_mark_down(args.retry_interval)),
+        ('primary fallback', lambda: check_primary_fallback(args.retry_interval)),
+        ('read your writes', lambda: check_read_your_writes(args.retry_interval, args.window))
+    ]
+
+    failures = []
+    for label, check in checks:
+        found = check()
+        print(f"{label:<20} {'ok' if not found else 'FAILED'}")
+        failures.extend(found)
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
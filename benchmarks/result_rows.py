@@ -0,0 +1,126 @@
+"""Row materialization: dictionary cursor + dataclass + to_dict() vs. tuple cursor + ResultRow.
+
+Without --live the rows are synthetic and only the client-side work is
+timed: the dict a dictionary cursor builds per row, the dataclass and its
+to_dict() on one side, a single namedtuple per row on the other (with and
+without converting it to a dict afterwards):
+
+    python benchmarks/result_rows.py --rooms 100000 1000000
+
+With --live the rooms-with-student-count query runs against the database
+configured through the usual DB_* environment variables, so it needs a
+large dataset (see the `generate` command):
+
+    python benchmarks/result_rows.py --live --repeat 5
+"""
+import argparse
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+
+from mysql_room_manager.config.db_config import DbConfig
+from mysql_room_manager.database.conn_manager import ConnManager
+from mysql_room_manager.data.repositories.analytics_repo import AnalyticsRepo
+from mysql_room_manager.models.result import RoomStudentCount
+
+COLUMNS = ('room_id', 'room_name', 'student_count')
+
+
+@dataclass
+class LegacyRoomStudentCount:
+    """The model as it was before ResultRow."""
+    room_id: int
+    room_name: str
+    student_count: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'room_id': self.room_id,
+            'room_name': self.room_name,
+            'student_count': self.student_count
+        }
+
+
+def legacy_rows(dict_rows):
+    for row in dict_rows:
+        yield LegacyRoomStudentCount(
+            room_id=row['room_id'],
+            room_name=row['room_name'],
+            student_count=row['student_count']
+        ).to_dict()
+
+
+def best_of(repeat: int, fn) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def run_synthetic(rooms: int, repeat: int) -> Dict[str, float]:
+    tuples = [(i, f"Room #{i}", i % 40) for i in range(rooms)]
+
+    def dict_path():
+        # what a dictionary cursor does for every row, then the old model round trip
+        for _ in legacy_rows(dict(zip(COLUMNS, row)) for row in tuples):
+            pass
+
+    def tuple_path():
+        for _ in map(RoomStudentCount.row_factory(COLUMNS), tuples):
+            pass
+
+    def tuple_to_dict_path():
+        for row in map(RoomStudentCount.row_factory(COLUMNS), tuples):
+            row.to_dict()
+
+    return {
+        'dict + dataclass': best_of(repeat, dict_path),
+        'ResultRow': best_of(repeat, tuple_path),
+        'ResultRow + to_dict': best_of(repeat, tuple_to_dict_path)
+    }
+
+
+def run_live(repeat: int) -> Tuple[int, Dict[str, float]]:
+    conn_manager = ConnManager(DbConfig.from_env())
+    conn_manager.max_rows = None
+    repo = AnalyticsRepo(conn_manager)
+    query = repo.get_query('rooms_with_student_count')
+    try:
+        rooms = sum(1 for _ in repo.iter_room_student_count_rows())
+        return rooms, {
+            'dict + dataclass': best_of(repeat, lambda: list(
+                legacy_rows(conn_manager.iter_query(query, read_only=True))
+            )),
+            'ResultRow': best_of(repeat, lambda: list(repo.iter_room_student_count_rows())),
+            'ResultRow + to_dict': best_of(repeat, lambda: list(repo.iter_rooms_with_student_count()))
+        }
+    finally:
+        conn_manager.disconnect()
+
+
+def report(label: str, rooms: int, timings: Dict[str, float]) -> None:
+    baseline = timings['dict + dataclass']
+    for name, seconds in timings.items():
+        print(f"{label:>10} {name:<20} {seconds * 1000:9.1f}ms  "
+              f"{rooms / seconds / 1e6:6.2f}M rows/s  x{baseline / seconds:4.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rooms', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--live', action='store_true', help='time the real query instead of synthetic rows')
+    args = parser.parse_args()
+
+    if args.live:
+        rooms, timings = run_live(args.repeat)
+        report(f"{rooms} live", rooms, timings)
+        return
+    for rooms in args.rooms:
+        report(f"{rooms}", rooms, run_synthetic(rooms, args.repeat))
+
+
+if __name__ == '__main__':
+    main()
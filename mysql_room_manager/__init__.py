@@ -2,12 +2,17 @@ __version__ = "2.0.0"
 __author__ = "MySQL Student Room Analytics Team"
 __description__ = "Enterprise MySQL solution for student-room analytics with query optimization"
 
-from .services.import_svc import ImportSvc
-from .services.analytics_svc import AnalyticsSvc
-from .services.opt_svc import OptSvc
-from .database.conn_manager import ConnManager
-from .database.schema_mgr import SchemaMgr
-from .cli.controller import Controller
+from .utils.lazy_import import lazy_exports
+
+# Imported on first access, so the CLI starts without loading every service.
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'ImportSvc': '.services.import_svc',
+    'AnalyticsSvc': '.services.analytics_svc',
+    'OptSvc': '.services.opt_svc',
+    'ConnManager': '.database.conn_manager',
+    'SchemaMgr': '.database.schema_mgr',
+    'Controller': '.cli.controller'
+})
 
 __all__ = [
     'ImportSvc',      
@@ -1,5 +1,17 @@
-from .controller import Controller
 from .arg_parser import ArgParser
 from .config import Config
+from .renderer import RowRenderer, TableRenderer, JsonlRenderer, CsvRenderer, make_renderer
+from ..utils.lazy_import import lazy_exports
 
-__all__ = ['Controller', 'ArgParser', 'Config']
+__getattr__, __dir__ = lazy_exports(__name__, {'Controller': '.controller'})
+
+__all__ = [
+    'Controller',
+    'ArgParser',
+    'Config',
+    'RowRenderer',
+    'TableRenderer',
+    'JsonlRenderer',
+    'CsvRenderer',
+    'make_renderer'
+]
@@ -1,6 +1,8 @@
 """Command line argument parser."""
 import argparse
-from ..constants import Commands, AnalyticsOpts, DbOps, OptOps
+from datetime import date
+from typing import List, Optional
+from ..constants import Commands, AnalyticsOpts, DbOps, OptOps, Formats, OutputFormats
 
 
 class ArgParser:
@@ -33,12 +35,103 @@ class ArgParser:
                                     help='Show top N rooms with largest age gaps (default: 5)')
         analytics_parser.add_argument('--mixed-gender', action='store_true',
                                     help='Show mixed gender rooms')
+        analytics_parser.add_argument('--age-percentiles', action='store_true',
+                                    help='Show per-room and global age percentiles from stored sketches')
+        analytics_parser.add_argument('--build-sketches', action='store_true',
+                                    help='Rebuild per-room age sketches in one scan of students')
+        analytics_parser.add_argument('--sample', type=self._sample_rate, metavar='RATE',
+                                    help="Approximate report on a hash sample of students: "
+                                         "a rate in (0, 1] or 'auto' to fit --target-ms")
+        analytics_parser.add_argument('--target-ms', type=float, default=50.0,
+                                    help='Latency target for --sample auto (default: 50)')
         
         opt_parser = subparsers.add_parser(Commands.OPTIMIZE, help='Database optimization analysis')
         opt_parser.add_argument('--analyze', action='store_true',
                                help='Analyze query performance')
         opt_parser.add_argument('--recommendations', action='store_true',
                                help='Show optimization recommendations')
+        opt_parser.add_argument('--calibrate', action='store_true',
+                               help='Time each analytics query variant and store the fastest')
+        opt_parser.add_argument('--partitions', action='store_true',
+                               help='Check partition pruning of the analytics queries in EXPLAIN')
+        opt_parser.add_argument('--advise', action='store_true',
+                               help='Propose indexes and validate them on a sampled shadow copy')
+        opt_parser.add_argument('--indexes', action='store_true',
+                               help='Report redundant and unused indexes with their storage and insert cost')
+        opt_parser.add_argument('--workload', action='store_true',
+                               help='Profile statement digests from performance_schema')
+        workload_scope = opt_parser.add_mutually_exclusive_group()
+        workload_scope.add_argument('--window', type=float, metavar='SECONDS',
+                                   help='With --workload: diff digests over this time window')
+        workload_scope.add_argument('--run', metavar='COMMAND',
+                                   help='With --workload: diff digests around a CLI command, e.g. "analytics --report"')
+        opt_parser.add_argument('--baseline', action='store_true',
+                               help='Store EXPLAIN ANALYZE plans and timings of the analytics queries')
+        opt_parser.add_argument('--regressions', action='store_true',
+                               help='Compare the analytics queries against their stored baselines')
+        opt_parser.add_argument('--threshold', type=float, default=0.25, metavar='FRACTION',
+                               help='Slowdown over baseline reported as a regression (default: 0.25)')
+        opt_parser.add_argument('--benchmark', action='store_true',
+                               help='Benchmark every analytics query with latency percentiles')
+        opt_parser.add_argument('--iterations', type=int, default=20, metavar='N',
+                               help='With --benchmark: measured runs per worker (default: 20)')
+        opt_parser.add_argument('--warmup', type=int, default=3, metavar='N',
+                               help='With --benchmark: unmeasured runs per worker (default: 3)')
+        opt_parser.add_argument('--concurrency', type=self._int_list, default=[1], metavar='N[,N...]',
+                               help='With --benchmark: comma-separated worker counts (default: 1)')
+        opt_parser.add_argument('--save', metavar='PATH',
+                               help='With --benchmark: write results as JSON')
+        opt_parser.add_argument('--compare', metavar='PATH',
+                               help='With --benchmark: compare against a saved JSON result')
+        opt_parser.add_argument('--min-gain', type=float, default=0.1, metavar='FRACTION',
+                               help='Workload speed-up an index must reach to be recommended (default: 0.1)')
+        
+        gen_parser = subparsers.add_parser(Commands.GENERATE, help='Generate a deterministic synthetic dataset')
+        gen_parser.add_argument('--students', type=int, default=10000, metavar='N',
+                               help='Number of students (default: 10000)')
+        gen_parser.add_argument('--rooms', type=int, default=1000, metavar='N',
+                               help='Number of rooms (default: 1000)')
+        gen_parser.add_argument('--seed', type=int, default=42,
+                               help='Random seed; equal seeds and options give equal data (default: 42)')
+        gen_parser.add_argument('--room-skew', type=float, default=0.0, metavar='S',
+                               help='Zipf exponent of room sizes, 0 for uniform (default: 0)')
+        gen_parser.add_argument('--age-mean', type=float, default=20.0,
+                               help='Mean student age in years (default: 20)')
+        gen_parser.add_argument('--age-stddev', type=float, default=3.0,
+                               help='Standard deviation of student age (default: 3)')
+        gen_parser.add_argument('--min-age', type=int, default=16,
+                               help='Minimum student age (default: 16)')
+        gen_parser.add_argument('--max-age', type=int, default=40,
+                               help='Maximum student age (default: 40)')
+        gen_parser.add_argument('--male-ratio', type=float, default=0.5,
+                               help='Share of male students (default: 0.5)')
+        gen_parser.add_argument('--unassigned-ratio', type=float, default=0.0,
+                               help='Share of students without a room (default: 0)')
+        gen_parser.add_argument('--as-of', type=self._iso_date, metavar='YYYY-MM-DD',
+                               help='Date ages are computed from (default: January 1 of this year)')
+        gen_target = gen_parser.add_mutually_exclusive_group(required=True)
+        gen_target.add_argument('--out-dir', metavar='DIR',
+                               help='Write students and rooms files into DIR')
+        gen_target.add_argument('--insert', action='store_true',
+                               help='Insert directly into the database through the bulk import path')
+        gen_parser.add_argument('--format', choices=[Formats.JSON, Formats.CSV], default=Formats.JSON,
+                               help='File format for --out-dir (default: json)')
+        gen_parser.add_argument('--batch-size', type=int, default=10000, metavar='N',
+                               help='Rows per insert transaction for --insert (default: 10000)')
+        
+        serve_parser = subparsers.add_parser(Commands.SERVE, help='Serve analytics and lookups over HTTP as JSON')
+        serve_parser.add_argument('--host', default='127.0.0.1',
+                                 help='Address to listen on (default: 127.0.0.1)')
+        serve_parser.add_argument('--port', type=int, default=8080,
+                                 help='Port to listen on (default: 8080)')
+        serve_parser.add_argument('--cache-ttl', type=float, default=300.0, metavar='SECONDS',
+                                 help='How long results are cached, 0 to disable (default: 300)')
+        serve_parser.add_argument('--cache-size', type=int, default=1024, metavar='N',
+                                 help='Maximum cached results (default: 1024)')
+        serve_parser.add_argument('--version-check', type=float, default=1.0, metavar='SECONDS',
+                                 help='How often to look for a finished import (default: 1)')
+        serve_parser.add_argument('--workers', type=int, metavar='N',
+                                 help='Threads running queries (default: DB_POOL_SIZE)')
         
         db_parser = subparsers.add_parser(Commands.DATABASE, help='Database management')
         db_parser.add_argument('--init', action='store_true',
@@ -53,6 +146,50 @@ class ArgParser:
                                choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
                                help='Logging level (default: INFO)')
         self.parser.add_argument('--log-file', help='Log file path')
+        self.parser.add_argument('--output', default=OutputFormats.TABLE,
+                               choices=[OutputFormats.TABLE, OutputFormats.JSONL, OutputFormats.CSV],
+                               help='Result format; jsonl and csv stream every row to stdout and send '
+                                    'everything else to stderr (default: table)')
+        self.parser.add_argument('--timeout', type=float, metavar='SECONDS',
+                               help='Time budget for the whole command; running queries are killed when it ends '
+                                    '(not for serve)')
+        self.parser.add_argument('--query-timeout', type=float, metavar='SECONDS',
+                               help='Limit for each read-only query (default: QUERY_TIMEOUT, 0 disables)')
+        self.parser.add_argument('--max-rows', type=int, metavar='N',
+                               help='Stop analytics results after N rows (default: MAX_QUERY_RESULTS, 0 disables)')
+    
+    @staticmethod
+    def _sample_rate(value: str):
+        if value == 'auto':
+            return value
+        try:
+            rate = float(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid sample rate: {value}")
+        if not 0 < rate <= 1:
+            raise argparse.ArgumentTypeError(f"sample rate must be in (0, 1], got: {value}")
+        return rate
+    
+    @staticmethod
+    def _iso_date(value: str) -> date:
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"expected a YYYY-MM-DD date, got: {value}")
+    
+    @staticmethod
+    def _int_list(value: str) -> List[int]:
+        try:
+            numbers = [int(part) for part in value.split(',') if part.strip()]
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"expected comma-separated integers, got: {value}")
+        if not numbers or min(numbers) < 1:
+            raise argparse.ArgumentTypeError(f"values must be positive integers, got: {value}")
+        return numbers
     
-    def parse_args(self) -> argparse.Namespace:
-        return self.parser.parse_args()
\ No newline at end of file
+    def parse_args(self, argv: Optional[List[str]] = None) -> argparse.Namespace:
+        args = self.parser.parse_args(argv)
+        if args.command == Commands.SERVE and args.timeout:
+            # The budget would cover the server's whole lifetime and fail every request after it.
+            self.parser.error("--timeout does not apply to serve; use --query-timeout to bound each query")
+        return args
\ No newline at end of file
@@ -6,6 +6,7 @@ from typing import Optional
 class Config: 
     table_format: str = "grid"
     max_display_rows: int = 50
+    table_page_size: int = 50
     truncate_long_text: bool = True
     max_text_length: int = 50
     
@@ -1,24 +1,30 @@
+import os
 import sys
+import shlex
+import signal
 import time
 import logging
-from typing import Dict, Any, List, Callable
-from tabulate import tabulate
+from functools import partial
+from typing import TYPE_CHECKING, Dict, Any, List, Callable, Iterable, Optional
 from ..config.db_config import DbConfig
 from ..config.app_config import AppConfig
-from ..database.conn_manager import ConnManager
-from ..database.schema_mgr import SchemaMgr
-from ..database.optimizer import Optimizer
-from ..data.repositories.student_repo import StudentRepo
-from ..data.repositories.room_repo import RoomRepo
-from ..data.repositories.analytics_repo import AnalyticsRepo
-from ..services.import_svc import ImportSvc
-from ..services.analytics_svc import AnalyticsSvc
-from ..services.opt_svc import OptSvc
 from ..utils.logging_config import setup_logging
 from ..exceptions.exceptions import *
-from ..constants import Commands, DbOps, OptOps
+from ..constants import Commands, DbOps, OptOps, AnalyticsOpts, Formats, OutputFormats, AGE_PERCENTILES
 from .arg_parser import ArgParser
 from .config import Config
+from .renderer import CellFormats, make_renderer
+
+# Services, repositories, mysql.connector and tabulate are imported by the
+# handlers that use them, so --help and argument errors stay cheap.
+if TYPE_CHECKING:
+    from ..database.schema_mgr import SchemaMgr
+    from ..services.analytics_svc import AnalyticsSvc
+    from ..services.opt_svc import OptSvc
+    from ..services.sampling_svc import SamplingSvc
+    from ..services.calibration_svc import CalibrationSvc
+    from ..services.benchmark_svc import BenchmarkSvc
+    from ..data.repositories.analytics_repo import AnalyticsRepo
 
 
 class Controller: 
@@ -28,43 +34,79 @@ class Controller:
         self.config = Config() 
         self.logger = None
         self.start_time = None
+        self.entity_cache = None
+        self.conn_manager = None
+        self._services: Optional[Dict[str, Any]] = None
+        self.args = None
+        self.renderer = make_renderer(OutputFormats.TABLE, sys.stdout, self.config)
+        # Everything but result rows; stderr when stdout carries jsonl/csv.
+        self.status_stream = sys.stdout
+        self._section: Optional[str] = None
         
         self.cmd_handlers: Dict[str, Callable] = {  
             Commands.IMPORT: self._handle_import_cmd,      
             Commands.ANALYTICS: self._handle_analytics_cmd, 
             Commands.OPTIMIZE: self._handle_opt_cmd,       
-            Commands.DATABASE: self._handle_db_cmd         
+            Commands.DATABASE: self._handle_db_cmd,
+            Commands.GENERATE: self._handle_generate_cmd,
+            Commands.SERVE: self._handle_serve_cmd
         }
     
     def run(self):
         try:
             args = self.arg_parser.parse_args()
+            self.args = args
+            self.renderer = make_renderer(args.output, sys.stdout, self.config)
+            if args.output != OutputFormats.TABLE:
+                self.status_stream = sys.stderr
+            signal.signal(signal.SIGINT, self._on_interrupt)
             
             self.logger = setup_logging(
                 level=args.log_level,
-                log_file=args.log_file
+                log_file=args.log_file,
+                stream=self.status_stream
             )
             
             self.start_time = time.time()
             handler = self.cmd_handlers.get(args.command)
             if handler:
-                handler(args)
+                from ..database.query_guard import command_budget
+                with command_budget(args.timeout):
+                    handler(args)
             else:
                 self.arg_parser.parser.print_help()
                 
         except KeyboardInterrupt:
             self._print_error("Operation cancelled by user")
             sys.exit(1)
+        except BrokenPipeError:
+            # The reader of --output jsonl/csv went away (e.g. `| head`);
+            # point stdout at devnull so the final flush cannot fail again.
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            sys.exit(1)
         except Exception as e:
             self._print_error(f"Application error: {e}")
             if self.logger:
                 self.logger.exception("Unhandled exception")
             sys.exit(1)
         finally:
+            if self.entity_cache is not None and self.logger:
+                self._log_cache_stats()
+            if self.conn_manager is not None and self.logger:
+                self._log_pool_stats()
+            if self.conn_manager is not None:
+                self.conn_manager.disconnect()
             if self.start_time and self.config.show_timing:
                 elapsed = time.time() - self.start_time
                 self._print_info(f"Total execution time: {elapsed:.2f} seconds")
     
+    def _on_interrupt(self, signum, frame):
+        # Kill what the server is still running before unwinding; the
+        # client stops waiting either way, the statements would not.
+        if self.conn_manager is not None:
+            self.conn_manager.cancel_all()
+        raise KeyboardInterrupt
+    
     def _handle_import_cmd(self, args): 
         try:
             self._print_header("Data Import")
@@ -84,14 +126,91 @@ class Controller:
                 ["Total records", results['total_records']]
             ], headers=["Metric", "Count"])
             
+        except BrokenPipeError:
+            raise
         except Exception as e:
             self._print_error(f"Import failed: {e}")
             raise
     
+    def _handle_generate_cmd(self, args):
+        from ..data.generators import DatasetGen, DatasetSpec, write_json, write_csv
+        try:
+            self._print_header("Dataset Generation")
+            
+            spec_args = dict(
+                students=args.students, rooms=args.rooms, seed=args.seed, room_skew=args.room_skew,
+                age_mean=args.age_mean, age_stddev=args.age_stddev, min_age=args.min_age,
+                max_age=args.max_age, male_ratio=args.male_ratio, unassigned_ratio=args.unassigned_ratio
+            )
+            if args.as_of:
+                spec_args['as_of'] = args.as_of
+            gen = DatasetGen(DatasetSpec(**spec_args))
+            
+            if args.insert:
+                conn_manager, services = self._init_services()
+                results = services['import_svc'].import_records(
+                    gen.iter_rooms(), gen.iter_students(), batch_size=args.batch_size
+                )
+                self._print_success("Generated data inserted")
+                self._print_results_table([
+                    ["Rooms imported", results['rooms_imported']],
+                    ["Students imported", results['students_imported']]
+                ], headers=["Metric", "Count"])
+                return
+            
+            os.makedirs(args.out_dir, exist_ok=True)
+            rooms_path = os.path.join(args.out_dir, f"rooms.{args.format}")
+            students_path = os.path.join(args.out_dir, f"students.{args.format}")
+            
+            if args.format == Formats.CSV:
+                rooms_written = write_csv(rooms_path, gen.iter_rooms(), ['id', 'name'])
+                students_written = write_csv(students_path, gen.iter_students(),
+                                             ['birthday', 'id', 'name', 'room', 'sex'])
+            else:
+                rooms_written = write_json(rooms_path, gen.iter_rooms())
+                students_written = write_json(students_path, gen.iter_students())
+            
+            self._print_success("Dataset written")
+            self._print_results_table([
+                [rooms_path, rooms_written],
+                [students_path, students_written]
+            ], headers=["File", "Records"])
+            
+        except BrokenPipeError:
+            raise
+        except Exception as e:
+            self._print_error(f"Generation failed: {e}")
+            raise
+    
+    def _handle_serve_cmd(self, args):
+        from ..server.http_server import AnalyticsServer
+        try:
+            conn_manager, services = self._init_services()
+            server = AnalyticsServer(
+                conn_manager, services['analytics_svc'], services['student_repo'], services['room_repo'],
+                services['data_version_repo'], host=args.host, port=args.port, cache_ttl=args.cache_ttl,
+                cache_size=args.cache_size, version_check_interval=args.version_check, workers=args.workers,
+                on_invalidate=partial(self._on_data_version_change, services['analytics_repo'])
+            )
+            self._print_info(f"Serving on http://{args.host}:{args.port} (Ctrl+C to stop)")
+            try:
+                server.run()
+            except KeyboardInterrupt:
+                self._print_info("Server stopped")
+            
+        except BrokenPipeError:
+            raise
+        except Exception as e:
+            self._print_error(f"Server failed: {e}")
+            raise
+    
     def _handle_analytics_cmd(self, args): 
         try:
             self._print_header("Analytics")
             
+            if args.output == OutputFormats.CSV:
+                self._check_single_analytics_result(args)
+            
             conn_manager, services = self._init_services()
             analytics_svc = services['analytics_svc']
             
@@ -100,10 +219,23 @@ class Controller:
                 'room_counts': lambda: self._show_room_counts(analytics_svc),
                 'youngest_rooms': lambda: self._show_youngest_rooms(analytics_svc, args.youngest_rooms),
                 'age_gaps': lambda: self._show_age_gaps(analytics_svc, args.age_gaps),
-                'mixed_gender': lambda: self._show_mixed_gender_rooms(analytics_svc)
+                'mixed_gender': lambda: self._show_mixed_gender_rooms(analytics_svc),
+                AnalyticsOpts.BUILD_SKETCHES: lambda: self._build_age_sketches(analytics_svc),
+                AnalyticsOpts.AGE_PERCENTILES: lambda: self._show_age_percentiles(analytics_svc),
+                AnalyticsOpts.SAMPLE: lambda: self._gen_sampled_report(
+                    services['sampling_svc'], args.sample, args.target_ms, args.youngest_rooms
+                )
             }
             
-            if args.report:
+            if args.build_sketches:
+                analytics_ops[AnalyticsOpts.BUILD_SKETCHES]()
+            
+            if args.age_percentiles:
+                analytics_ops[AnalyticsOpts.AGE_PERCENTILES]()
+            
+            if args.sample is not None:
+                analytics_ops[AnalyticsOpts.SAMPLE]()
+            elif args.report:
                 analytics_ops['report']()
             else:
                 if args.room_counts:
@@ -115,10 +247,26 @@ class Controller:
                 if args.mixed_gender:
                     analytics_ops['mixed_gender']()
                     
+        except BrokenPipeError:
+            raise
         except Exception as e:
             self._print_error(f"Analytics failed: {e}")
             raise
     
+    @staticmethod
+    def _check_single_analytics_result(args):
+        """--output csv has room for one result; fail before connecting if more are selected."""
+        if args.sample is not None or args.report:
+            results = 2
+        else:
+            results = sum(map(bool, [args.room_counts, args.youngest_rooms, args.age_gaps, args.mixed_gender]))
+        results += 2 if args.age_percentiles else 0
+        if results > 1:
+            raise ValidationError(
+                "--output csv writes a single result; select one (pass --youngest-rooms 0 and "
+                "--age-gaps 0 to turn off those defaults) or use --output jsonl"
+            )
+    
     def _handle_opt_cmd(self, args): 
         try:
             self._print_header("Database Optimization")
@@ -128,7 +276,17 @@ class Controller:
             
             opt_ops = {
                 OptOps.ANALYZE: lambda: self._show_perf_analysis(opt_svc),  # Brief: _show_performance_analysis → _show_perf_analysis
-                OptOps.RECOMMENDATIONS: lambda: self._show_opt_recommendations(opt_svc)  # Brief: _show_optimization_recommendations → _show_opt_recommendations
+                OptOps.RECOMMENDATIONS: lambda: self._show_opt_recommendations(opt_svc),  # Brief: _show_optimization_recommendations → _show_opt_recommendations
+                OptOps.CALIBRATE: lambda: self._calibrate_variants(
+                    services['calibration_svc'], services['analytics_repo']
+                ),
+                OptOps.PARTITIONS: lambda: self._show_partition_pruning(opt_svc),
+                OptOps.ADVISE: lambda: self._show_index_advice(opt_svc, args.min_gain),
+                OptOps.INDEXES: lambda: self._show_index_report(opt_svc),
+                OptOps.WORKLOAD: lambda: self._show_workload_profile(opt_svc, args.window, args.run),
+                OptOps.BASELINE: lambda: self._capture_baselines(opt_svc),
+                OptOps.REGRESSIONS: lambda: self._show_plan_regressions(opt_svc, args.threshold),
+                OptOps.BENCHMARK: lambda: self._run_benchmark(services['benchmark_svc'], args)
             }
             
             if args.analyze and OptOps.ANALYZE in opt_ops:
@@ -136,12 +294,40 @@ class Controller:
             
             if args.recommendations and OptOps.RECOMMENDATIONS in opt_ops:
                 opt_ops[OptOps.RECOMMENDATIONS]()
+            
+            if args.calibrate and OptOps.CALIBRATE in opt_ops:
+                opt_ops[OptOps.CALIBRATE]()
+            
+            if args.partitions and OptOps.PARTITIONS in opt_ops:
+                opt_ops[OptOps.PARTITIONS]()
+            
+            if args.indexes and OptOps.INDEXES in opt_ops:
+                opt_ops[OptOps.INDEXES]()
+            
+            if args.workload and OptOps.WORKLOAD in opt_ops:
+                opt_ops[OptOps.WORKLOAD]()
+            
+            if args.regressions and OptOps.REGRESSIONS in opt_ops:
+                opt_ops[OptOps.REGRESSIONS]()
+            
+            if args.baseline and OptOps.BASELINE in opt_ops:
+                opt_ops[OptOps.BASELINE]()
+            
+            if args.benchmark and OptOps.BENCHMARK in opt_ops:
+                opt_ops[OptOps.BENCHMARK]()
+            
+            if args.advise and OptOps.ADVISE in opt_ops:
+                opt_ops[OptOps.ADVISE]()
                 
+        except BrokenPipeError:
+            raise
         except Exception as e:
             self._print_error(f"Optimization analysis failed: {e}")
             raise
     
     def _handle_db_cmd(self, args): 
+        from ..database.conn_manager import ConnManager
+        from ..database.schema_mgr import SchemaMgr
         try:
             self._print_header("Database Management")
             
@@ -164,38 +350,121 @@ class Controller:
             if args.status and DbOps.STATUS in db_ops:
                 db_ops[DbOps.STATUS]()
                 
+        except BrokenPipeError:
+            raise
         except Exception as e:
             self._print_error(f"Database operation failed: {e}")
             raise
     
     def _init_services(self) -> tuple: 
+        # A command profiled by optimize --workload --run shares the pool and
+        # watchdog of the running one, so both are cleaned up in run().
+        if self._services is not None:
+            return self.conn_manager, self._services
+        
+        from ..database.conn_manager import ConnManager
+        from ..database.schema_mgr import SchemaMgr
+        from ..database.optimizer import Optimizer
+        from ..database.index_advisor import IndexAdvisor
+        from ..database.workload_profiler import WorkloadProfiler
+        from ..data.repositories.student_repo import StudentRepo
+        from ..data.repositories.room_repo import RoomRepo
+        from ..data.repositories.analytics_repo import AnalyticsRepo
+        from ..data.repositories.entity_cache import EntityCache
+        from ..data.repositories.sketch_repo import SketchRepo
+        from ..data.repositories.sampled_analytics_repo import SampledAnalyticsRepo
+        from ..data.repositories.variant_repo import VariantRepo
+        from ..data.repositories.baseline_repo import BaselineRepo
+        from ..data.repositories.data_version_repo import DataVersionRepo
+        from ..services.import_svc import ImportSvc
+        from ..services.analytics_svc import AnalyticsSvc
+        from ..services.opt_svc import OptSvc
+        from ..services.sampling_svc import SamplingSvc
+        from ..services.calibration_svc import CalibrationSvc
+        from ..services.benchmark_svc import BenchmarkSvc
+        
         db_config = DbConfig.from_env()
         conn_manager = ConnManager(db_config)
+        self.conn_manager = conn_manager
+        if self.args is not None:
+            if self.args.query_timeout is not None:
+                conn_manager.query_timeout = self.args.query_timeout or None
+            if self.args.max_rows is not None:
+                conn_manager.max_rows = self.args.max_rows or None
         
-        if not conn_manager.test_conn():
-            raise DbConnError("Cannot connect to database")
+        # Connection problems surface on the first query; no extra round trip here.
+        conn_manager.warm_up()
         
         schema_mgr = SchemaMgr(conn_manager)
         optimizer = Optimizer(conn_manager)
         
-        student_repo = StudentRepo(conn_manager)
-        room_repo = RoomRepo(conn_manager)
-        analytics_repo = AnalyticsRepo(conn_manager)
+        if db_config.entity_cache_size > 0:
+            self.entity_cache = EntityCache(db_config.entity_cache_size)
+        
+        student_repo = StudentRepo(conn_manager, self.entity_cache)
+        room_repo = RoomRepo(conn_manager, self.entity_cache)
+        variant_repo = VariantRepo(conn_manager)
+        analytics_repo = AnalyticsRepo(conn_manager, variant_repo)
+        sketch_repo = SketchRepo(conn_manager)
+        data_version_repo = DataVersionRepo(conn_manager)
         
+        calibration_svc = CalibrationSvc(optimizer, variant_repo, student_repo)
         import_svc = ImportSvc(
-            schema_mgr, student_repo, room_repo
+            schema_mgr, student_repo, room_repo, sketch_repo, calibration_svc, data_version_repo
+        )
+        analytics_svc = AnalyticsSvc(analytics_repo, optimizer, sketch_repo)
+        opt_svc = OptSvc(
+            optimizer, IndexAdvisor(conn_manager, optimizer),
+            WorkloadProfiler(conn_manager), BaselineRepo(conn_manager), analytics_repo
         )
-        analytics_svc = AnalyticsSvc(analytics_repo, optimizer)
-        opt_svc = OptSvc(optimizer)
+        sampling_svc = SamplingSvc(SampledAnalyticsRepo(conn_manager))
         
         services = {
             'import_svc': import_svc,
             'analytics_svc': analytics_svc,
-            'opt_svc': opt_svc
+            'opt_svc': opt_svc,
+            'sampling_svc': sampling_svc,
+            'calibration_svc': calibration_svc,
+            'benchmark_svc': BenchmarkSvc(conn_manager),
+            'student_repo': student_repo,
+            'room_repo': room_repo,
+            'analytics_repo': analytics_repo,
+            'data_version_repo': data_version_repo
         }
+        self._services = services
         
         return conn_manager, services
     
+    def _on_data_version_change(self, analytics_repo):
+        # Another process imported: calibrated variants and cached entities may be stale.
+        analytics_repo.reload_variants()
+        if self.entity_cache is not None:
+            self.entity_cache.clear()
+    
+    def _log_cache_stats(self):
+        for name, stats in self.entity_cache.stats().items():
+            self.logger.info(
+                f"Entity cache [{name}]: {stats['size']}/{stats['max_size']} entries, "
+                f"hit ratio {stats['hit_ratio']:.1%} ({stats['hits']} hits, {stats['misses']} misses), "
+                f"~{stats['approx_bytes'] / 1024:.1f} KiB"
+            )
+    
+    def _log_pool_stats(self):
+        stats = self.conn_manager.pool_stats()
+        if stats is not None:
+            self.logger.info(
+                f"Connection pool: {stats['in_use']} in use, {stats['idle']} idle of {stats['min_size']}..{stats['max_size']}, "
+                f"{stats['checkouts']} checkouts (avg {stats['avg_checkout_ms']:.2f} ms, p95 {stats['p95_checkout_ms']:.2f} ms), "
+                f"{stats['wait_ratio']:.1%} waited, max queue {stats['max_waiting']}, "
+                f"exhaustion rate {stats['exhaustion_rate']:.1%}"
+            )
+        
+        for endpoint, replica in self.conn_manager.replica_stats().items():
+            self.logger.info(
+                f"Replica {endpoint}: {'healthy' if replica['healthy'] else 'down'}, "
+                f"{replica['checkouts']} checkouts, {replica['failures']} failures"
+            )
+    
     def _gen_full_report(self, analytics_svc: 'AnalyticsSvc'):
         self._print_info("Generating comprehensive analytics report...")
         
@@ -213,67 +482,135 @@ class Controller:
             ["Mixed gender rooms", summary['mixed_gender_room_count']]
         ], headers=["Metric", "Count"])
     
+    def _gen_sampled_report(self, sampling_svc: 'SamplingSvc', sample, target_ms: float, limit: int):
+        if sample == 'auto':
+            rate = sampling_svc.choose_rate(target_ms)
+        else:
+            rate = sample
+        
+        report = sampling_svc.gen_sampled_report(rate, limit or 5)
+        self._print_info(
+            f"Approximate results from a {report['sample_rate']:.2%} sample "
+            f"(± = 95% confidence interval)"
+        )
+        
+        self._print_header("Room Student Counts (estimated)")
+        self._print_results_table(
+            ([r['room_id'], r['room_name'], r['student_count'], r['student_count_ci']]
+             for r in report['room_student_counts']),
+            headers=["Room ID", "Room Name", "Student Count", "95% CI"],
+            empty_message="No room data found",
+            formats={"95% CI": "±{}"}
+        )
+        
+        self._print_header("Top Rooms with Smallest Average Age (estimated)")
+        self._print_results_table(
+            ([r['room_id'], r['room_name'], r['average_age'], r['average_age_ci'], r['student_count']]
+             for r in report['youngest_rooms']),
+            headers=["Room ID", "Room Name", "Average Age", "95% CI", "Student Count"],
+            empty_message="No youngest rooms data found",
+            formats={"Average Age": "{:.1f}", "95% CI": "±{:.1f}"}
+        )
+        
+        self._print_header("Top Rooms with Largest Age Differences (sampled)")
+        self._print_results_table(
+            ([r['room_id'], r['room_name'], r['age_difference'], r['min_age'], r['max_age'], r['student_count']]
+             for r in report['rooms_with_age_gaps']),
+            headers=["Room ID", "Room Name", "Age Diff", "Min Age", "Max Age", "Students"],
+            empty_message="No age gap data found"
+        )
+        
+        self._print_header("Mixed Gender Rooms (estimated)")
+        self._print_results_table(
+            ([r['room_id'], r['room_name'], r['male_count'], r['male_count_ci'], r['female_count'],
+              r['female_count_ci'], r['total_students'], r['total_students_ci']]
+             for r in report['mixed_gender_rooms']),
+            headers=["Room ID", "Room Name", "Male", "Male CI", "Female", "Female CI", "Total", "Total CI"],
+            empty_message="No mixed gender rooms found",
+            formats={"Male CI": "±{}", "Female CI": "±{}", "Total CI": "±{}"}
+        )
+        self._print_info(f"Sampled report computed in {report['elapsed_ms']:.1f} ms")
+    
     def _show_room_counts(self, analytics_svc: 'AnalyticsSvc'):
         """Show room student counts."""
-        data = analytics_svc.get_room_student_counts()
+        data = analytics_svc.iter_room_student_counts()
         self._show_room_counts_data(data)
     
-    def _show_room_counts_data(self, data: List[Dict[str, Any]]):
+    def _show_room_counts_data(self, data: Iterable[Dict[str, Any]]):
         """Display room counts data."""
         self._print_header("Room Student Counts")
-        if data:
-            table_data = [[r['room_name'], r['student_count']] for r in data]
-            self._print_results_table(table_data, headers=["Room Name", "Student Count"])
-        else:
-            self._print_warning("No room data found")
+        table_data = ([r['room_id'], r['room_name'], r['student_count']] for r in data)
+        self._print_results_table(table_data, headers=["Room ID", "Room Name", "Student Count"],
+                                  empty_message="No room data found")
     
     def _show_youngest_rooms(self, analytics_svc: 'AnalyticsSvc', limit: int):
-        data = analytics_svc.get_youngest_rooms(limit)
+        data = analytics_svc.iter_youngest_rooms(limit)
         self._show_youngest_rooms_data(data)
     
-    def _show_youngest_rooms_data(self, data: List[Dict[str, Any]]):
+    def _show_youngest_rooms_data(self, data: Iterable[Dict[str, Any]]):
         self._print_header("Top Rooms with Smallest Average Age")
-        if data:
-            table_data = [
-                [r['room_name'], f"{r['average_age']:.1f}", r['student_count']]
-                for r in data
-            ]
-            self._print_results_table(table_data, 
-                                    headers=["Room Name", "Average Age", "Student Count"])
-        else:
-            self._print_warning("No youngest rooms data found")
+        table_data = (
+            [r['room_id'], r['room_name'], r['average_age'], r['student_count']]
+            for r in data
+        )
+        self._print_results_table(table_data, 
+                                headers=["Room ID", "Room Name", "Average Age", "Student Count"],
+                                empty_message="No youngest rooms data found",
+                                formats={"Average Age": "{:.1f}"})
     
     def _show_age_gaps(self, analytics_svc: 'AnalyticsSvc', limit: int):
-        data = analytics_svc.get_rooms_with_largest_age_gaps(limit)
+        data = analytics_svc.iter_rooms_with_largest_age_gaps(limit)
         self._show_age_gaps_data(data)
     
-    def _show_age_gaps_data(self, data: List[Dict[str, Any]]):
+    def _show_age_gaps_data(self, data: Iterable[Dict[str, Any]]):
         self._print_header("Top Rooms with Largest Age Differences")
-        if data:
-            table_data = [
-                [r['room_name'], r['age_difference'], r['min_age'], r['max_age'], r['student_count']]
-                for r in data
-            ]
-            self._print_results_table(table_data, 
-                                    headers=["Room Name", "Age Diff", "Min Age", "Max Age", "Students"])
-        else:
-            self._print_warning("No age gap data found")
+        table_data = (
+            [r['room_id'], r['room_name'], r['age_difference'], r['min_age'], r['max_age'], r['student_count']]
+            for r in data
+        )
+        self._print_results_table(table_data, 
+                                headers=["Room ID", "Room Name", "Age Diff", "Min Age", "Max Age", "Students"],
+                                empty_message="No age gap data found")
     
     def _show_mixed_gender_rooms(self, analytics_svc: 'AnalyticsSvc'):
-        data = analytics_svc.get_mixed_gender_rooms()
+        data = analytics_svc.iter_mixed_gender_rooms()
         self._show_mixed_gender_rooms_data(data)
     
-    def _show_mixed_gender_rooms_data(self, data: List[Dict[str, Any]]):
+    def _show_mixed_gender_rooms_data(self, data: Iterable[Dict[str, Any]]):
         self._print_header("Mixed Gender Rooms")
-        if data:
-            table_data = [
-                [r['room_name'], r['male_count'], r['female_count'], r['total_students']]
-                for r in data
-            ]
-            self._print_results_table(table_data, 
-                                    headers=["Room Name", "Male", "Female", "Total"])
-        else:
-            self._print_warning("No mixed gender rooms found")
+        table_data = (
+            [r['room_id'], r['room_name'], r['male_count'], r['female_count'], r['total_students']]
+            for r in data
+        )
+        self._print_results_table(table_data, 
+                                headers=["Room ID", "Room Name", "Male", "Female", "Total"],
+                                empty_message="No mixed gender rooms found")
+    
+    def _build_age_sketches(self, analytics_svc: 'AnalyticsSvc'):
+        self._print_info("Rebuilding room age sketches...")
+        sketch_count = analytics_svc.build_age_sketches()
+        self._print_success(f"Stored {sketch_count} room age sketches")
+    
+    def _show_age_percentiles(self, analytics_svc: 'AnalyticsSvc'):
+        self._print_header("Age Percentiles by Room (sketches)")
+        data = analytics_svc.get_age_percentiles()
+        percentile_keys = [f"p{p}" for p in AGE_PERCENTILES]
+        
+        table_data = (
+            [r['room_id'], r['room_name'], r['student_count']] + [r[key] for key in percentile_keys]
+            for r in data['rooms']
+        )
+        self._print_results_table(table_data,
+                                headers=["Room ID", "Room Name", "Students"] + [k.upper() for k in percentile_keys],
+                                empty_message="No age sketches found - run with --build-sketches")
+        
+        self._print_subheader("All Students")
+        overall = data['global']
+        self._print_results_table(
+            [[overall['student_count']] + [overall[key] for key in percentile_keys]],
+            headers=["Students"] + [k.upper() for k in percentile_keys]
+        )
+        self._print_info(f"Computed from sketches in {data['elapsed_ms']:.1f} ms (exact per-year histograms)")
     
     def _show_perf_analysis(self, opt_svc: 'OptSvc'):
         self._print_header("Query Performance Analysis")
@@ -288,12 +625,12 @@ class Controller:
         table_stats = analysis.get('table_statistics', [])
         if table_stats:
             table_data = [
-                [t['table_name'], f"{t['table_size_mb']:.2f}", f"{t['data_size_mb']:.2f}", 
-                 f"{t['index_size_mb']:.2f}", t['table_rows']]
+                [t['table_name'], t['table_size_mb'], t['data_size_mb'], t['index_size_mb'], t['table_rows']]
                 for t in table_stats
             ]
             self._print_results_table(table_data, 
-                                    headers=["Table", "Total MB", "Data MB", "Index MB", "Rows"])
+                                    headers=["Table", "Total MB", "Data MB", "Index MB", "Rows"],
+                                    formats=dict.fromkeys(["Total MB", "Data MB", "Index MB"], "{:.2f}"))
         
         self._print_subheader("Query Analysis Summary")
         query_analyses = analysis.get('query_analyses', {})
@@ -321,6 +658,285 @@ class Controller:
             for rec in suggested:
                 self._print_info(rec)
     
+    def _show_partition_pruning(self, opt_svc: 'OptSvc'):
+        self._print_header("Partition Pruning")
+        results = opt_svc.check_partition_pruning()
+        
+        table_data = []
+        for query_name, result in results.items():
+            if 'error' in result:
+                table_data.append([query_name, None, None, None, f"error: {result['error']}"])
+                continue
+            if not result['partitions_total']:
+                table_data.append([query_name, None, 0, None, "students is not partitioned"])
+                continue
+            accessed = result['partitions_accessed']
+            table_data.append([
+                query_name,
+                len(accessed),
+                result['partitions_total'],
+                ", ".join(accessed) or "none",
+                "pruned" if result['pruned'] else "all partitions scanned"
+            ])
+        
+        self._print_results_table(table_data, headers=["Query", "Accessed", "Total", "Partitions", "Result"])
+    
+    def _run_benchmark(self, benchmark_svc: 'BenchmarkSvc', args):
+        self._print_header("Query Benchmark")
+        self._print_info(
+            f"{len(benchmark_svc.get_suite())} queries, {args.iterations} iterations after {args.warmup} warmup, "
+            f"concurrency {', '.join(map(str, args.concurrency))}"
+        )
+        
+        report = benchmark_svc.run(args.iterations, args.warmup, args.concurrency)
+        self._print_results_table(
+            [[r['query'], r['concurrency'], r['rows_per_execution'], r['p50_ms'], r['p95_ms'], r['p99_ms'],
+              r['throughput_qps'], r['rows_per_sec']]
+             for r in report['results']],
+            headers=["Query", "Workers", "Rows", "P50 ms", "P95 ms", "P99 ms", "QPS", "Rows/s"],
+            formats={"P50 ms": "{:.2f}", "P95 ms": "{:.2f}", "P99 ms": "{:.2f}", "QPS": "{:.1f}", "Rows/s": "{:.0f}"}
+        )
+        
+        if args.compare:
+            comparison = benchmark_svc.compare(benchmark_svc.load(args.compare), report)
+            self._print_subheader(f"Change vs {args.compare}")
+            self._print_results_table(
+                [[c['query'], c['concurrency'], c['p50_ms_change'], c['p95_ms_change'],
+                  c['p99_ms_change'], c['throughput_qps_change']]
+                 for c in comparison],
+                headers=["Query", "Workers", "P50", "P95", "P99", "QPS"],
+                empty_message="No matching queries in the saved result",
+                formats=dict.fromkeys(["P50", "P95", "P99", "QPS"], "{:+.1%}")
+            )
+        
+        if args.save:
+            benchmark_svc.save(report, args.save)
+            self._print_success(f"Benchmark results saved to {args.save}")
+    
+    def _capture_baselines(self, opt_svc: 'OptSvc'):
+        self._print_header("Plan Baselines")
+        
+        result = opt_svc.capture_baselines()
+        if 'error' in result:
+            self._print_error(f"Baseline capture failed: {result['error']}")
+            return
+        
+        self._print_results_table(
+            [[name, b['fingerprint'], b['actual_ms'], b['actual_rows']]
+             for name, b in result['baselines'].items()],
+            headers=["Query", "Plan", "Actual ms", "Rows"],
+            formats={"Plan": lambda fingerprint: fingerprint[:12], "Actual ms": "{:.2f}"}
+        )
+        self._print_success(f"Stored {len(result['baselines'])} baselines")
+    
+    def _show_plan_regressions(self, opt_svc: 'OptSvc', threshold: float):
+        self._print_header("Plan Regressions")
+        
+        result = opt_svc.check_regressions(threshold)
+        if 'error' in result:
+            self._print_error(f"Regression check failed: {result['error']}")
+            return
+        
+        table_data = []
+        for name, r in result['results'].items():
+            if r['status'] == 'no baseline':
+                table_data.append([name, r['status'], None, r['actual_ms'], None, None, r['actual_rows']])
+                continue
+            table_data.append([
+                name, r['status'], r['baseline_ms'], r['actual_ms'],
+                r['change'], r['baseline_rows'], r['actual_rows']
+            ])
+        self._print_results_table(
+            table_data,
+            headers=["Query", "Status", "Baseline ms", "Actual ms", "Change", "Baseline Rows", "Actual Rows"],
+            formats={"Baseline ms": "{:.2f}", "Actual ms": "{:.2f}", "Change": "{:+.1%}"}
+        )
+        
+        for name, r in result['results'].items():
+            if r.get('plan_changed'):
+                self._print_subheader(f"{name}: plan changed")
+                self._print_text("Baseline:")
+                self._print_text(r['baseline_plan'])
+                self._print_text("Current:")
+                self._print_text(r['plan_text'])
+        
+        flagged = [n for n, r in result['results'].items() if r.get('regressed') or r.get('plan_changed')]
+        if flagged:
+            self._print_warning(f"{len(flagged)} queries regressed or changed plan "
+                                f"(threshold {result['threshold']:.0%})")
+        else:
+            self._print_success("No plan changes or latency regressions")
+    
+    def _show_workload_profile(self, opt_svc: 'OptSvc', window: float, run: str):
+        from ..database.workload_profiler import RANKINGS
+        self._print_header("Workload Profile")
+        
+        if window is None and not run:
+            self._print_subheader("Slowest Statements Since Server Start")
+            self._print_results_table(
+                [[q['sql_text'], q['exec_count'], float(q['avg_exec_time_sec']) * 1000,
+                  float(q['max_exec_time_sec']) * 1000, q['total_exec_time_sec']]
+                 for q in opt_svc.get_slow_queries()],
+                headers=["Statement", "Count", "Avg ms", "Max ms", "Total s"],
+                empty_message="No statement digests recorded",
+                formats={"Statement": self._short_digest, "Avg ms": "{:.2f}", "Max ms": "{:.2f}", "Total s": "{:.2f}"}
+            )
+            self._print_info("Use --window SECONDS or --run COMMAND to profile a specific workload")
+            return
+        
+        action = None
+        if run:
+            try:
+                sub_args = self.arg_parser.parse_args(shlex.split(run))
+            except (SystemExit, ValueError):
+                # argparse has already printed the usage error
+                self._print_error(f"Cannot parse command to profile: {run}")
+                return
+            handler = self.cmd_handlers.get(sub_args.command)
+            if handler is None or sub_args.command in (Commands.OPTIMIZE, Commands.SERVE):
+                self._print_error(f"Cannot profile command: {run}")
+                return
+            # the handler reuses this command's services (see _init_services)
+            action = lambda: handler(sub_args)
+        
+        # Digests come from the primary's performance_schema, so the
+        # profiled reads must not go to a replica.
+        with self.conn_manager.pin_primary():
+            profile = opt_svc.profile_workload(seconds=window, action=action)
+        if 'error' in profile:
+            self._print_error(f"Workload profiling failed: {profile['error']}")
+            return
+        
+        self._print_info(f"{len(profile['digests'])} statement digests in {profile['elapsed_sec']:.1f} s")
+        
+        for key, title in RANKINGS.items():
+            self._print_subheader(f"Top by {title}")
+            self._print_results_table(
+                [[d['digest_text'], d['exec_count'], d['total_ms'], d['avg_ms'], d['rows_examined'],
+                  d['rows_sent'], d['tmp_tables'], d['tmp_disk_tables'], d['sort_rows']]
+                 for d in profile['rankings'][key]],
+                headers=["Statement", "Count", "Total ms", "Avg ms", "Rows Examined", "Rows Sent",
+                         "Tmp", "Tmp Disk", "Sort Rows"],
+                empty_message="No matching statements",
+                formats={"Statement": self._short_digest, "Total ms": "{:.2f}", "Avg ms": "{:.3f}"}
+            )
+    
+    @staticmethod
+    def _short_digest(text: str, width: int = 60) -> str:
+        text = " ".join((text or "").split())
+        return text if len(text) <= width else text[:width - 1] + "…"
+    
+    def _show_index_report(self, opt_svc: 'OptSvc'):
+        self._print_header("Index Report")
+        
+        report = opt_svc.get_index_report()
+        if 'error' in report:
+            self._print_error(f"Index report failed: {report['error']}")
+            return
+        
+        if report['counters_available']:
+            self._print_info(f"Read counters cover {report['uptime_sec'] / 3600:.1f} h of server uptime")
+        else:
+            self._print_warning("performance_schema counters unavailable - unused indexes not detected")
+        if not report['sizes_available']:
+            self._print_warning("mysql.innodb_index_stats unavailable - index sizes and insert cost not shown")
+        
+        table_data = [
+            [
+                index['table_name'],
+                index['index_name'],
+                ", ".join(index['columns']),
+                index['size_mb'],
+                index['bytes_per_row'],
+                index['insert_share'],
+                index['reads']
+            ]
+            for index in report['indexes']
+        ]
+        self._print_results_table(
+            table_data,
+            headers=["Table", "Index", "Columns", "Size MB", "Bytes/Row", "Insert Share", "Reads"],
+            formats={"Size MB": "{:.2f}", "Bytes/Row": "{:.1f}", "Insert Share": "{:.1%}"}
+        )
+        
+        self._print_subheader("Drop Candidates")
+        drops = report['drop_candidates']
+        if not drops:
+            self._print_success("No redundant or unused indexes found")
+            return
+        
+        self._print_results_table(
+            [[d['table_name'], d['index_name'], d['reason'], d['size_mb'], d['insert_share']]
+             for d in drops],
+            headers=["Table", "Index", "Reason", "Size MB", "Insert Share"],
+            formats={"Size MB": "{:.2f}", "Insert Share": "{:.1%}"}
+        )
+        for drop in drops:
+            self._print_text(f"  • {drop['ddl']};")
+        self._print_warning("Check that foreign keys keep a usable index before dropping")
+    
+    def _show_index_advice(self, opt_svc: 'OptSvc', min_gain: float):
+        self._print_header("Index Advisor")
+        if opt_svc.index_advisor:
+            opt_svc.index_advisor.min_gain = min_gain
+        
+        advice = opt_svc.advise_indexes()
+        if 'error' in advice:
+            self._print_error(f"Index advice failed: {advice['error']}")
+            return
+        
+        self._print_info(
+            f"{advice['candidates']} candidates validated on a {advice['sample_rate']:.0%} shadow sample "
+            f"(baseline workload {advice['baseline_ms']:.1f} ms)"
+        )
+        
+        def advice_rows(entries):
+            for entry in entries:
+                best_query = max(entry['query_gains'], key=entry['query_gains'].get)
+                yield [
+                    entry['table'],
+                    ", ".join(entry['columns']),
+                    entry['covering'],
+                    entry['workload_gain'],
+                    best_query,
+                    entry['query_gains'][best_query]
+                ]
+        
+        headers = ["Table", "Columns", "Covering", "Workload Gain", "Best Query", "Best Query Gain"]
+        formats = {
+            "Covering": lambda covering: "yes" if covering else "no",
+            "Workload Gain": "{:+.1%}",
+            "Best Query Gain": "{:+.1%}"
+        }
+        self._print_subheader(f"Recommended (gain ≥ {min_gain:.0%})")
+        self._print_results_table(advice_rows(advice['recommendations']), headers=headers,
+                                  empty_message="No candidate beat the threshold", formats=formats)
+        for entry in advice['recommendations']:
+            self._print_text(f"  • {entry['ddl']};")
+        
+        if advice['rejected']:
+            self._print_subheader("Rejected")
+            self._print_results_table(advice_rows(advice['rejected']), headers=headers, formats=formats)
+    
+    def _calibrate_variants(self, calibration_svc: 'CalibrationSvc', analytics_repo: 'AnalyticsRepo'):
+        self._print_header("Query Variant Calibration")
+        self._print_info("Timing every registered variant on the live dataset...")
+        
+        results = calibration_svc.calibrate()
+        # later operations of this command (--baseline, --advise) must see the new choices
+        analytics_repo.reload_variants()
+        table_data = [
+            [query_name, variant, ms, variant == result['winner']]
+            for query_name, result in results.items()
+            for variant, ms in sorted(result['timings_ms'].items(), key=lambda t: t[1])
+        ]
+        
+        self._print_results_table(
+            table_data, headers=["Query", "Variant", "Median ms", "Chosen"],
+            formats={"Median ms": "{:.1f}", "Chosen": lambda chosen: "✓" if chosen else ""}
+        )
+        self._print_success("Variant choices stored; analytics will use them from now on")
+    
     def _init_db_schema(self, schema_mgr: 'SchemaMgr'): 
         self._print_info("Initializing database schema...")
         schema_mgr.create_db()
@@ -336,7 +952,8 @@ class Controller:
     def _show_db_status(self, schema_mgr: 'SchemaMgr'):  
         self._print_header("Database Status")
         from ..constants import Tables
-        tables = [Tables.ROOMS, Tables.STUDENTS]
+        tables = [Tables.ROOMS, Tables.STUDENTS, Tables.ROOM_AGE_SKETCHES, Tables.QUERY_VARIANT_CHOICES,
+                  Tables.QUERY_PLAN_BASELINES, Tables.DATA_VERSION]
         status_data = []
         
         for table in tables:
@@ -350,70 +967,74 @@ class Controller:
         if table_info:
             self._print_subheader("Table Information")
             info_data = [
-                [t['table_name'], f"{t['table_size_mb']:.2f}", t['table_rows']]
+                [t['table_name'], t['table_size_mb'], t['table_rows']]
                 for t in table_info
             ]
-            self._print_results_table(info_data, headers=["Table", "Size (MB)", "Rows"])
+            self._print_results_table(info_data, headers=["Table", "Size (MB)", "Rows"],
+                                      formats={"Size (MB)": "{:.2f}"})
+        
+        if schema_mgr.is_partitioned:
+            self._print_subheader("Students Partitions")
+            partition_data = [
+                [p['partition_name'], p['partition_method'], p['partition_expression'], p['table_rows']]
+                for p in schema_mgr.get_partition_info()
+            ]
+            self._print_results_table(partition_data, headers=["Partition", "Method", "Expression", "Rows"])
+            
+            orphans = schema_mgr.count_orphan_students()
+            if orphans:
+                self._print_warning(f"{orphans} students reference missing rooms")
+            else:
+                self._print_success("Room references are consistent")
     
-    def _print_results_table(self, data: List[List], headers: List[str]):
-        if not data:
-            self._print_warning("No data to display")
-            return
+    def _print_results_table(self, data: Iterable[List], headers: List[str],
+                             empty_message: str = "No data to display",
+                             formats: Optional[CellFormats] = None):
+        """Render rows of raw values; ``formats`` only applies to the table output."""
+        written, total = self.renderer.render(data, headers, self._section, formats)
         
-        if self.config.truncate_long_text:
-            processed_data = []
-            for row in data:
-                processed_row = []
-                for cell in row:
-                    cell_str = str(cell)
-                    if len(cell_str) > self.config.max_text_length:
-                        cell_str = cell_str[:self.config.max_text_length-3] + "..."
-                    processed_row.append(cell_str)
-                processed_data.append(processed_row)
-            data = processed_data
-        
-        if len(data) > self.config.max_display_rows:
-            displayed_data = data[:self.config.max_display_rows]
-            print(tabulate(displayed_data, headers=headers, tablefmt=self.config.table_format))
-            self._print_warning(f"Showing first {self.config.max_display_rows} of {len(data)} rows")
-        else:
-            print(tabulate(data, headers=headers, tablefmt=self.config.table_format))
+        if not total:
+            self._print_warning(empty_message)
+        elif written < total:
+            self._print_warning(f"Showing first {written} of {total} rows")
     
     def _print_header(self, text: str):
+        self._section = text
         if self.config.use_colors:
-            print(f"\n{self.config.header_color}{'='*60}")
-            print(f"{text.center(60)}")
-            print(f"{'='*60}{self.config.reset_color}")
+            print(f"\n{self.config.header_color}{'='*60}", file=self.status_stream)
+            print(f"{text.center(60)}", file=self.status_stream)
+            print(f"{'='*60}{self.config.reset_color}", file=self.status_stream)
         else:
-            print(f"\n{'='*60}")
-            print(f"{text.center(60)}")
-            print(f"{'='*60}")
+            print(f"\n{'='*60}", file=self.status_stream)
+            print(f"{text.center(60)}", file=self.status_stream)
+            print(f"{'='*60}", file=self.status_stream)
     
     def _print_subheader(self, text: str):
+        self._section = text
         if self.config.use_colors:
-            print(f"\n{self.config.header_color}{text}:{self.config.reset_color}")
-            print(f"{'-'*len(text)}")
+            print(f"\n{self.config.header_color}{text}:{self.config.reset_color}", file=self.status_stream)
+            print(f"{'-'*len(text)}", file=self.status_stream)
         else:
-            print(f"\n{text}:")
-            print(f"{'-'*len(text)}")
+            print(f"\n{text}:", file=self.status_stream)
+            print(f"{'-'*len(text)}", file=self.status_stream)
     
     def _print_success(self, text: str):
         if self.config.use_colors:
-            print(f"{self.config.success_color} {text}{self.config.reset_color}")
+            print(f"{self.config.success_color} {text}{self.config.reset_color}", file=self.status_stream)
         else:
-            print(f" {text}")
+            print(f" {text}", file=self.status_stream)
     
     def _print_info(self, text: str):
         if self.config.use_colors:
-            print(f"{self.config.header_color} {text}{self.config.reset_color}")
+            print(f"{self.config.header_color} {text}{self.config.reset_color}", file=self.status_stream)
         else:
-            print(f" {text}")
+            print(f" {text}", file=self.status_stream)
     
     def _print_warning(self, text: str):
         if self.config.use_colors:
-            print(f"{self.config.warning_color} {text}{self.config.reset_color}")
+            print(f"{self.config.warning_color} {text}{self.config.reset_color}", file=self.status_stream)
         else:
-            print(f" {text}")
+            print(f" {text}", file=self.status_stream)
     
     def _print_error(self, text: str):
         if self.config.use_colors:
@@ -422,4 +1043,4 @@ class Controller:
             print(f" {text}", file=sys.stderr)
     
     def _print_text(self, text: str):
-        print(text)
\ No newline at end of file
+        print(text, file=self.status_stream)
\ No newline at end of file
@@ -0,0 +1,160 @@
+"""Streaming result renderers for the --output formats."""
+import csv
+import json
+import re
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import chain, islice
+from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO, Tuple, Type, Union
+
+from ..constants import OutputFormats
+from ..exceptions.exceptions import ValidationError
+from .config import Config
+
+# header -> str.format template ("{:.1f}") or callable, applied by TableRenderer only
+CellFormats = Dict[str, Union[str, Callable[[Any], str]]]
+
+
+class RowRenderer(ABC):
+    """Writes rows to ``stream`` as they are pulled from the iterable.
+
+    Rows carry raw values; ``formats`` only shapes how the table shows
+    them. ``render`` returns ``(written, total)``; the two differ only
+    when the renderer stops showing rows before the input runs out.
+    """
+
+    def __init__(self, stream: TextIO, config: Config):
+        self.stream = stream
+        self.config = config
+
+    @abstractmethod
+    def render(self, rows: Iterable[List], headers: List[str], section: Optional[str] = None,
+               formats: Optional[CellFormats] = None) -> Tuple[int, int]:
+        pass
+
+
+class TableRenderer(RowRenderer):
+    """Lays out ``table_page_size`` rows at a time with tabulate.
+
+    Only the current page is held in memory; rows past
+    ``max_display_rows`` are counted but not shown.
+    """
+
+    def render(self, rows: Iterable[List], headers: List[str], section: Optional[str] = None,
+               formats: Optional[CellFormats] = None) -> Tuple[int, int]:
+        from tabulate import tabulate
+        rows = iter(rows)
+        cell_formats = [(formats or {}).get(header) for header in headers]
+        limit = self.config.max_display_rows or None
+        shown = 0
+
+        while limit is None or shown < limit:
+            size = self.config.table_page_size if limit is None else min(self.config.table_page_size, limit - shown)
+            page = [self._format_row(row, cell_formats) for row in islice(rows, size)]
+            if not page:
+                break
+            self.stream.write(tabulate(page, headers=headers, tablefmt=self.config.table_format) + "\n")
+            self.stream.flush()
+            shown += len(page)
+            if len(page) < size:
+                return shown, shown
+
+        return shown, shown + sum(1 for _ in rows)
+
+    def _format_row(self, row: List, cell_formats: List) -> List:
+        processed_row = []
+        for cell, cell_format in zip(row, cell_formats):
+            if cell is None:
+                cell = "-"
+            elif callable(cell_format):
+                cell = cell_format(cell)
+            elif cell_format:
+                cell = cell_format.format(cell)
+
+            if self.config.truncate_long_text:
+                cell = str(cell)
+                if len(cell) > self.config.max_text_length:
+                    cell = cell[:self.config.max_text_length-3] + "..."
+            processed_row.append(cell)
+        return processed_row
+
+
+class JsonlRenderer(RowRenderer):
+    """One JSON object per line, keyed by the snake_cased column headers.
+
+    Every object carries a ``section`` key naming the result it belongs
+    to, since one command can print several.
+    """
+
+    def render(self, rows: Iterable[List], headers: List[str], section: Optional[str] = None,
+               formats: Optional[CellFormats] = None) -> Tuple[int, int]:
+        keys = [field_name(header) for header in headers]
+        prefix = {'section': field_name(section)} if section else {}
+        written = 0
+        for row in rows:
+            record = dict(prefix)
+            record.update(zip(keys, row))
+            self.stream.write(json.dumps(record, default=_json_default) + "\n")
+            written += 1
+        return written, written
+
+
+class CsvRenderer(RowRenderer):
+    """CSV with a header line; nothing at all for an empty result.
+
+    A CSV stream has a single header, so a command may only produce one
+    non-empty result; a second one raises ValidationError before any of
+    its rows is written.
+    """
+
+    def __init__(self, stream: TextIO, config: Config):
+        super().__init__(stream, config)
+        self._first_section: Optional[str] = None
+        self._written_any = False
+
+    def render(self, rows: Iterable[List], headers: List[str], section: Optional[str] = None,
+               formats: Optional[CellFormats] = None) -> Tuple[int, int]:
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None:
+            return 0, 0
+        if self._written_any:
+            raise ValidationError(
+                f"--output csv holds a single result, but '{section or 'another result'}' follows "
+                f"'{self._first_section or 'the first one'}'; select one result or use --output jsonl"
+            )
+        self._written_any = True
+        self._first_section = section
+
+        writer = csv.writer(self.stream)
+        writer.writerow(headers)
+        written = 0
+        for row in chain([first], rows):
+            writer.writerow(row)
+            written += 1
+        return written, written
+
+
+RENDERERS: Dict[str, Type[RowRenderer]] = {
+    OutputFormats.TABLE: TableRenderer,
+    OutputFormats.JSONL: JsonlRenderer,
+    OutputFormats.CSV: CsvRenderer
+}
+
+
+def make_renderer(output_format: str, stream: TextIO, config: Optional[Config] = None) -> RowRenderer:
+    return RENDERERS[output_format](stream, config or Config())
+
+
+def field_name(header: str) -> str:
+    """'Room Name' -> 'room_name', '95% CI' -> '95_ci'."""
+    return re.sub(r'[^0-9a-z]+', '_', header.lower()).strip('_')
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
@@ -10,6 +10,7 @@ class AppConfig:
     
     BATCH_SIZE: int = 1000
     MAX_RETRIES: int = 3
+    RETRY_BASE_DELAY: float = 0.05
     RETRY_DELAY: float = 1.0
 
     QUERY_TIMEOUT: int = 300
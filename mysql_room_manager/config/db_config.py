@@ -1,6 +1,6 @@
 import os
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field, replace
+from typing import Optional, List
 
 
 @dataclass
@@ -14,11 +14,30 @@ class DbConfig:
     
     pool_name: str = "student_room_pool"
     pool_size: int = 10
+    pool_min_size: int = 1
+    pool_checkout_timeout: float = 10.0
+    pool_idle_timeout: float = 300.0
+    pool_max_lifetime: float = 1800.0
+    pool_validate_after: float = 30.0
+    pool_prewarm: int = 2
     pool_reset_session: bool = True
     
     connection_timeout: int = 30
     autocommit: bool = False
     
+    fetch_batch_size: int = 1000
+    stmt_cache_size: int = 0
+    lookup_chunk_size: int = 1000
+    entity_cache_size: int = 0
+    
+    replicas: List[str] = field(default_factory=list)
+    replica_retry_interval: float = 5.0
+    read_your_writes_window: float = 1.0
+    
+    students_partitioning: str = ""
+    students_partitions: int = 8
+    students_partition_width: int = 0
+    
     use_ssl: bool = False
     ssl_ca: Optional[str] = None
     ssl_cert: Optional[str] = None
@@ -34,13 +53,43 @@ class DbConfig:
             database=os.getenv('DB_NAME', 'student_room_analytics'),
             charset=os.getenv('DB_CHARSET', 'utf8mb4'),
             pool_size=int(os.getenv('DB_POOL_SIZE', '10')),
+            pool_min_size=int(os.getenv('DB_POOL_MIN_SIZE', '1')),
+            pool_checkout_timeout=float(os.getenv('DB_POOL_CHECKOUT_TIMEOUT', '10')),
+            pool_idle_timeout=float(os.getenv('DB_POOL_IDLE_TIMEOUT', '300')),
+            pool_max_lifetime=float(os.getenv('DB_POOL_MAX_LIFETIME', '1800')),
+            pool_validate_after=float(os.getenv('DB_POOL_VALIDATE_AFTER', '30')),
+            pool_prewarm=int(os.getenv('DB_POOL_PREWARM', '2')),
             connection_timeout=int(os.getenv('DB_TIMEOUT', '30')),
+            fetch_batch_size=int(os.getenv('DB_FETCH_BATCH_SIZE', '1000')),
+            stmt_cache_size=int(os.getenv('DB_STMT_CACHE_SIZE', '0')),
+            lookup_chunk_size=int(os.getenv('DB_LOOKUP_CHUNK_SIZE', '1000')),
+            entity_cache_size=int(os.getenv('DB_ENTITY_CACHE_SIZE', '0')),
+            replicas=[r.strip() for r in os.getenv('DB_REPLICAS', '').split(',') if r.strip()],
+            replica_retry_interval=float(os.getenv('DB_REPLICA_RETRY_INTERVAL', '5')),
+            read_your_writes_window=float(os.getenv('DB_READ_YOUR_WRITES_WINDOW', '1')),
+            students_partitioning=os.getenv('DB_STUDENTS_PARTITIONING', ''),
+            students_partitions=int(os.getenv('DB_STUDENTS_PARTITIONS', '8')),
+            students_partition_width=int(os.getenv('DB_STUDENTS_PARTITION_WIDTH', '0')),
             use_ssl=os.getenv('DB_USE_SSL', 'false').lower() == 'true',
             ssl_ca=os.getenv('DB_SSL_CA'),
             ssl_cert=os.getenv('DB_SSL_CERT'),
             ssl_key=os.getenv('DB_SSL_KEY')
         )
     
+    def replica_configs(self) -> List['DbConfig']:
+        """One config per ``host[:port]`` entry of ``replicas``, otherwise identical to this one."""
+        configs = []
+        for i, endpoint in enumerate(self.replicas):
+            host, _, port = endpoint.partition(':')
+            configs.append(replace(
+                self,
+                host=host,
+                port=int(port) if port else self.port,
+                pool_name=f"{self.pool_name}_replica{i}",
+                replicas=[]
+            ))
+        return configs
+    
     def to_conn_dict(self) -> dict: 
         config = {
             'host': self.host,
@@ -5,6 +5,8 @@ class Commands:
     ANALYTICS = 'analytics'
     OPTIMIZE = 'optimize'
     DATABASE = 'database'
+    GENERATE = 'generate'
+    SERVE = 'serve'
 
 class AnalyticsOpts:
     REPORT = 'report'
@@ -12,6 +14,9 @@ class AnalyticsOpts:
     YOUNGEST_ROOMS = 'youngest_rooms'
     AGE_GAPS = 'age_gaps'
     MIXED_GENDER = 'mixed_gender'
+    AGE_PERCENTILES = 'age_percentiles'
+    BUILD_SKETCHES = 'build_sketches'
+    SAMPLE = 'sample'
 
 class DbOps:
     INIT = 'init'
@@ -21,12 +26,31 @@ class DbOps:
 class OptOps:
     ANALYZE = 'analyze'
     RECOMMENDATIONS = 'recommendations'
+    CALIBRATE = 'calibrate'
+    PARTITIONS = 'partitions'
+    ADVISE = 'advise'
+    INDEXES = 'indexes'
+    WORKLOAD = 'workload'
+    BASELINE = 'baseline'
+    REGRESSIONS = 'regressions'
+    BENCHMARK = 'benchmark'
 
 class Formats:
     JSON = 'json'
     XML = 'xml'
+    CSV = 'csv'
+
+class OutputFormats:
+    TABLE = 'table'
+    JSONL = 'jsonl'
+    CSV = 'csv'
 
 class Tables:
     ROOMS = 'rooms'
     STUDENTS = 'students'
+    ROOM_AGE_SKETCHES = 'room_age_sketches'
+    QUERY_VARIANT_CHOICES = 'query_variant_choices'
+    QUERY_PLAN_BASELINES = 'query_plan_baselines'
+    DATA_VERSION = 'data_version'
 
+AGE_PERCENTILES = (50, 90, 99)
@@ -1,14 +1,38 @@
 from .loaders import LoaderFactory, JsonLoader
-from .repositories import (
-    StudentRepo,
-    RoomRepo,
-    AnalyticsRepo
-)
+from .generators import DatasetGen, DatasetSpec
+from ..utils.lazy_import import lazy_exports
+
+# Repositories pull in mysql.connector; generators and loaders do not need it.
+__getattr__, __dir__ = lazy_exports(__name__, dict.fromkeys([
+    'StudentRepo',
+    'RoomRepo',
+    'AnalyticsRepo',
+    'EntityCache',
+    'SketchRepo',
+    'SampledAnalyticsRepo',
+    'VariantRepo',
+    'BaselineRepo',
+    'DataVersionRepo',
+    'AsyncStudentRepo',
+    'AsyncRoomRepo',
+    'AsyncAnalyticsRepo'
+], '.repositories'))
 
 __all__ = [
     'LoaderFactory',
     'JsonLoader',
+    'DatasetGen',
+    'DatasetSpec',
     'StudentRepo',
     'RoomRepo', 
-    'AnalyticsRepo'
+    'AnalyticsRepo',
+    'EntityCache',
+    'SketchRepo',
+    'SampledAnalyticsRepo',
+    'VariantRepo',
+    'BaselineRepo',
+    'DataVersionRepo',
+    'AsyncStudentRepo',
+    'AsyncRoomRepo',
+    'AsyncAnalyticsRepo'
 ]
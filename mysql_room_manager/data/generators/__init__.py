@@ -0,0 +1,4 @@
+from .dataset_gen import DatasetGen, DatasetSpec
+from .writers import write_json, write_csv
+
+__all__ = ['DatasetGen', 'DatasetSpec', 'write_json', 'write_csv']
@@ -0,0 +1,118 @@
+import random
+from bisect import bisect
+from dataclasses import dataclass, field
+from datetime import date
+from itertools import accumulate
+from typing import Iterator, Dict, Any
+
+from ...exceptions.exceptions import ValidationError
+
+DAYS_PER_YEAR = 365.2425
+
+MALE_NAMES = (
+    "James", "John", "Robert", "Michael", "William", "David", "Richard", "Joseph",
+    "Thomas", "Charles", "Christian", "Daniel", "Matthew", "Anthony", "Mark", "Paul",
+    "Steven", "Andrew", "Joshua", "Kevin", "Brian", "George", "Edward", "Juan"
+)
+FEMALE_NAMES = (
+    "Mary", "Patricia", "Jennifer", "Linda", "Elizabeth", "Barbara", "Susan", "Jessica",
+    "Sarah", "Karen", "Nancy", "Lisa", "Betty", "Margaret", "Sandra", "Ashley",
+    "Kimberly", "Emily", "Donna", "Michelle", "Dorothy", "Carol", "Amanda", "Peggy"
+)
+LAST_NAMES = (
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+    "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas",
+    "Taylor", "Moore", "Jackson", "Martin", "Lee", "Perez", "Thompson", "White",
+    "Harris", "Sanchez", "Clark", "Ramirez", "Lewis", "Robinson", "Walker", "Young",
+    "Allen", "King", "Wright", "Scott", "Torres", "Nguyen", "Hill", "Flores",
+    "Green", "Adams", "Nelson", "Baker", "Hall", "Rivera", "Campbell", "Mitchell",
+    "Carter", "Roberts", "Ryan", "Bush"
+)
+
+
+@dataclass
+class DatasetSpec:
+    students: int = 10000
+    rooms: int = 1000
+    seed: int = 42
+    # Zipf exponent of room sizes; 0 spreads students uniformly
+    room_skew: float = 0.0
+    age_mean: float = 20.0
+    age_stddev: float = 3.0
+    min_age: int = 16
+    max_age: int = 40
+    male_ratio: float = 0.5
+    unassigned_ratio: float = 0.0
+    as_of: date = field(default_factory=lambda: date(date.today().year, 1, 1))
+    
+    def __post_init__(self):
+        if self.students < 0 or self.rooms < 0:
+            raise ValidationError("Student and room counts must be non-negative")
+        if self.students and not self.rooms and self.unassigned_ratio < 1:
+            raise ValidationError("Students need at least one room unless all are unassigned")
+        if not 0 <= self.min_age <= self.max_age:
+            raise ValidationError(f"Invalid age range: {self.min_age}..{self.max_age}")
+        for name in ('male_ratio', 'unassigned_ratio'):
+            if not 0 <= getattr(self, name) <= 1:
+                raise ValidationError(f"{name} must be between 0 and 1")
+        if self.room_skew < 0 or self.age_stddev < 0:
+            raise ValidationError("room_skew and age_stddev must be non-negative")
+        # ages are re-drawn until they fall in range, which needs the mean inside it
+        if not self.min_age <= self.age_mean < self.max_age + 1:
+            raise ValidationError(f"age_mean {self.age_mean} is outside {self.min_age}..{self.max_age}")
+
+
+class DatasetGen:
+    """Streams a seeded synthetic dataset in the same shape as students.json/rooms.json.
+
+    Output is a pure function of the spec: the same spec always yields the
+    same records in the same order. Students are generated one at a time,
+    so memory stays constant in the student count; only the room size
+    distribution (one float per room) is held.
+    """
+    
+    def __init__(self, spec: DatasetSpec):
+        self.spec = spec
+        self._room_ids, self._room_weights = self._build_room_distribution()
+    
+    def iter_rooms(self) -> Iterator[Dict[str, Any]]:
+        for room_id in range(self.spec.rooms):
+            yield {'id': room_id, 'name': f"Room #{room_id}"}
+    
+    def iter_students(self) -> Iterator[Dict[str, Any]]:
+        spec = self.spec
+        rng = random.Random(f"{spec.seed}:students")
+        as_of = spec.as_of.toordinal()
+        min_days = int(spec.min_age * DAYS_PER_YEAR)
+        max_days = int((spec.max_age + 1) * DAYS_PER_YEAR) - 1
+        total_weight = self._room_weights[-1] if self._room_weights else 0.0
+        
+        for student_id in range(spec.students):
+            is_male = rng.random() < spec.male_ratio
+            first_names = MALE_NAMES if is_male else FEMALE_NAMES
+            
+            # rejection sampling: clamping would pile the tails onto min_age and max_age
+            age_days = int(rng.gauss(spec.age_mean, spec.age_stddev) * DAYS_PER_YEAR)
+            while not min_days <= age_days <= max_days:
+                age_days = int(rng.gauss(spec.age_mean, spec.age_stddev) * DAYS_PER_YEAR)
+            birthday = date.fromordinal(as_of - age_days)
+            
+            room = None
+            if rng.random() >= spec.unassigned_ratio and total_weight:
+                room = self._room_ids[bisect(self._room_weights, rng.random() * total_weight)]
+            
+            yield {
+                'birthday': f"{birthday.isoformat()}T00:00:00.000000",
+                'id': student_id,
+                'name': f"{rng.choice(first_names)} {rng.choice(LAST_NAMES)}",
+                'room': room,
+                'sex': 'M' if is_male else 'F'
+            }
+    
+    def _build_room_distribution(self):
+        """Cumulative Zipf weights, assigned to rooms in a seeded random order."""
+        room_ids = list(range(self.spec.rooms))
+        random.Random(f"{self.spec.seed}:rooms").shuffle(room_ids)
+        skew = self.spec.room_skew
+        weights = list(accumulate(1.0 / (rank ** skew) for rank in range(1, len(room_ids) + 1)))
+        return room_ids, weights
@@ -0,0 +1,27 @@
+import csv
+import json
+from typing import Iterable, Dict, Any, Sequence
+
+
+def write_json(path: str, records: Iterable[Dict[str, Any]]) -> int:
+    """Write records as a JSON array one at a time; the file loads with JsonLoader."""
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('[')
+        for record in records:
+            f.write(',\n    ' if count else '\n    ')
+            f.write(json.dumps(record, ensure_ascii=False))
+            count += 1
+        f.write('\n]\n' if count else ']\n')
+    return count
+
+
+def write_csv(path: str, records: Iterable[Dict[str, Any]], fields: Sequence[str]) -> int:
+    count = 0
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        for record in records:
+            writer.writerow(record)
+            count += 1
+    return count
@@ -1,5 +1,27 @@
 from .student_repo import StudentRepo
 from .room_repo import RoomRepo
 from .analytics_repo import AnalyticsRepo
+from .entity_cache import EntityCache
+from .sketch_repo import SketchRepo
+from .sampled_analytics_repo import SampledAnalyticsRepo
+from .variant_repo import VariantRepo
+from .baseline_repo import BaselineRepo
+from .data_version_repo import DataVersionRepo
+from .async_student_repo import AsyncStudentRepo
+from .async_room_repo import AsyncRoomRepo
+from .async_analytics_repo import AsyncAnalyticsRepo
 
-__all__ = ['StudentRepo', 'RoomRepo', 'AnalyticsRepo']
+__all__ = [
+    'StudentRepo',
+    'RoomRepo',
+    'AnalyticsRepo',
+    'EntityCache',
+    'SketchRepo',
+    'SampledAnalyticsRepo',
+    'VariantRepo',
+    'BaselineRepo',
+    'DataVersionRepo',
+    'AsyncStudentRepo',
+    'AsyncRoomRepo',
+    'AsyncAnalyticsRepo'
+]
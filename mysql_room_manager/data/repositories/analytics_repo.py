@@ -1,131 +1,96 @@
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Type
 
 from ...interfaces.repo_interface import AnalyticsRepoInterface
 from ...database.conn_manager import ConnManager
 from ...queries.analytics_queries import *
 from ...models.result import (
-    RoomStudentCount, RoomAvgAge, RoomAgeDiff, MixedGenderRoom 
+    ResultRow, RoomStudentCount, RoomAvgAge, RoomAgeDiff, MixedGenderRoom
 )
-from ...exceptions.exceptions import QueryError
+from ...exceptions.exceptions import QueryError, QueryTimeoutError
+from .variant_repo import VariantRepo
 
 
 class AnalyticsRepo(AnalyticsRepoInterface):  
     
-    def __init__(self, conn_manager: ConnManager):
+    def __init__(self, conn_manager: ConnManager, variant_repo: Optional[VariantRepo] = None):
         self.conn_manager = conn_manager  
+        self.variant_repo = variant_repo
+        self._variant_choices: Optional[Dict[str, Dict[str, Any]]] = None
         self.logger = logging.getLogger(__name__)
     
-    def get_rooms_with_student_count(self) -> List[Dict[str, Any]]:
+    def get_query(self, query_name: str) -> str:
+        """SQL for ``query_name``: the calibrated variant, else the registry default."""
+        variants = ANALYTICS_QUERY_VARIANTS[query_name]
+        if self._variant_choices is None:
+            self._variant_choices = self.variant_repo.load_choices() if self.variant_repo else {}
+        
+        choice = self._variant_choices.get(query_name, {}).get('variant')
+        return variants.get(choice) or next(iter(variants.values()))
+    
+    def reload_variants(self) -> None:
+        self._variant_choices = None
+    
+    def _iter_rows(self, query_name: str, params: Optional[tuple],
+                   model: Type[ResultRow], description: str) -> Iterator[ResultRow]:
         try:
-            self.logger.info("Executing query: rooms with student count")
-            
-            with self.conn_manager.get_conn() as conn:
-                cursor = conn.cursor(dictionary=True)
-                cursor.execute(ROOMS_WITH_STUDENT_COUNT_QUERY)
-                results = cursor.fetchall()
-                cursor.close()
-            
-            room_counts = [
-                RoomStudentCount(
-                    room_id=row['room_id'],
-                    room_name=row['room_name'],
-                    student_count=row['student_count']
-                ).to_dict()
-                for row in results
-            ]
+            self.logger.info(f"Streaming query: {description}")
             
-            self.logger.info(f"Found {len(room_counts)} rooms with student counts")
-            return room_counts
+            yield from self.conn_manager.iter_query(
+                self.get_query(query_name), params, read_only=True,
+                max_rows=self.conn_manager.max_rows, row_factory=model.row_factory
+            )
             
+        except QueryTimeoutError:
+            raise
         except Exception as e:
-            error_msg = f"Failed to get rooms with student count: {e}"
+            error_msg = f"Failed to get {description}: {e}"
             self.logger.error(error_msg)
             raise QueryError(error_msg)
     
+    def iter_room_student_count_rows(self) -> Iterator[RoomStudentCount]:
+        return self._iter_rows('rooms_with_student_count', None, RoomStudentCount,
+                               "rooms with student count")
+    
+    def iter_rooms_with_student_count(self) -> Iterator[Dict[str, Any]]:
+        return (row.to_dict() for row in self.iter_room_student_count_rows())
+    
+    def get_rooms_with_student_count(self) -> List[Dict[str, Any]]:
+        room_counts = list(self.iter_rooms_with_student_count())
+        self.logger.info(f"Found {len(room_counts)} rooms with student counts")
+        return room_counts
+    
+    def iter_room_avg_age_rows(self, limit: int = 5) -> Iterator[RoomAvgAge]:
+        return self._iter_rows('top_rooms_by_avg_age', (limit,), RoomAvgAge,
+                               f"top {limit} rooms by average age")
+    
+    def iter_top_rooms_by_avg_age(self, limit: int = 5) -> Iterator[Dict[str, Any]]:
+        return (row.to_dict() for row in self.iter_room_avg_age_rows(limit))
+    
     def get_top_rooms_by_avg_age(self, limit: int = 5) -> List[Dict[str, Any]]:
-        try:
-            self.logger.info(f"Executing query: top {limit} rooms by average age")
-            
-            with self.conn_manager.get_conn() as conn:
-                cursor = conn.cursor(dictionary=True)
-                cursor.execute(TOP_ROOMS_BY_AVG_AGE_QUERY, (limit,))
-                results = cursor.fetchall()
-                cursor.close()
-            
-            room_ages = [
-                RoomAvgAge(  
-                    room_id=row['room_id'],
-                    room_name=row['room_name'],
-                    average_age=float(row['average_age']),
-                    student_count=row['student_count']
-                ).to_dict()
-                for row in results
-            ]
-            
-            self.logger.info(f"Found {len(room_ages)} rooms with average ages")
-            return room_ages
-            
-        except Exception as e:
-            error_msg = f"Failed to get rooms by average age: {e}"
-            self.logger.error(error_msg)
-            raise QueryError(error_msg)
+        room_ages = list(self.iter_top_rooms_by_avg_age(limit))
+        self.logger.info(f"Found {len(room_ages)} rooms with average ages")
+        return room_ages
+    
+    def iter_room_age_diff_rows(self, limit: int = 5) -> Iterator[RoomAgeDiff]:
+        return self._iter_rows('top_rooms_by_age_diff', (limit,), RoomAgeDiff,
+                               f"top {limit} rooms by age difference")
+    
+    def iter_top_rooms_by_age_diff(self, limit: int = 5) -> Iterator[Dict[str, Any]]:
+        return (row.to_dict() for row in self.iter_room_age_diff_rows(limit))
     
     def get_top_rooms_by_age_diff(self, limit: int = 5) -> List[Dict[str, Any]]:  
-        try:
-            self.logger.info(f"Executing query: top {limit} rooms by age difference")
-            
-            with self.conn_manager.get_conn() as conn:
-                cursor = conn.cursor(dictionary=True)
-                cursor.execute(TOP_ROOMS_BY_AGE_DIFFERENCE_QUERY, (limit,))
-                results = cursor.fetchall()
-                cursor.close()
-            
-            room_age_diffs = [
-                RoomAgeDiff(  
-                    room_id=row['room_id'],
-                    room_name=row['room_name'],
-                    age_difference=row['age_difference'],
-                    min_age=row['min_age'],
-                    max_age=row['max_age'],
-                    student_count=row['student_count']
-                ).to_dict()
-                for row in results
-            ]
-            
-            self.logger.info(f"Found {len(room_age_diffs)} rooms with age differences")
-            return room_age_diffs
-            
-        except Exception as e:
-            error_msg = f"Failed to get rooms by age difference: {e}"
-            self.logger.error(error_msg)
-            raise QueryError(error_msg)
+        room_age_diffs = list(self.iter_top_rooms_by_age_diff(limit))
+        self.logger.info(f"Found {len(room_age_diffs)} rooms with age differences")
+        return room_age_diffs
+    
+    def iter_mixed_gender_rows(self) -> Iterator[MixedGenderRoom]:
+        return self._iter_rows('mixed_gender_rooms', None, MixedGenderRoom, "mixed gender rooms")
+    
+    def iter_mixed_gender_rooms(self) -> Iterator[Dict[str, Any]]:
+        return (row.to_dict() for row in self.iter_mixed_gender_rows())
     
     def get_mixed_gender_rooms(self) -> List[Dict[str, Any]]:
-        try:
-            self.logger.info("Executing query: mixed gender rooms")
-            
-            with self.conn_manager.get_conn() as conn:
-                cursor = conn.cursor(dictionary=True)
-                cursor.execute(MIXED_GENDER_ROOMS_QUERY)
-                results = cursor.fetchall()
-                cursor.close()
-            
-            mixed_rooms = [
-                MixedGenderRoom(
-                    room_id=row['room_id'],
-                    room_name=row['room_name'],
-                    male_count=row['male_count'],
-                    female_count=row['female_count'],
-                    total_students=row['total_students']
-                ).to_dict()
-                for row in results
-            ]
-            
-            self.logger.info(f"Found {len(mixed_rooms)} mixed gender rooms")
-            return mixed_rooms
-            
-        except Exception as e:
-            error_msg = f"Failed to get mixed gender rooms: {e}"
-            self.logger.error(error_msg)
-            raise QueryError(error_msg)
+        mixed_rooms = list(self.iter_mixed_gender_rooms())
+        self.logger.info(f"Found {len(mixed_rooms)} mixed gender rooms")
+        return mixed_rooms
@@ -0,0 +1,81 @@
+import logging
+from typing import List, Dict, Any, AsyncIterator, Optional, Type
+
+from ...database.async_conn_manager import AsyncConnManager
+from ...queries.analytics_queries import *
+from ...queries.variant_queries import SELECT_VARIANT_CHOICES_QUERY
+from ...models.result import (
+    ResultRow, RoomStudentCount, RoomAvgAge, RoomAgeDiff, MixedGenderRoom
+)
+from ...exceptions.exceptions import QueryError
+
+
+class AsyncAnalyticsRepo:
+    """Awaitable counterpart of AnalyticsRepo, on an AsyncConnManager.
+
+    Calibrated query variants are read from ``query_variant_choices`` on
+    first use, like AnalyticsRepo does through VariantRepo.
+    """
+    
+    def __init__(self, conn_manager: AsyncConnManager, use_variants: bool = True):
+        self.conn_manager = conn_manager
+        self.use_variants = use_variants
+        self._variant_choices: Optional[Dict[str, Dict[str, Any]]] = None
+        self.logger = logging.getLogger(__name__)
+    
+    async def get_query(self, query_name: str) -> str:
+        variants = ANALYTICS_QUERY_VARIANTS[query_name]
+        if self._variant_choices is None:
+            self._variant_choices = await self._load_variant_choices() if self.use_variants else {}
+        
+        choice = self._variant_choices.get(query_name, {}).get('variant')
+        return variants.get(choice) or next(iter(variants.values()))
+    
+    def reload_variants(self) -> None:
+        self._variant_choices = None
+    
+    async def _load_variant_choices(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            return {
+                row['query_name']: row
+                async for row in self.conn_manager.iter_query(SELECT_VARIANT_CHOICES_QUERY)
+            }
+        except Exception as e:
+            self.logger.warning(f"No stored query variant choices, using defaults: {e}")
+            return {}
+    
+    async def _iter_results(self, query_name: str, params: Optional[tuple],
+                            model: Type[ResultRow], description: str) -> AsyncIterator[Dict[str, Any]]:
+        try:
+            query = await self.get_query(query_name)
+            async for row in self.conn_manager.iter_query(query, params, row_factory=model.row_factory):
+                yield row.to_dict()
+            
+        except Exception as e:
+            error_msg = f"Failed to get {description}: {e}"
+            self.logger.error(error_msg)
+            raise QueryError(error_msg)
+    
+    def iter_rooms_with_student_count(self) -> AsyncIterator[Dict[str, Any]]:
+        return self._iter_results('rooms_with_student_count', None, RoomStudentCount, "rooms with student count")
+    
+    async def get_rooms_with_student_count(self) -> List[Dict[str, Any]]:
+        return [row async for row in self.iter_rooms_with_student_count()]
+    
+    def iter_top_rooms_by_avg_age(self, limit: int = 5) -> AsyncIterator[Dict[str, Any]]:
+        return self._iter_results('top_rooms_by_avg_age', (limit,), RoomAvgAge, "rooms by average age")
+    
+    async def get_top_rooms_by_avg_age(self, limit: int = 5) -> List[Dict[str, Any]]:
+        return [row async for row in self.iter_top_rooms_by_avg_age(limit)]
+    
+    def iter_top_rooms_by_age_diff(self, limit: int = 5) -> AsyncIterator[Dict[str, Any]]:
+        return self._iter_results('top_rooms_by_age_diff', (limit,), RoomAgeDiff, "rooms by age difference")
+    
+    async def get_top_rooms_by_age_diff(self, limit: int = 5) -> List[Dict[str, Any]]:
+        return [row async for row in self.iter_top_rooms_by_age_diff(limit)]
+    
+    def iter_mixed_gender_rooms(self) -> AsyncIterator[Dict[str, Any]]:
+        return self._iter_results('mixed_gender_rooms', None, MixedGenderRoom, "mixed gender rooms")
+    
+    async def get_mixed_gender_rooms(self) -> List[Dict[str, Any]]:
+        return [row async for row in self.iter_mixed_gender_rooms()]
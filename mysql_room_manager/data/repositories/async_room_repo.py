@@ -0,0 +1,90 @@
+"""asyncio room repository."""
+import logging
+from typing import List, Dict, Any, Optional, Iterable
+
+from ...database.async_conn_manager import AsyncConnManager
+from ...database.async_tx_manager import AsyncTxManager
+from ...models.room import Room
+from ...queries.entity_queries import *
+from ...exceptions.exceptions import QueryError
+from ...utils.batching import unique_ids
+from .entity_cache import EntityCache
+
+
+class AsyncRoomRepo:
+    """Awaitable counterpart of RoomRepo, on an AsyncConnManager."""
+    
+    def __init__(self, conn_manager: AsyncConnManager, cache: Optional[EntityCache] = None):
+        self.conn_manager = conn_manager
+        self.tx_manager = AsyncTxManager(conn_manager)
+        self.cache = cache
+        self.logger = logging.getLogger(__name__)
+    
+    async def insert_rooms(self, rooms: List[Dict[str, Any]]) -> int:
+        if not rooms:
+            return 0
+        
+        try:
+            self.logger.info(f"Inserting {len(rooms)} rooms")
+            
+            room_models = [Room.from_dict(room_data) for room_data in rooms]
+            # Primary key order makes concurrent batches lock rows in the same order.
+            room_tuples = sorted((room.to_db_tuple() for room in room_models), key=lambda row: row[0])
+            
+            async def write(conn) -> int:
+                cursor = await conn.cursor()
+                await cursor.executemany(UPSERT_ROOMS_QUERY, room_tuples)
+                affected_rows = cursor.rowcount
+                await cursor.close()
+                return affected_rows
+            
+            affected_rows = await self.tx_manager.run(write, f"insert of {len(room_tuples)} rooms")
+            
+            if self.cache is not None:
+                self.cache.invalidate_rooms(room.id for room in room_models)
+            
+            self.logger.info(f"Successfully inserted {affected_rows} rooms")
+            return affected_rows
+            
+        except Exception as e:
+            error_msg = f"Failed to insert rooms: {e}"
+            self.logger.error(error_msg)
+            raise QueryError(error_msg)
+    
+    async def get_room_by_id(self, room_id: int) -> Optional[Dict[str, Any]]:
+        if self.cache is not None:
+            room = self.cache.rooms.get(room_id)
+            if room is not None:
+                return room
+        
+        try:
+            room = await self.conn_manager.fetch_one(SELECT_ROOM_BY_ID_QUERY, (room_id,))
+                
+        except Exception as e:
+            self.logger.error(f"Failed to get room {room_id}: {e}")
+            return None
+        
+        if room is not None and self.cache is not None:
+            self.cache.rooms.put(room_id, room)
+        return room
+    
+    async def get_rooms_by_ids(self, room_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        rooms: Dict[int, Dict[str, Any]] = {}
+        try:
+            async for row in self.conn_manager.iter_in_chunks(SELECT_ROOMS_BY_IDS_QUERY, unique_ids(room_ids)):
+                rooms[row['id']] = row
+            return rooms
+                
+        except Exception as e:
+            error_msg = f"Failed to get rooms by ids: {e}"
+            self.logger.error(error_msg)
+            raise QueryError(error_msg)
+    
+    async def count_rooms(self) -> int:
+        try:
+            result = await self.conn_manager.fetch_one(COUNT_ROOMS_QUERY, dictionary=False)
+            return result[0] if result else 0
+                
+        except Exception as e:
+            self.logger.error(f"Failed to count rooms: {e}")
+            return 0
@@ -0,0 +1,154 @@
+import logging
+from typing import List, Dict, Any, Optional, AsyncIterator, Iterable
+from ...database.async_conn_manager import AsyncConnManager
+from ...database.async_tx_manager import AsyncTxManager
+from ...models.student import Student
+from ...queries.entity_queries import *
+from ...exceptions.exceptions import QueryError
+from ...utils.date_utils import datetime_to_mysql_string
+from ...utils.batching import unique_ids, chunked
+from .entity_cache import EntityCache
+
+
+class AsyncStudentRepo:
+    """Awaitable counterpart of StudentRepo, on an AsyncConnManager."""
+    
+    def __init__(self, conn_manager: AsyncConnManager, cache: Optional[EntityCache] = None):
+        self.conn_manager = conn_manager
+        self.tx_manager = AsyncTxManager(conn_manager)
+        self.cache = cache
+        self.logger = logging.getLogger(__name__)
+    
+    async def insert_students(self, students: List[Dict[str, Any]]) -> int:
+        if not students:
+            return 0
+        
+        try:
+            self.logger.info(f"Inserting {len(students)} students")
+            
+            # Primary key order makes concurrent batches lock rows in the same order.
+            student_models = sorted(
+                (Student.from_dict(student_data) for student_data in students),
+                key=lambda student: student.id
+            )
+            student_tuples = [
+                (student.id, student.name, datetime_to_mysql_string(student.birthday), student.sex, student.room)
+                for student in student_models
+            ]
+            
+            async def write(conn) -> int:
+                cursor = await conn.cursor()
+                if self.conn_manager.config.students_partitioning:
+                    await self._prepare_partitioned_upsert(cursor, student_models)
+                await cursor.executemany(UPSERT_STUDENTS_QUERY, student_tuples)
+                affected_rows = cursor.rowcount
+                await cursor.close()
+                return affected_rows
+            
+            affected_rows = await self.tx_manager.run(write, f"insert of {len(student_tuples)} students")
+            
+            if self.cache is not None:
+                self.cache.invalidate_students(student_models)
+            
+            self.logger.info(f"Successfully inserted {affected_rows} students")
+            return affected_rows
+            
+        except Exception as e:
+            error_msg = f"Failed to insert students: {e}"
+            self.logger.error(error_msg)
+            raise QueryError(error_msg)
+    
+    @property
+    def _room_partitioned(self) -> bool:
+        return self.conn_manager.config.students_partitioning in ('hash_room', 'range_room')
+    
+    async def _prepare_partitioned_upsert(self, cursor, students: List[Student]) -> None:
+        """See ``StudentRepo._prepare_partitioned_upsert``."""
+        chunk_size = self.conn_manager.config.lookup_chunk_size
+        room_ids = sorted(unique_ids(student.room for student in students if student.room is not None))
+        
+        found_rooms = set()
+        for chunk in chunked(room_ids, chunk_size):
+            placeholders = ', '.join(['%s'] * len(chunk))
+            await cursor.execute(LOCK_ROOMS_BY_IDS_QUERY.format(placeholders=placeholders), tuple(chunk))
+            found_rooms.update(row[0] for row in await cursor.fetchall())
+        
+        missing_rooms = [room_id for room_id in room_ids if room_id not in found_rooms]
+        if missing_rooms:
+            raise QueryError(f"Students reference unknown rooms: {missing_rooms[:10]}")
+        
+        for chunk in chunked(sorted(unique_ids(student.id for student in students)), chunk_size):
+            placeholders = ', '.join(['%s'] * len(chunk))
+            await cursor.execute(DELETE_STUDENTS_BY_IDS_QUERY.format(placeholders=placeholders), tuple(chunk))
+    
+    async def get_student_by_id(self, student_id: int) -> Optional[Dict[str, Any]]:
+        if self.cache is not None:
+            student = self.cache.students.get(student_id)
+            if student is not None:
+                return student
+        
+        try:
+            student = await self.conn_manager.fetch_one(SELECT_STUDENT_BY_ID_QUERY, (student_id,))
+                
+        except Exception as e:
+            self.logger.error(f"Failed to get student {student_id}: {e}")
+            return None
+        
+        if student is not None and self.cache is not None:
+            self.cache.students.put(student_id, student)
+        return student
+    
+    async def get_students_by_ids(self, student_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        students: Dict[int, Dict[str, Any]] = {}
+        try:
+            async for row in self.conn_manager.iter_in_chunks(SELECT_STUDENTS_BY_IDS_QUERY, unique_ids(student_ids)):
+                students[row['id']] = row
+            return students
+                
+        except Exception as e:
+            error_msg = f"Failed to get students by ids: {e}"
+            self.logger.error(error_msg)
+            raise QueryError(error_msg)
+    
+    async def iter_students_by_room(self, room_id: int) -> AsyncIterator[Dict[str, Any]]:
+        query = SELECT_STUDENTS_BY_ROOM_QUERY
+        params = (room_id,)
+        if self._room_partitioned:
+            query += " AND room_key = %s"
+            params = (room_id, room_id)
+        
+        try:
+            async for row in self.conn_manager.iter_query(query, params):
+                yield row
+                
+        except Exception as e:
+            error_msg = f"Failed to get students for room {room_id}: {e}"
+            self.logger.error(error_msg)
+            raise QueryError(error_msg)
+    
+    async def get_students_by_room(self, room_id: int) -> List[Dict[str, Any]]:
+        try:
+            return [student async for student in self.iter_students_by_room(room_id)]
+        except QueryError:
+            return []
+    
+    async def get_students_by_rooms(self, room_ids: Iterable[int]) -> Dict[int, List[Dict[str, Any]]]:
+        room_ids = unique_ids(room_ids)
+        try:
+            students_by_room: Dict[int, List[Dict[str, Any]]] = {room_id: [] for room_id in room_ids}
+            async for row in self.conn_manager.iter_in_chunks(SELECT_STUDENTS_BY_ROOMS_QUERY, room_ids):
+                students_by_room[row['room_id']].append(row)
+            return students_by_room
+                
+        except Exception as e:
+            self.logger.error(f"Failed to get students for rooms: {e}")
+            return {}
+    
+    async def count_students(self) -> int:
+        try:
+            result = await self.conn_manager.fetch_one(COUNT_STUDENTS_QUERY, dictionary=False)
+            return result[0] if result else 0
+                
+        except Exception as e:
+            self.logger.error(f"Failed to count students: {e}")
+            return 0
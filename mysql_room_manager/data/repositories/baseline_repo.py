@@ -0,0 +1,40 @@
+import logging
+from typing import Dict, Any
+
+from ...database.conn_manager import ConnManager
+from ...queries.baseline_queries import *
+from ...exceptions.exceptions import QueryError
+
+
+class BaselineRepo:
+    """Stores the EXPLAIN ANALYZE baseline for each analytics query."""
+    
+    def __init__(self, conn_manager: ConnManager):
+        self.conn_manager = conn_manager
+        self.logger = logging.getLogger(__name__)
+    
+    def load_baselines(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            return {
+                row['query_name']: row
+                for row in self.conn_manager.iter_query(SELECT_PLAN_BASELINES_QUERY)
+            }
+                
+        except Exception as e:
+            self.logger.warning(f"No stored plan baselines: {e}")
+            return {}
+    
+    def save_baseline(self, query_name: str, fingerprint: str, plan_text: str,
+                      actual_ms: float, actual_rows: int) -> None:
+        try:
+            with self.conn_manager.get_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute(UPSERT_PLAN_BASELINE_QUERY,
+                               (query_name, fingerprint, plan_text, actual_ms, actual_rows))
+                conn.commit()
+                cursor.close()
+                
+        except Exception as e:
+            error_msg = f"Failed to save plan baseline for {query_name}: {e}"
+            self.logger.error(error_msg)
+            raise QueryError(error_msg)
@@ -0,0 +1,40 @@
+import logging
+from typing import Optional
+
+from ...database.conn_manager import ConnManager
+from ...queries.data_version_queries import *
+from ...exceptions.exceptions import QueryError
+
+
+class DataVersionRepo:
+    """Counter bumped after every import, so result caches know when to drop their entries."""
+    
+    def __init__(self, conn_manager: ConnManager):
+        self.conn_manager = conn_manager
+        self.logger = logging.getLogger(__name__)
+    
+    def get_version(self) -> Optional[int]:
+        try:
+            with self.conn_manager.get_conn(read_only=True) as conn:
+                cursor = conn.cursor()
+                cursor.execute(SELECT_DATA_VERSION_QUERY)
+                row = cursor.fetchone()
+                cursor.close()
+            return int(row[0]) if row else 0
+                
+        except Exception as e:
+            self.logger.warning(f"Data version unavailable: {e}")
+            return None
+    
+    def bump(self) -> None:
+        try:
+            with self.conn_manager.get_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute(BUMP_DATA_VERSION_QUERY)
+                conn.commit()
+                cursor.close()
+                
+        except Exception as e:
+            error_msg = f"Failed to bump data version: {e}"
+            self.logger.error(error_msg)
+            raise QueryError(error_msg)
@@ -0,0 +1,79 @@
+import logging
+from typing import Any, Dict, Hashable, Iterable
+
+from ...utils.lru_cache import LruCache
+
+
+class _CopyingLruCache(LruCache):
+    """Stores and hands out copies of rows, so a caller mutating a result cannot corrupt the cache."""
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = super().get(key)
+        return default if value is None else _copy_rows(value)
+    
+    def put(self, key: Hashable, value: Any) -> None:
+        super().put(key, _copy_rows(value))
+
+
+def _copy_rows(value: Any) -> Any:
+    if isinstance(value, list):
+        return [dict(row) for row in value]
+    return dict(value)
+
+
+class EntityCache:
+    """Read-through cache shared by RoomRepo and StudentRepo.
+
+    Holds single rooms, single students and per-room student lists. The
+    repositories populate it on reads and invalidate it on writes; reads
+    that fill it go to the primary, since a row from a lagging replica
+    would outlive the invalidation of the write it predates.
+    """
+    
+    def __init__(self, max_size: int, max_room_lists: int = 128):
+        self.rooms = _CopyingLruCache(max_size)
+        self.students = _CopyingLruCache(max_size)
+        self.room_students = _CopyingLruCache(max_room_lists)
+        self.logger = logging.getLogger(__name__)
+    
+    def invalidate_rooms(self, room_ids: Iterable[int]) -> None:
+        for room_id in room_ids:
+            self.rooms.pop(room_id)
+    
+    def invalidate_students(self, students: Iterable[Any]) -> None:
+        """Drop changed students and every cached room list they touch.
+
+        ``students`` are Student models; a student may have moved, so both
+        its new room and any cached list still holding it are dropped.
+        """
+        changed_ids = set()
+        touched_rooms = set()
+        
+        for student in students:
+            changed_ids.add(student.id)
+            cached = self.students.pop(student.id)
+            if cached is not None:
+                touched_rooms.add(cached.get('room_id'))
+            if student.room is not None:
+                touched_rooms.add(student.room)
+        
+        if not changed_ids:
+            return
+        
+        dropped = self.room_students.pop_where(
+            lambda room_id, rows: room_id in touched_rooms
+            or any(row['id'] in changed_ids for row in rows)
+        )
+        self.logger.debug(f"Invalidated {len(changed_ids)} students and {dropped} room lists")
+    
+    def clear(self) -> None:
+        self.rooms.clear()
+        self.students.clear()
+        self.room_students.clear()
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            'rooms': self.rooms.stats(),
+            'students': self.students.stats(),
+            'room_students': self.room_students.stats()
+        }
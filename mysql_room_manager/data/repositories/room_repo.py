@@ -1,19 +1,26 @@
 """Room repository for database operations."""
 import logging
-from typing import List, Dict, Any, Optional
+from contextlib import nullcontext
+from typing import List, Dict, Any, ContextManager, Optional, Iterable
 
 from ...interfaces.repo_interface import RoomRepoInterface
 from ...database.conn_manager import ConnManager
 from ...database.tx_manager import TxManager
+from ...database.stmt_cache import StmtCache
 from ...models.room import Room
+from ...queries.entity_queries import *
 from ...exceptions.exceptions import QueryError
+from ...utils.batching import unique_ids
+from .entity_cache import EntityCache
 
 
 class RoomRepo(RoomRepoInterface): 
     
-    def __init__(self, conn_manager: ConnManager):
+    def __init__(self, conn_manager: ConnManager, cache: Optional[EntityCache] = None):
         self.conn_manager = conn_manager  
         self.tx_manager = TxManager(conn_manager)
+        self.stmt_cache = StmtCache(conn_manager)
+        self.cache = cache
         self.logger = logging.getLogger(__name__)
     
     def insert_rooms(self, rooms: List[Dict[str, Any]]) -> int:
@@ -25,20 +32,21 @@ class RoomRepo(RoomRepoInterface):
             
             room_models = [Room.from_dict(room_data) for room_data in rooms]
             
-            room_tuples = [room.to_db_tuple() for room in room_models]
+            # Primary key order makes concurrent batches lock rows in the same order.
+            room_tuples = sorted((room.to_db_tuple() for room in room_models), key=lambda row: row[0])
             
-            with self.tx_manager.transaction() as conn:
+            def write(conn) -> int:
                 cursor = conn.cursor()
                 
-                insert_query = """
-                INSERT INTO rooms (id, name) 
-                VALUES (%s, %s)
-                ON DUPLICATE KEY UPDATE name = VALUES(name)
-                """
-                
-                cursor.executemany(insert_query, room_tuples)
+                cursor.executemany(UPSERT_ROOMS_QUERY, room_tuples)
                 affected_rows = cursor.rowcount
                 cursor.close()
+                return affected_rows
+            
+            affected_rows = self.tx_manager.run(write, f"insert of {len(room_tuples)} rooms")
+            
+            if self.cache is not None:
+                self.cache.invalidate_rooms(room.id for room in room_models)
             
             self.logger.info(f"Successfully inserted {affected_rows} rooms")
             return affected_rows
@@ -49,27 +57,58 @@ class RoomRepo(RoomRepoInterface):
             raise QueryError(error_msg)
     
     def get_room_by_id(self, room_id: int) -> Optional[Dict[str, Any]]:
+        if self.cache is not None:
+            room = self.cache.rooms.get(room_id)
+            if room is not None:
+                return room
+        
         try:
-            with self.conn_manager.get_conn() as conn:
-                cursor = conn.cursor(dictionary=True)
-                cursor.execute("SELECT * FROM rooms WHERE id = %s", (room_id,))
-                result = cursor.fetchone()
-                cursor.close()
-                return result
+            with self._cache_fill():
+                room = self.stmt_cache.fetch_one(SELECT_ROOM_BY_ID_QUERY, (room_id,), read_only=True)
                 
         except Exception as e:
             self.logger.error(f"Failed to get room {room_id}: {e}")
             return None
+        
+        if room is not None and self.cache is not None:
+            self.cache.rooms.put(room_id, room)
+        return room
+    
+    def get_rooms_by_ids(self, room_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        rooms: Dict[int, Dict[str, Any]] = {}
+        missing_ids = unique_ids(room_ids)
+        
+        if self.cache is not None:
+            for room_id in missing_ids:
+                room = self.cache.rooms.get(room_id)
+                if room is not None:
+                    rooms[room_id] = room
+            missing_ids = [room_id for room_id in missing_ids if room_id not in rooms]
+        
+        try:
+            with self._cache_fill():
+                rows = self.conn_manager.iter_in_chunks(SELECT_ROOMS_BY_IDS_QUERY, missing_ids, read_only=True)
+                for row in rows:
+                    rooms[row['id']] = row
+                    if self.cache is not None:
+                        self.cache.rooms.put(row['id'], row)
+            return rooms
+                
+        except Exception as e:
+            # cache hits alone would pass for a complete answer
+            error_msg = f"Failed to get rooms by ids: {e}"
+            self.logger.error(error_msg)
+            raise QueryError(error_msg)
     
     def count_rooms(self) -> int:
         try:
-            with self.conn_manager.get_conn() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT COUNT(*) FROM rooms")
-                result = cursor.fetchone()
-                cursor.close()
-                return result[0] if result else 0
+            result = self.stmt_cache.fetch_one(COUNT_ROOMS_QUERY, dictionary=False, read_only=True)
+            return result[0] if result else 0
                 
         except Exception as e:
             self.logger.error(f"Failed to count rooms: {e}")
-            return 0
\ No newline at end of file
+            return 0
+    
+    def _cache_fill(self) -> ContextManager[None]:
+        # Misses that fill the entity cache read the primary (see EntityCache).
+        return self.conn_manager.pin_primary() if self.cache is not None else nullcontext()
@@ -0,0 +1,123 @@
+import logging
+import math
+import re
+from typing import List, Dict, Any, Optional, Tuple
+
+from ...database.conn_manager import ConnManager
+from ...queries.analytics_queries import *
+from ...queries.sampling_queries import (
+    SAMPLE_BUCKETS, SAMPLED_STUDENTS_TEMPLATE, SAMPLED_TOP_ROOMS_BY_AVG_AGE_QUERY
+)
+from ...exceptions.exceptions import QueryError
+
+Z_95 = 1.96
+
+_STUDENTS_REF = re.compile(r'\b(FROM|JOIN)\s+students\b(\s+s\b)?')
+
+
+class SampledAnalyticsRepo:
+    """Runs the analytics queries on a hash sample of students.
+
+    Counts are scaled by ``1 / rate`` and reported with a 95% confidence
+    half-width (``*_ci``). Under Bernoulli sampling a count estimated from
+    ``n`` sampled rows has standard error ``sqrt(n * (1 - rate)) / rate``;
+    an average has ``stddev / sqrt(n)``. Min/max figures come straight from
+    the sample and carry no interval.
+    """
+    
+    def __init__(self, conn_manager: ConnManager):
+        self.conn_manager = conn_manager
+        self.logger = logging.getLogger(__name__)
+    
+    @staticmethod
+    def effective_rate(rate: float) -> float:
+        threshold = max(1, min(SAMPLE_BUCKETS, round(rate * SAMPLE_BUCKETS)))
+        return threshold / SAMPLE_BUCKETS
+    
+    def get_rooms_with_student_count(self, rate: float) -> List[Dict[str, Any]]:
+        rows, rate = self._fetch(ROOMS_WITH_STUDENT_COUNT_QUERY, rate)
+        results = []
+        for row in rows:
+            count, count_ci = self._scale_count(row['student_count'], rate)
+            results.append({
+                'room_id': row['room_id'],
+                'room_name': row['room_name'],
+                'student_count': count,
+                'student_count_ci': count_ci
+            })
+        return results
+    
+    def get_top_rooms_by_avg_age(self, rate: float, limit: int = 5) -> List[Dict[str, Any]]:
+        rows, rate = self._fetch(SAMPLED_TOP_ROOMS_BY_AVG_AGE_QUERY, rate, (limit,))
+        results = []
+        for row in rows:
+            count, count_ci = self._scale_count(row['student_count'], rate)
+            stddev = row['age_stddev']
+            results.append({
+                'room_id': row['room_id'],
+                'room_name': row['room_name'],
+                'average_age': round(float(row['average_age']), 2),
+                'average_age_ci': (
+                    round(Z_95 * float(stddev) / math.sqrt(row['student_count']), 2)
+                    if stddev is not None else None
+                ),
+                'student_count': count,
+                'student_count_ci': count_ci
+            })
+        return results
+    
+    def get_top_rooms_by_age_diff(self, rate: float, limit: int = 5) -> List[Dict[str, Any]]:
+        rows, rate = self._fetch(TOP_ROOMS_BY_AGE_DIFFERENCE_QUERY, rate, (limit,))
+        results = []
+        for row in rows:
+            count, count_ci = self._scale_count(row['student_count'], rate)
+            results.append({
+                'room_id': row['room_id'],
+                'room_name': row['room_name'],
+                'age_difference': row['age_difference'],
+                'min_age': row['min_age'],
+                'max_age': row['max_age'],
+                'student_count': count,
+                'student_count_ci': count_ci
+            })
+        return results
+    
+    def get_mixed_gender_rooms(self, rate: float) -> List[Dict[str, Any]]:
+        rows, rate = self._fetch(MIXED_GENDER_ROOMS_QUERY, rate)
+        results = []
+        for row in rows:
+            result = {'room_id': row['room_id'], 'room_name': row['room_name']}
+            for column in ('male_count', 'female_count', 'total_students'):
+                result[column], result[f"{column}_ci"] = self._scale_count(row[column], rate)
+            results.append(result)
+        return results
+    
+    def _fetch(self, query: str, rate: float,
+               params: Optional[tuple] = None) -> Tuple[List[Dict[str, Any]], float]:
+        rate = self.effective_rate(rate)
+        source = SAMPLED_STUDENTS_TEMPLATE.format(threshold=round(rate * SAMPLE_BUCKETS))
+        sampled_query = _STUDENTS_REF.sub(
+            lambda m: f"{m.group(1)} {source} {(m.group(2) or 'students').strip()}",
+            query
+        )
+        
+        try:
+            self.logger.debug(f"Executing sampled query at rate {rate:.4f}")
+            with self.conn_manager.get_conn(read_only=True) as conn:
+                cursor = conn.cursor(dictionary=True)
+                cursor.execute(sampled_query, params)
+                rows = cursor.fetchall()
+                cursor.close()
+            return rows, rate
+            
+        except Exception as e:
+            error_msg = f"Sampled analytics query failed: {e}"
+            self.logger.error(error_msg)
+            raise QueryError(error_msg, sampled_query, params)
+    
+    @staticmethod
+    def _scale_count(sampled: int, rate: float) -> Tuple[int, int]:
+        sampled = int(sampled or 0)
+        estimate = sampled / rate
+        half_width = Z_95 * math.sqrt(sampled * (1 - rate)) / rate
+        return round(estimate), round(half_width)
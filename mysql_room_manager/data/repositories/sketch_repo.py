@@ -0,0 +1,72 @@
+import json
+import logging
+from typing import Dict, Any, List
+
+from ...database.conn_manager import ConnManager
+from ...database.tx_manager import TxManager
+from ...queries.sketch_queries import *
+from ...models.sketch import AgeHistogram
+from ...exceptions.exceptions import QueryError
+
+
+class SketchRepo:
+    """Persists one mergeable age sketch per room in ``room_age_sketches``.
+
+    Students without a room are stored under ``UNASSIGNED_ROOM_ID``.
+    """
+    
+    def __init__(self, conn_manager: ConnManager):
+        self.conn_manager = conn_manager
+        self.tx_manager = TxManager(conn_manager)
+        self.logger = logging.getLogger(__name__)
+    
+    def rebuild_age_sketches(self) -> int:
+        try:
+            self.logger.info("Rebuilding room age sketches")
+            
+            sketches: Dict[int, AgeHistogram] = {}
+            rows = self.conn_manager.iter_query(AGE_SKETCH_SOURCE_QUERY, dictionary=False)
+            for room_id, age_years, student_count in rows:
+                sketches.setdefault(room_id, AgeHistogram()).add(age_years, student_count)
+            
+            sketch_tuples = [
+                (room_id, sketch.total, json.dumps(sketch.to_dict()))
+                for room_id, sketch in sorted(sketches.items())
+            ]
+            
+            def write(conn):
+                cursor = conn.cursor()
+                cursor.execute(CLEAR_AGE_SKETCHES_QUERY)
+                if sketch_tuples:
+                    cursor.executemany(INSERT_AGE_SKETCH_QUERY, sketch_tuples)
+                cursor.close()
+            
+            self.tx_manager.run(write, "age sketch rebuild")
+            
+            self.logger.info(f"Stored {len(sketch_tuples)} room age sketches")
+            return len(sketch_tuples)
+            
+        except Exception as e:
+            error_msg = f"Failed to rebuild age sketches: {e}"
+            self.logger.error(error_msg)
+            raise QueryError(error_msg)
+    
+    def load_age_sketches(self) -> List[Dict[str, Any]]:
+        try:
+            sketches = []
+            for row in self.conn_manager.iter_query(SELECT_AGE_SKETCHES_QUERY, read_only=True):
+                age_counts = row['age_counts']
+                if isinstance(age_counts, (str, bytes)):
+                    age_counts = json.loads(age_counts)
+                sketches.append({
+                    'room_id': row['room_id'],
+                    'room_name': row['room_name'],
+                    'student_count': row['student_count'],
+                    'sketch': AgeHistogram.from_dict(age_counts)
+                })
+            return sketches
+            
+        except Exception as e:
+            error_msg = f"Failed to load age sketches: {e}"
+            self.logger.error(error_msg)
+            raise QueryError(error_msg)
@@ -1,18 +1,26 @@
 import logging
-from typing import List, Dict, Any, Optional
+from contextlib import nullcontext
+from typing import List, Dict, Any, ContextManager, Optional, Iterator, Iterable, Tuple
 from ...interfaces.repo_interface import StudentRepoInterface
 from ...database.conn_manager import ConnManager
 from ...database.tx_manager import TxManager
+from ...database.stmt_cache import StmtCache
 from ...models.student import Student
-from ...exceptions.exceptions import QueryError
+from ...queries.entity_queries import *
+from ...models.query import StudentFilter, StudentPage
+from ...exceptions.exceptions import QueryError, ValidationError
 from ...utils.date_utils import datetime_to_mysql_string
+from ...utils.batching import unique_ids, chunked
+from .entity_cache import EntityCache
 
 
 class StudentRepo(StudentRepoInterface):  
     
-    def __init__(self, conn_manager: ConnManager):
+    def __init__(self, conn_manager: ConnManager, cache: Optional[EntityCache] = None):
         self.conn_manager = conn_manager  
         self.tx_manager = TxManager(conn_manager)  
+        self.stmt_cache = StmtCache(conn_manager)
+        self.cache = cache
         self.logger = logging.getLogger(__name__)
     
     def insert_students(self, students: List[Dict[str, Any]]) -> int:
@@ -22,7 +30,11 @@ class StudentRepo(StudentRepoInterface):
         try:
             self.logger.info(f"Inserting {len(students)} students")
             
-            student_models = [Student.from_dict(student_data) for student_data in students]
+            # Primary key order makes concurrent batches lock rows in the same order.
+            student_models = sorted(
+                (Student.from_dict(student_data) for student_data in students),
+                key=lambda student: student.id
+            )
             
             student_tuples = []
             for student in student_models:
@@ -34,22 +46,21 @@ class StudentRepo(StudentRepoInterface):
                     student.room
                 ))
             
-            with self.tx_manager.transaction() as conn:
+            def write(conn) -> int:
                 cursor = conn.cursor()
                 
-                insert_query = """
-                INSERT INTO students (id, name, birthday, sex, room_id) 
-                VALUES (%s, %s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE 
-                    name = VALUES(name),
-                    birthday = VALUES(birthday),
-                    sex = VALUES(sex),
-                    room_id = VALUES(room_id)
-                """
+                if self.conn_manager.config.students_partitioning:
+                    self._prepare_partitioned_upsert(cursor, student_models)
                 
-                cursor.executemany(insert_query, student_tuples)
+                cursor.executemany(UPSERT_STUDENTS_QUERY, student_tuples)
                 affected_rows = cursor.rowcount
                 cursor.close()
+                return affected_rows
+            
+            affected_rows = self.tx_manager.run(write, f"insert of {len(student_tuples)} students")
+            
+            if self.cache is not None:
+                self.cache.invalidate_students(student_models)
             
             self.logger.info(f"Successfully inserted {affected_rows} students")
             return affected_rows
@@ -59,46 +70,228 @@ class StudentRepo(StudentRepoInterface):
             self.logger.error(error_msg)
             raise QueryError(error_msg)
     
+    def _cache_fill(self) -> ContextManager[None]:
+        # Misses that fill the entity cache read the primary (see EntityCache).
+        return self.conn_manager.pin_primary() if self.cache is not None else nullcontext()
+    
+    @property
+    def _room_partitioned(self) -> bool:
+        # room_key mirrors room_id; filtering on it lets MySQL prune partitions.
+        return self.conn_manager.config.students_partitioning in ('hash_room', 'range_room')
+    
+    def _prepare_partitioned_upsert(self, cursor, students: List[Student]) -> None:
+        """Enforce what the FK and id-only primary key do on unpartitioned tables."""
+        chunk_size = self.conn_manager.config.lookup_chunk_size
+        room_ids = sorted(unique_ids(student.room for student in students if student.room is not None))
+        
+        found_rooms = set()
+        for chunk in chunked(room_ids, chunk_size):
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(LOCK_ROOMS_BY_IDS_QUERY.format(placeholders=placeholders), tuple(chunk))
+            found_rooms.update(row[0] for row in cursor.fetchall())
+        
+        missing_rooms = [room_id for room_id in room_ids if room_id not in found_rooms]
+        if missing_rooms:
+            raise QueryError(f"Students reference unknown rooms: {missing_rooms[:10]}")
+        
+        # The primary key includes the partition column, so a student whose
+        # room or birthday changed would otherwise be inserted twice.
+        for chunk in chunked(sorted(unique_ids(student.id for student in students)), chunk_size):
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(DELETE_STUDENTS_BY_IDS_QUERY.format(placeholders=placeholders), tuple(chunk))
+    
     def get_student_by_id(self, student_id: int) -> Optional[Dict[str, Any]]:
+        if self.cache is not None:
+            student = self.cache.students.get(student_id)
+            if student is not None:
+                return student
+        
         try:
-            with self.conn_manager.get_conn() as conn:
-                cursor = conn.cursor(dictionary=True)
-                cursor.execute(
-                    "SELECT id, name, birthday, sex, room_id, age_years FROM students WHERE id = %s", 
-                    (student_id,)
-                )
-                result = cursor.fetchone()
-                cursor.close()
-                return result
+            with self._cache_fill():
+                student = self.stmt_cache.fetch_one(SELECT_STUDENT_BY_ID_QUERY, (student_id,), read_only=True)
                 
         except Exception as e:
             self.logger.error(f"Failed to get student {student_id}: {e}")
             return None
+        
+        if student is not None and self.cache is not None:
+            self.cache.students.put(student_id, student)
+        return student
+    
+    def get_students_by_ids(self, student_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        students: Dict[int, Dict[str, Any]] = {}
+        missing_ids = unique_ids(student_ids)
+        
+        if self.cache is not None:
+            for student_id in missing_ids:
+                student = self.cache.students.get(student_id)
+                if student is not None:
+                    students[student_id] = student
+            missing_ids = [student_id for student_id in missing_ids if student_id not in students]
+        
+        try:
+            with self._cache_fill():
+                rows = self.conn_manager.iter_in_chunks(SELECT_STUDENTS_BY_IDS_QUERY, missing_ids, read_only=True)
+                for row in rows:
+                    students[row['id']] = row
+                    if self.cache is not None:
+                        self.cache.students.put(row['id'], row)
+            return students
+                
+        except Exception as e:
+            # cache hits alone would pass for a complete answer
+            error_msg = f"Failed to get students by ids: {e}"
+            self.logger.error(error_msg)
+            raise QueryError(error_msg)
+    
+    def iter_students_by_room(self, room_id: int) -> Iterator[Dict[str, Any]]:
+        try:
+            query = SELECT_STUDENTS_BY_ROOM_QUERY
+            params = (room_id,)
+            if self._room_partitioned:
+                query += " AND room_key = %s"
+                params = (room_id, room_id)
+            
+            yield from self.conn_manager.iter_query(query, params, read_only=True)
+                
+        except Exception as e:
+            error_msg = f"Failed to get students for room {room_id}: {e}"
+            self.logger.error(error_msg)
+            raise QueryError(error_msg)
     
     def get_students_by_room(self, room_id: int) -> List[Dict[str, Any]]:
+        if self.cache is not None:
+            students = self.cache.room_students.get(room_id)
+            if students is not None:
+                return students
+        
         try:
-            with self.conn_manager.get_conn() as conn:
+            with self._cache_fill():
+                students = list(self.iter_students_by_room(room_id))
+        except QueryError:
+            return []
+        
+        if self.cache is not None:
+            self.cache.room_students.put(room_id, students)
+        return students
+    
+    def get_students_by_rooms(self, room_ids: Iterable[int]) -> Dict[int, List[Dict[str, Any]]]:
+        room_ids = unique_ids(room_ids)
+        try:
+            students_by_room: Dict[int, List[Dict[str, Any]]] = {room_id: [] for room_id in room_ids}
+            rows = self.conn_manager.iter_in_chunks(SELECT_STUDENTS_BY_ROOMS_QUERY, room_ids, read_only=True)
+            for row in rows:
+                students_by_room[row['room_id']].append(row)
+            return students_by_room
+                
+        except Exception as e:
+            self.logger.error(f"Failed to get students for rooms: {e}")
+            return {}
+    
+    def query(self, filters: Optional[StudentFilter] = None,
+              after: Optional[Tuple[int, int]] = None, limit: int = 100) -> StudentPage:
+        """Return one page of students matching ``filters``.
+
+        Pages are keyset-paginated: pass the previous page's ``next_cursor``
+        as ``after`` to continue, so page N costs the same as page 1.
+        """
+        query, params, index_name, key_column = self.build_page_query(filters, after, limit)
+        
+        try:
+            with self.conn_manager.get_conn(read_only=True) as conn:
                 cursor = conn.cursor(dictionary=True)
-                cursor.execute(
-                    "SELECT id, name, birthday, sex, room_id, age_years FROM students WHERE room_id = %s", 
-                    (room_id,)
-                )
-                results = cursor.fetchall()
+                cursor.execute(query, params)
+                rows = cursor.fetchall()
                 cursor.close()
-                return results
                 
         except Exception as e:
-            self.logger.error(f"Failed to get students for room {room_id}: {e}")
-            return []
+            error_msg = f"Failed to query students: {e}"
+            self.logger.error(error_msg)
+            raise QueryError(error_msg, query, params)
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = (rows[-1][key_column], rows[-1]['id'])
+        
+        return StudentPage(students=rows, next_cursor=next_cursor, index_name=index_name)
+    
+    def build_page_query(self, filters: Optional[StudentFilter] = None,
+                         after: Optional[Tuple[int, int]] = None,
+                         limit: int = 100) -> Tuple[str, tuple, str, str]:
+        """SQL and parameters for one ``query`` page, plus the index and sort key it uses.
+
+        The seek is spelled ``key > a OR (key = a AND id > b)``: MySQL does
+        not range-optimize a row constructor comparison, which would make
+        every page re-read the index from the start of the range.
+        """
+        filters = filters or StudentFilter()
+        if not isinstance(limit, int) or limit < 1:
+            raise ValidationError(f"Page limit must be a positive integer, got: {limit}")
+        
+        index_name, key_column = self._choose_page_index(filters)
+        conditions, params = [], []
+        
+        if filters.room_id is not None:
+            conditions.append("room_id = %s")
+            params.append(filters.room_id)
+            if self._room_partitioned:
+                conditions.append("room_key = %s")
+                params.append(filters.room_id)
+        if filters.sex is not None:
+            conditions.append("sex = %s")
+            params.append(filters.sex)
+        if filters.min_age is not None:
+            conditions.append("age_years >= %s")
+            params.append(filters.min_age)
+        if filters.max_age is not None:
+            conditions.append("age_years <= %s")
+            params.append(filters.max_age)
+        
+        # room_id as the sort key is fixed by the equality filter, so only id moves.
+        seek_on_id = key_column in ('id', 'room_id')
+        if after is not None:
+            if seek_on_id:
+                conditions.append("id > %s")
+                params.append(after[1])
+            else:
+                conditions.append(f"({key_column} > %s OR ({key_column} = %s AND id > %s))")
+                params.extend((after[0], after[0], after[1]))
+        
+        order_by = "id" if seek_on_id else f"{key_column}, id"
+        query = (
+            f"SELECT {STUDENT_COLUMNS} "
+            f"FROM students USE INDEX ({index_name}) "
+            f"WHERE {' AND '.join(conditions) or '1 = 1'} "
+            f"ORDER BY {order_by} LIMIT %s"
+        )
+        # One extra row tells us whether another page exists.
+        params.append(limit + 1)
+        return query, tuple(params), index_name, key_column
+    
+    @staticmethod
+    def _choose_page_index(filters: StudentFilter) -> Tuple[str, str]:
+        """Pick the index whose column order matches the keyset sort key.
+
+        InnoDB secondary indexes carry the primary key as their last
+        column, so e.g. ``idx_students_room_age`` is ordered by
+        ``(room_id, age_years, id)``.
+        """
+        if filters.room_id is not None:
+            if filters.has_age_range:
+                return 'idx_students_room_age', 'age_years'
+            if filters.sex is not None:
+                return 'idx_students_room_sex', 'room_id'
+            return 'idx_students_room_id', 'room_id'
+        
+        if filters.has_age_range:
+            return 'idx_students_age', 'age_years'
+        return 'PRIMARY', 'id'
     
     def count_students(self) -> int:
         try:
-            with self.conn_manager.get_conn() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT COUNT(*) FROM students")
-                result = cursor.fetchone()
-                cursor.close()
-                return result[0] if result else 0
+            result = self.stmt_cache.fetch_one(COUNT_STUDENTS_QUERY, dictionary=False, read_only=True)
+            return result[0] if result else 0
                 
         except Exception as e:
             self.logger.error(f"Failed to count students: {e}")
@@ -0,0 +1,38 @@
+import logging
+from typing import Dict, Any
+
+from ...database.conn_manager import ConnManager
+from ...queries.variant_queries import *
+from ...exceptions.exceptions import QueryError
+
+
+class VariantRepo:
+    """Stores the calibrated winner for each analytics query."""
+    
+    def __init__(self, conn_manager: ConnManager):
+        self.conn_manager = conn_manager
+        self.logger = logging.getLogger(__name__)
+    
+    def load_choices(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            return {
+                row['query_name']: row
+                for row in self.conn_manager.iter_query(SELECT_VARIANT_CHOICES_QUERY, read_only=True)
+            }
+                
+        except Exception as e:
+            self.logger.warning(f"No stored query variant choices, using defaults: {e}")
+            return {}
+    
+    def save_choice(self, query_name: str, variant: str, median_ms: float, student_rows: int) -> None:
+        try:
+            with self.conn_manager.get_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute(UPSERT_VARIANT_CHOICE_QUERY, (query_name, variant, median_ms, student_rows))
+                conn.commit()
+                cursor.close()
+                
+        except Exception as e:
+            error_msg = f"Failed to save variant choice for {query_name}: {e}"
+            self.logger.error(error_msg)
+            raise QueryError(error_msg)
@@ -1,11 +1,36 @@
-from .conn_manager import ConnManager
-from .schema_mgr import SchemaMgr
-from .tx_manager import TxManager
-from .optimizer import Optimizer
+from ..utils.lazy_import import lazy_exports
+
+# Loaded on first access: most of these import mysql.connector.
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'ConnManager': '.conn_manager',
+    'ConnPool': '.conn_pool',
+    'ReplicaRouter': '.replica_router',
+    'SchemaMgr': '.schema_mgr',
+    'TxManager': '.tx_manager',
+    'AsyncConnManager': '.async_conn_manager',
+    'AsyncConnPool': '.async_conn_pool',
+    'AsyncTxManager': '.async_tx_manager',
+    'RetryPolicy': '.retry_policy',
+    'QueryWatchdog': '.query_guard',
+    'Optimizer': '.optimizer',
+    'StmtCache': '.stmt_cache',
+    'IndexAdvisor': '.index_advisor',
+    'WorkloadProfiler': '.workload_profiler'
+})
 
 __all__ = [
     'ConnManager',
+    'ConnPool',
+    'ReplicaRouter',
     'SchemaMgr', 
     'TxManager',
-    'Optimizer'
+    'AsyncConnManager',
+    'AsyncConnPool',
+    'AsyncTxManager',
+    'RetryPolicy',
+    'QueryWatchdog',
+    'Optimizer',
+    'StmtCache',
+    'IndexAdvisor',
+    'WorkloadProfiler'
 ]
\ No newline at end of file
@@ -0,0 +1,147 @@
+import mysql.connector
+import logging
+from contextlib import asynccontextmanager
+from typing import Optional, Any, Callable, Dict, AsyncIterator, Iterable, Sequence
+from ..interfaces.db_interface import AsyncDbConnInterface
+from ..config.db_config import DbConfig
+from ..exceptions.exceptions import DbConnError
+from .async_conn_pool import AsyncConnPool
+from ..utils.batching import chunked
+
+
+class AsyncConnManager(AsyncDbConnInterface):
+    """asyncio counterpart of ConnManager.
+
+    A query in flight holds a pooled connection but no thread, so one event
+    loop can serve as many concurrent requests as the pool (and the
+    server's ``max_connections``) allows. Replica routing is not mirrored;
+    every connection goes to the configured primary.
+    """
+
+    def __init__(self, config: DbConfig):
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+        self._pool: Optional[AsyncConnPool] = None
+
+    def _get_pool(self) -> AsyncConnPool:
+        # no lock needed: the event loop does not switch tasks inside this method
+        if self._pool is None:
+            self.logger.info(f"Creating async connection pool to {self.config.host}:{self.config.port}")
+            self._pool = AsyncConnPool(
+                self.config,
+                min_size=min(self.config.pool_min_size, self.config.pool_size),
+                max_size=self.config.pool_size,
+                checkout_timeout=self.config.pool_checkout_timeout,
+                idle_timeout=self.config.pool_idle_timeout,
+                reset_session=self.config.pool_reset_session,
+                max_lifetime=self.config.pool_max_lifetime,
+                validate_after=self.config.pool_validate_after
+            )
+        return self._pool
+
+    async def connect(self) -> Any:
+        try:
+            return await self._get_pool().get_connection()
+
+        except mysql.connector.Error as e:
+            error_msg = f"Failed to connect to MySQL database: {e}"
+            self.logger.error(error_msg)
+            raise DbConnError(
+                error_msg,
+                self.config.host,
+                self.config.database
+            )
+
+    async def disconnect(self) -> None:
+        try:
+            if self._pool is not None:
+                await self._pool.close_all()
+            self._pool = None
+            self.logger.info("Async database connections closed")
+
+        except Exception as e:
+            self.logger.error(f"Error closing async database connections: {e}")
+
+    def is_connected(self) -> bool:
+        return self._pool is not None
+
+    def pool_stats(self) -> Optional[Dict[str, Any]]:
+        return self._pool.stats() if self._pool is not None else None
+
+    @asynccontextmanager
+    async def get_conn(self):
+        connection = None
+        try:
+            connection = await self.connect()
+            yield connection
+
+        except Exception as e:
+            self.logger.error(f"Database connection error: {e}")
+            if connection and await connection.is_connected():
+                await connection.rollback()
+            raise
+
+        finally:
+            if connection is not None:
+                await connection.close()
+
+    async def fetch_all(self, query: str, params: Optional[tuple] = None,
+                        dictionary: bool = True) -> list:
+        async with self.get_conn() as conn:
+            cursor = await conn.cursor(dictionary=dictionary)
+            try:
+                await cursor.execute(query, params)
+                return await cursor.fetchall()
+            finally:
+                await cursor.close()
+
+    async def fetch_one(self, query: str, params: Optional[tuple] = None,
+                        dictionary: bool = True) -> Optional[Any]:
+        rows = await self.fetch_all(query, params, dictionary)
+        return rows[0] if rows else None
+
+    async def iter_query(self, query: str, params: Optional[tuple] = None,
+                         dictionary: bool = True, batch_size: Optional[int] = None,
+                         row_factory: Optional[Callable[[Sequence[str]], Callable[[tuple], Any]]] = None
+                         ) -> AsyncIterator[Any]:
+        """Stream rows through an unbuffered cursor in fetchmany batches; see ``ConnManager.iter_query``."""
+        batch_size = batch_size or self.config.fetch_batch_size
+        async with self.get_conn() as conn:
+            cursor = await conn.cursor(dictionary=dictionary and row_factory is None)
+            try:
+                await cursor.execute(query, params)
+                make_row = row_factory(cursor.column_names) if row_factory is not None else None
+                while True:
+                    rows = await cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in (rows if make_row is None else map(make_row, rows)):
+                        yield row
+            finally:
+                if conn.unread_result:
+                    await conn.consume_results()
+                await cursor.close()
+
+    async def iter_in_chunks(self, query: str, values: Iterable[Any], dictionary: bool = True,
+                             chunk_size: Optional[int] = None) -> AsyncIterator[Any]:
+        """Run ``query`` once per chunk of ``values``; see ``ConnManager.iter_in_chunks``."""
+        chunk_size = chunk_size or self.config.lookup_chunk_size
+        async with self.get_conn() as conn:
+            cursor = await conn.cursor(dictionary=dictionary)
+            try:
+                for chunk in chunked(values, chunk_size):
+                    placeholders = ', '.join(['%s'] * len(chunk))
+                    await cursor.execute(query.format(placeholders=placeholders), tuple(chunk))
+                    for row in await cursor.fetchall():
+                        yield row
+            finally:
+                await cursor.close()
+
+    async def test_conn(self) -> bool:
+        try:
+            result = await self.fetch_one("SELECT 1", dictionary=False)
+            return result[0] == 1
+
+        except Exception as e:
+            self.logger.error(f"Connection test failed: {e}")
+            return False
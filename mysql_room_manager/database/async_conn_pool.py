@@ -0,0 +1,249 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+try:
+    from mysql.connector import aio as mysql_aio
+except ImportError:  # mysql-connector-python < 9.0
+    mysql_aio = None
+
+from ..config.db_config import DbConfig
+from ..exceptions.exceptions import DbConnError, PoolTimeoutError
+
+
+class AsyncPooledConn:
+    """A checked-out asyncio connection; ``await close()`` hands it back to the pool."""
+
+    def __init__(self, pool: 'AsyncConnPool', cnx: Any):
+        self._pool = pool
+        self._cnx = cnx
+
+    def __getattr__(self, name: str) -> Any:
+        if self._cnx is None:
+            raise DbConnError("Connection was already returned to the pool")
+        return getattr(self._cnx, name)
+
+    async def is_connected(self) -> bool:
+        return self._cnx is not None and await self._cnx.is_connected()
+
+    async def close(self) -> None:
+        cnx, self._cnx = self._cnx, None
+        if cnx is not None:
+            await self._pool.release(cnx)
+
+
+class AsyncConnPool:
+    """asyncio counterpart of ConnPool on top of ``mysql.connector.aio``.
+
+    Same sizing, checkout timeout, lifetime and validate-after rules as the
+    threaded pool, but waiting callers suspend on an ``asyncio.Condition``
+    instead of blocking a thread. There is no maintainer thread: idle
+    connections past ``idle_timeout`` are closed on release, and the pool
+    only grows on demand. Must be used from a single event loop.
+    """
+
+    def __init__(self, config: DbConfig, min_size: int, max_size: int,
+                 checkout_timeout: float, idle_timeout: float, reset_session: bool,
+                 max_lifetime: float = 1800.0, validate_after: float = 30.0):
+        if mysql_aio is None:
+            raise DbConnError("asyncio support needs mysql-connector-python >= 9.0",
+                              config.host, config.database)
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise DbConnError(f"Invalid pool bounds: min {min_size}, max {max_size}")
+
+        self.config = config
+        self.min_size = min_size
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.idle_timeout = idle_timeout
+        self.reset_session = reset_session
+        self.max_lifetime = max_lifetime
+        self.validate_after = validate_after
+        self.logger = logging.getLogger(__name__)
+
+        self._cond: Optional[asyncio.Condition] = None
+        self._idle = deque()  # (raw connection, returned_at), most recently returned on the right
+        self._opened_at = {}
+        self._size = 0
+        self._waiting = 0
+        self._closed = False
+        self._metrics = {
+            'checkouts': 0,
+            'timeouts': 0,
+            'waits': 0,
+            'wait_ms_total': 0.0,
+            'wait_ms_max': 0.0,
+            'max_waiting': 0,
+            'opened': 0,
+            'discarded': 0,
+            'shrunk': 0,
+            'expired': 0,
+            'validations': 0
+        }
+
+    @property
+    def _condition(self) -> asyncio.Condition:
+        # created on first use so it binds to the running loop
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    async def get_connection(self, timeout: Optional[float] = None) -> AsyncPooledConn:
+        timeout = self.checkout_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        cond = self._condition
+
+        async with cond:
+            waited = False
+            while True:
+                if self._closed:
+                    raise DbConnError("Connection pool is closed")
+
+                if self._idle:
+                    cnx, returned_at = self._idle.pop()
+                    break
+
+                if self._size < self.max_size:
+                    self._size += 1
+                    cnx, returned_at = None, None
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._metrics['timeouts'] += 1
+                    raise PoolTimeoutError(
+                        f"No free connection after {timeout:.1f}s "
+                        f"({self._size} open, {self._waiting} waiting)",
+                        self.config.host, self.config.database
+                    )
+
+                waited = True
+                self._waiting += 1
+                self._metrics['max_waiting'] = max(self._metrics['max_waiting'], self._waiting)
+                try:
+                    await asyncio.wait_for(cond.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+                finally:
+                    self._waiting -= 1
+
+        try:
+            if cnx is not None and not await self._usable(cnx, returned_at):
+                await self._discard(cnx)
+                cnx = None
+            if cnx is None:
+                cnx = await self._open()
+        except BaseException:
+            async with cond:
+                self._size -= 1
+                cond.notify()
+            raise
+
+        wait_ms = (time.monotonic() - started) * 1000
+        self._metrics['checkouts'] += 1
+        self._metrics['waits'] += int(waited)
+        self._metrics['wait_ms_total'] += wait_ms
+        self._metrics['wait_ms_max'] = max(self._metrics['wait_ms_max'], wait_ms)
+        return AsyncPooledConn(self, cnx)
+
+    async def release(self, cnx: Any) -> None:
+        now = time.monotonic()
+        healthy = not self._expired(cnx, now)
+        if healthy:
+            try:
+                if cnx.unread_result:
+                    await cnx.consume_results()
+                if self.reset_session:
+                    await cnx.reset_session()
+                elif getattr(cnx, 'in_transaction', True):
+                    await cnx.rollback()
+            except Exception as e:
+                self.logger.warning(f"Discarding connection that failed to reset: {e}")
+                healthy = False
+
+        evicted = []
+        cond = self._condition
+        async with cond:
+            if healthy and not self._closed:
+                self._idle.append((cnx, time.monotonic()))
+            else:
+                self._size -= 1
+                evicted.append(cnx)
+
+            # oldest returns sit on the left
+            while self._idle and self._size > self.min_size and now - self._idle[0][1] > self.idle_timeout:
+                evicted.append(self._idle.popleft()[0])
+                self._size -= 1
+                self._metrics['shrunk'] += 1
+            cond.notify()
+
+        for stale in evicted:
+            await self._discard(stale)
+
+    async def close_all(self) -> None:
+        cond = self._condition
+        async with cond:
+            self._closed = True
+            idle = [cnx for cnx, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            cond.notify_all()
+
+        for cnx in idle:
+            await self._discard(cnx)
+
+    def stats(self) -> Dict[str, Any]:
+        metrics = self._metrics
+        checkouts = metrics['checkouts']
+        attempts = checkouts + metrics['timeouts']
+        return {
+            'size': self._size,
+            'in_use': self._size - len(self._idle),
+            'idle': len(self._idle),
+            'waiting': self._waiting,
+            'min_size': self.min_size,
+            'max_size': self.max_size,
+            'checkouts': checkouts,
+            'timeouts': metrics['timeouts'],
+            'exhaustion_rate': metrics['timeouts'] / attempts if attempts else 0.0,
+            'wait_ratio': metrics['waits'] / checkouts if checkouts else 0.0,
+            'avg_checkout_ms': metrics['wait_ms_total'] / checkouts if checkouts else 0.0,
+            'max_checkout_ms': metrics['wait_ms_max'],
+            'max_waiting': metrics['max_waiting'],
+            'opened': metrics['opened'],
+            'discarded': metrics['discarded'],
+            'shrunk': metrics['shrunk'],
+            'expired': metrics['expired'],
+            'validations': metrics['validations']
+        }
+
+    async def _usable(self, cnx: Any, returned_at: float) -> bool:
+        now = time.monotonic()
+        if self._expired(cnx, now):
+            self._metrics['expired'] += 1
+            return False
+        if now - returned_at <= self.validate_after:
+            return True
+
+        self._metrics['validations'] += 1
+        return await cnx.is_connected()
+
+    def _expired(self, cnx: Any, now: float) -> bool:
+        return now - self._opened_at.get(cnx, now) > self.max_lifetime
+
+    async def _open(self) -> Any:
+        cnx = await mysql_aio.connect(**self.config.to_conn_dict())
+        self._metrics['opened'] += 1
+        self._opened_at[cnx] = time.monotonic()
+        return cnx
+
+    async def _discard(self, cnx: Any) -> None:
+        self._metrics['discarded'] += 1
+        self._opened_at.pop(cnx, None)
+        try:
+            await cnx.close()
+        except Exception:
+            pass
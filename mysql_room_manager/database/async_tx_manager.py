@@ -0,0 +1,58 @@
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+from ..config.app_config import APP_CONFIG
+from ..database.async_conn_manager import AsyncConnManager
+from ..database.retry_policy import RetryPolicy
+from ..exceptions.exceptions import QueryError
+
+T = TypeVar('T')
+
+
+class AsyncTxManager:
+    """asyncio counterpart of TxManager.
+
+    There is no ``begin``/``commit`` pair bound to the manager: concurrent
+    tasks share it, so each transaction lives in its own ``transaction()``
+    block or ``run()`` call.
+    """
+    
+    def __init__(self, conn_manager: AsyncConnManager, retry_policy: Optional[RetryPolicy] = None):
+        self.conn_manager = conn_manager
+        self.retry_policy = retry_policy or RetryPolicy(
+            max_retries=APP_CONFIG.MAX_RETRIES,
+            base_delay=APP_CONFIG.RETRY_BASE_DELAY,
+            max_delay=APP_CONFIG.RETRY_DELAY
+        )
+        self.logger = logging.getLogger(__name__)
+    
+    @asynccontextmanager
+    async def transaction(self):
+        connection = None
+        try:
+            connection = await self.conn_manager.connect()
+            await connection.start_transaction()
+            self.logger.debug("Transaction started")
+            
+            yield connection
+            
+            await connection.commit()
+            self.logger.debug("Transaction committed")
+            
+        except Exception as e:
+            if connection and await connection.is_connected():
+                await connection.rollback()
+                self.logger.warning(f"Transaction rolled back due to error: {e}")
+            raise QueryError(f"Transaction failed: {e}") from e
+            
+        finally:
+            if connection is not None:
+                await connection.close()
+    
+    async def run(self, work: Callable[[Any], Awaitable[T]], description: str = "transaction") -> T:
+        """Run ``await work(connection)`` in a transaction, replaying it on deadlocks and lock wait timeouts."""
+        async def attempt() -> T:
+            async with self.transaction() as connection:
+                return await work(connection)
+        
+        return await self.retry_policy.run_async(attempt, description)
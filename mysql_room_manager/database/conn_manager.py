@@ -1,36 +1,114 @@
 import mysql.connector
-from mysql.connector import pooling
 import logging
+import threading
+import time
 from contextlib import contextmanager
-from typing import Optional, Any
+from typing import Optional, Any, Callable, Dict, Iterator, Iterable, Sequence
 from ..interfaces.db_interface import DbConnInterface
 from ..config.db_config import DbConfig
-from ..exceptions.exceptions import DbConnError
+from ..config.app_config import APP_CONFIG
+from ..exceptions.exceptions import DbConnError, QueryTimeoutError
+from .conn_pool import ConnPool
+from .replica_router import ReplicaRouter
+from .query_guard import QueryWatchdog, command_deadline, is_timeout_error, with_max_execution_time
+from ..utils.batching import chunked
 
 
 class ConnManager(DbConnInterface): 
+    """Hands out pooled connections to the primary and, for read-only work, to replicas.
+
+    Reads go to a replica unless the calling thread is inside
+    ``pin_primary()`` or committed on the primary less than
+    ``read_your_writes_window`` seconds ago, so a caller always sees its
+    own writes despite replication lag. Without healthy replicas every
+    read falls back to the primary.
+
+    Every checkout is registered with a QueryWatchdog. Read-only checkouts
+    get ``query_timeout`` seconds by default, and everything is bounded by
+    the running command's budget (see ``query_guard.command_budget``); a
+    statement past its deadline is killed and surfaces as QueryTimeoutError.
+    """
+    
     def __init__(self, config: DbConfig):
         self.config = config
         self.logger = logging.getLogger(__name__)
-        self._pool: Optional[pooling.MySQLConnectionPool] = None
+        self._pool: Optional[ConnPool] = None
+        self._pool_lock = threading.Lock()
         self._connection: Optional[mysql.connector.MySQLConnection] = None
+        self._session = threading.local()
+        self.query_timeout: Optional[float] = APP_CONFIG.QUERY_TIMEOUT
+        self.max_rows: Optional[int] = APP_CONFIG.MAX_QUERY_RESULTS
+        self.watchdog = QueryWatchdog()
+        self._replicas: Optional[ReplicaRouter] = None
+        if config.replicas:
+            self._replicas = ReplicaRouter(
+                config.replica_configs(),
+                lambda replica_config: self._new_pool(replica_config, prewarm=0),
+                retry_interval=config.replica_retry_interval
+            )
     
-    def connect(self) -> Any:
-        try:
+    def warm_up(self) -> None:
+        """Create the pool; its connections are opened in the background."""
+        self._get_pool()
+    
+    def _get_pool(self) -> ConnPool:
+        with self._pool_lock:
             if self._pool is None:
                 self.logger.info(f"Creating connection pool to {self.config.host}:{self.config.port}")
-                
-                pool_config = self.config.to_conn_dict()
-                pool_config.update({
-                    'pool_name': self.config.pool_name,
-                    'pool_size': self.config.pool_size,
-                    'pool_reset_session': self.config.pool_reset_session
-                })
-                
-                self._pool = pooling.MySQLConnectionPool(**pool_config)
+                if self.config.pool_reset_session and self.config.stmt_cache_size:
+                    self.logger.info("Statement cache enabled; pooled sessions are rolled back instead of reset")
+                self._pool = self._new_pool(self.config, self.config.pool_prewarm, on_commit=self.note_write)
                 self.logger.info("Connection pool created successfully")
-            
-            return self._pool.get_connection()
+            return self._pool
+    
+    @staticmethod
+    def _new_pool(config: DbConfig, prewarm: int, on_commit=None) -> ConnPool:
+        # A session reset deallocates server-side prepared statements, so
+        # enabling the (opt-in) statement cache trades it for a rollback.
+        reset_session = config.pool_reset_session and not config.stmt_cache_size
+        
+        return ConnPool(
+            config,
+            min_size=min(config.pool_min_size, config.pool_size),
+            max_size=config.pool_size,
+            checkout_timeout=config.pool_checkout_timeout,
+            idle_timeout=config.pool_idle_timeout,
+            reset_session=reset_session,
+            max_lifetime=config.pool_max_lifetime,
+            validate_after=config.pool_validate_after,
+            prewarm=prewarm,
+            on_commit=on_commit
+        )
+    
+    @contextmanager
+    def pin_primary(self) -> Iterator[None]:
+        """Send every read of the calling thread to the primary inside the block."""
+        depth = getattr(self._session, 'pinned', 0)
+        self._session.pinned = depth + 1
+        try:
+            yield
+        finally:
+            self._session.pinned = depth
+    
+    def note_write(self) -> None:
+        """Start the read-your-writes window of the calling thread."""
+        self._session.last_write = time.monotonic()
+    
+    def _use_replica(self) -> bool:
+        if self._replicas is None or getattr(self._session, 'pinned', 0):
+            return False
+        last_write = getattr(self._session, 'last_write', None)
+        return last_write is None or time.monotonic() - last_write > self.config.read_your_writes_window
+    
+    def connect(self, read_only: bool = False) -> Any:
+        if read_only and self._use_replica():
+            connection = self._replicas.checkout()
+            if connection is not None:
+                return connection
+            self.logger.debug("No replica available, reading from the primary")
+        
+        try:
+            return self._get_pool().get_connection()
             
         except mysql.connector.Error as e:
             error_msg = f"Failed to connect to MySQL database: {e}"
@@ -47,7 +125,13 @@ class ConnManager(DbConnInterface):
                 self._connection.close()
                 self._connection = None
             
-            self._pool = None
+            with self._pool_lock:
+                if self._pool is not None:
+                    self._pool.close_all()
+                self._pool = None
+            if self._replicas is not None:
+                self._replicas.close_all()
+            self.watchdog.stop()
             self.logger.info("Database connection closed")
             
         except Exception as e:
@@ -56,25 +140,142 @@ class ConnManager(DbConnInterface):
     def is_connected(self) -> bool:
         return self._pool is not None
     
+    def pool_stats(self) -> Optional[Dict[str, Any]]:
+        return self._pool.stats() if self._pool is not None else None
+    
+    def replica_stats(self) -> Dict[str, Dict[str, Any]]:
+        return self._replicas.stats() if self._replicas is not None else {}
+    
+    def _time_limit(self, read_only: bool, timeout: Optional[float]) -> Optional[float]:
+        """Seconds the next statement may run, or None for no limit."""
+        if timeout is None and read_only:
+            timeout = self.query_timeout
+        deadline = time.monotonic() + timeout if timeout else None
+        budget = command_deadline()
+        if budget is not None and (deadline is None or budget < deadline):
+            deadline = budget
+        if deadline is None:
+            return None
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise QueryTimeoutError("Command time budget exhausted before the query started")
+        return remaining
+    
+    def cancel_all(self) -> int:
+        """Kill every statement running on a checked-out connection."""
+        return self.watchdog.cancel_all()
+    
     @contextmanager
-    def get_conn(self): 
+    def get_conn(self, read_only: bool = False, timeout: Optional[float] = None): 
         connection = None
+        token = None
         try:
-            connection = self.connect()
+            limit = self._time_limit(read_only, timeout)
+            connection = self.connect(read_only)
+            token = self.watchdog.watch(
+                connection.pool_config,
+                connection.connection_id,
+                time.monotonic() + limit if limit is not None else None
+            )
+            connection.watch_token = token
             self.logger.debug("Database connection acquired from pool")
             yield connection
             
+        except KeyboardInterrupt:
+            # Otherwise the statement runs on and returning the connection
+            # waits for its unread result.
+            if token is not None:
+                self.watchdog.kill(token)
+            raise
+            
         except Exception as e:
+            killed = token is not None and self.watchdog.unwatch(token)
+            token = None
             self.logger.error(f"Database connection error: {e}")
             if connection and connection.is_connected():
                 connection.rollback()
+            if killed or is_timeout_error(e):
+                raise QueryTimeoutError(f"Query exceeded its time limit: {e}") from e
             raise
             
         finally:
-            if connection and connection.is_connected():
+            if token is not None:
+                self.watchdog.unwatch(token)
+            # Dead connections are closed too, so the pool frees their slot.
+            if connection is not None:
                 connection.close()
                 self.logger.debug("Database connection returned to pool")
     
+    def iter_query(self, query: str, params: Optional[tuple] = None,
+                   dictionary: bool = True, batch_size: Optional[int] = None,
+                   read_only: bool = False, max_rows: Optional[int] = None,
+                   timeout: Optional[float] = None,
+                   row_factory: Optional[Callable[[Sequence[str]], Callable[[tuple], Any]]] = None) -> Iterator[Any]:
+        """Stream rows through an unbuffered cursor in fetchmany batches.
+
+        At most ``max_rows`` rows are yielded; past that the statement is
+        killed rather than drained, and a warning is logged.
+
+        With ``row_factory``, rows come from a plain tuple cursor and are
+        mapped through ``row_factory(cursor.column_names)``, which is
+        called once per result set.
+        """
+        if row_factory is not None:
+            dictionary = False
+        batch_size = batch_size or self.config.fetch_batch_size
+        limit = self._time_limit(read_only, timeout)
+        if limit is not None and read_only:
+            query = with_max_execution_time(query, limit)
+        with self.get_conn(read_only, limit) as conn:
+            cursor = conn.cursor(dictionary=dictionary, buffered=False)
+            truncated = False
+            try:
+                cursor.execute(query, params)
+                make_row = row_factory(cursor.column_names) if row_factory is not None else None
+                remaining = max_rows
+                while remaining is None or remaining > 0:
+                    rows = cursor.fetchmany(batch_size if remaining is None else min(batch_size, remaining))
+                    if not rows:
+                        break
+                    if remaining is not None:
+                        remaining -= len(rows)
+                    yield from (rows if make_row is None else map(make_row, rows))
+                else:
+                    truncated = cursor.fetchone() is not None
+            finally:
+                if truncated:
+                    self.logger.warning(f"Result truncated at {max_rows} rows")
+                    self.watchdog.kill(conn.watch_token)
+                # An abandoned generator leaves rows on the wire; drain them
+                # before the connection goes back to the pool.
+                try:
+                    if conn.unread_result:
+                        conn.consume_results()
+                except mysql.connector.Error as e:
+                    if not truncated:
+                        raise
+                    self.logger.debug(f"Killed truncated result: {e}")
+                cursor.close()
+    
+    def iter_in_chunks(self, query: str, values: Iterable[Any], dictionary: bool = True,
+                       chunk_size: Optional[int] = None, read_only: bool = False,
+                       timeout: Optional[float] = None) -> Iterator[Any]:
+        """Run ``query`` once per chunk of ``values`` on a single connection.
+
+        ``query`` must contain a ``{placeholders}`` field, which is expanded
+        to one ``%s`` per value of the chunk, e.g. ``WHERE id IN ({placeholders})``.
+        """
+        chunk_size = chunk_size or self.config.lookup_chunk_size
+        with self.get_conn(read_only, timeout) as conn:
+            cursor = conn.cursor(dictionary=dictionary)
+            try:
+                for chunk in chunked(values, chunk_size):
+                    placeholders = ', '.join(['%s'] * len(chunk))
+                    cursor.execute(query.format(placeholders=placeholders), tuple(chunk))
+                    yield from cursor.fetchall()
+            finally:
+                cursor.close()
+    
     def test_conn(self) -> bool: 
         try:
             with self.get_conn() as conn:
@@ -0,0 +1,354 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+import mysql.connector
+
+from ..config.db_config import DbConfig
+from ..exceptions.exceptions import DbConnError, PoolTimeoutError
+
+
+class PooledConn:
+    """A checked-out connection; ``close()`` hands it back to the pool.
+
+    Everything else is delegated to the raw connection, which stays
+    reachable as ``_cnx`` like mysql-connector's own pooled wrapper, so
+    code keyed on the raw connection (the statement cache) keeps working.
+    """
+
+    def __init__(self, pool: 'ConnPool', cnx: Any):
+        self._pool = pool
+        self._cnx = cnx
+
+    def __getattr__(self, name: str) -> Any:
+        if self._cnx is None:
+            raise DbConnError("Connection was already returned to the pool")
+        return getattr(self._cnx, name)
+
+    @property
+    def pool_config(self) -> DbConfig:
+        return self._pool.config
+
+    def is_connected(self) -> bool:
+        return self._cnx is not None and self._cnx.is_connected()
+
+    def commit(self) -> None:
+        self._cnx.commit()
+        if self._pool.on_commit is not None:
+            self._pool.on_commit()
+
+    def close(self) -> None:
+        cnx, self._cnx = self._cnx, None
+        if cnx is not None:
+            self._pool.release(cnx)
+
+
+class ConnPool:
+    """Blocking connection pool that grows and shrinks between min and max size.
+
+    A checkout takes an idle connection, opens a new one while the pool is
+    below ``max_size``, or waits up to ``checkout_timeout`` seconds for a
+    release before raising PoolTimeoutError.
+
+    Idle connections are only pinged on checkout when they sat unused for
+    more than ``validate_after`` seconds, which is when the server may have
+    dropped them (``wait_timeout``). A background thread pre-opens
+    ``prewarm`` connections at startup and then periodically closes
+    connections older than ``max_lifetime`` or idle past ``idle_timeout``
+    (the latter down to ``min_size``), topping the pool back up to
+    ``min_size``.
+    """
+
+    def __init__(self, config: DbConfig, min_size: int, max_size: int,
+                 checkout_timeout: float, idle_timeout: float, reset_session: bool,
+                 max_lifetime: float = 1800.0, validate_after: float = 30.0, prewarm: int = 0,
+                 on_commit: Optional[Callable[[], None]] = None):
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise DbConnError(f"Invalid pool bounds: min {min_size}, max {max_size}")
+
+        self.config = config
+        self.min_size = min_size
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.idle_timeout = idle_timeout
+        self.reset_session = reset_session
+        self.max_lifetime = max_lifetime
+        self.validate_after = validate_after
+        self.on_commit = on_commit
+        self.logger = logging.getLogger(__name__)
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # (raw connection, returned_at), most recently returned on the right
+        self._opened_at = {}
+        self._size = 0
+        self._waiting = 0
+        self._closed = False
+        self._stop = threading.Event()
+        self._metrics = {
+            'checkouts': 0,
+            'timeouts': 0,
+            'waits': 0,
+            'wait_ms_total': 0.0,
+            'wait_ms_max': 0.0,
+            'max_waiting': 0,
+            'opened': 0,
+            'discarded': 0,
+            'shrunk': 0,
+            'expired': 0,
+            'validations': 0,
+            'failed_validations': 0
+        }
+        self._recent_waits = deque(maxlen=1024)
+
+        self._maintainer = threading.Thread(
+            target=self._maintain, args=(min(max(prewarm, min_size), max_size),),
+            name=f"{config.pool_name}-maintainer", daemon=True
+        )
+        self._maintainer.start()
+
+    def get_connection(self, timeout: Optional[float] = None) -> PooledConn:
+        timeout = self.checkout_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+
+        with self._cond:
+            waited = False
+            while True:
+                if self._closed:
+                    raise DbConnError("Connection pool is closed")
+
+                if self._idle:
+                    cnx, returned_at = self._idle.pop()
+                    break
+
+                if self._size < self.max_size:
+                    self._size += 1
+                    cnx, returned_at = None, None
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._metrics['timeouts'] += 1
+                    raise PoolTimeoutError(
+                        f"No free connection after {timeout:.1f}s "
+                        f"({self._size} open, {self._waiting} waiting)",
+                        self.config.host, self.config.database
+                    )
+
+                waited = True
+                self._waiting += 1
+                self._metrics['max_waiting'] = max(self._metrics['max_waiting'], self._waiting)
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+
+        # Network I/O happens outside the lock so other callers are not blocked on it.
+        try:
+            if cnx is not None and not self._usable(cnx, returned_at):
+                # keep the slot, replace the connection in it
+                self._discard(cnx)
+                cnx = None
+            if cnx is None:
+                cnx = self._open()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+        self._record_checkout((time.monotonic() - started) * 1000, waited)
+        return PooledConn(self, cnx)
+
+    def release(self, cnx: Any) -> None:
+        healthy = not self._expired(cnx, time.monotonic())
+        if healthy:
+            try:
+                if cnx.unread_result:
+                    cnx.consume_results()
+                if self.reset_session:
+                    cnx.reset_session()
+                elif getattr(cnx, 'in_transaction', True):
+                    cnx.rollback()
+            except Exception as e:
+                self.logger.warning(f"Discarding connection that failed to reset: {e}")
+                healthy = False
+
+        with self._cond:
+            if healthy and not self._closed:
+                self._idle.append((cnx, time.monotonic()))
+            else:
+                self._size -= 1
+            self._cond.notify()
+
+        if not healthy or self._closed:
+            self._discard(cnx)
+
+    def resize(self, min_size: Optional[int] = None, max_size: Optional[int] = None) -> None:
+        with self._cond:
+            new_min = self.min_size if min_size is None else min_size
+            new_max = self.max_size if max_size is None else max_size
+            if not 0 <= new_min <= new_max or new_max < 1:
+                raise DbConnError(f"Invalid pool bounds: min {new_min}, max {new_max}")
+            self.min_size, self.max_size = new_min, new_max
+            self._cond.notify_all()
+
+        self.logger.info(f"Connection pool resized to {self.min_size}..{self.max_size}")
+
+    def close_all(self) -> None:
+        self._stop.set()
+        with self._cond:
+            self._closed = True
+            idle = [cnx for cnx, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+
+        for cnx in idle:
+            self._discard(cnx)
+
+    def evict(self) -> int:
+        """Close idle connections past their lifetime, or idle past ``idle_timeout`` above ``min_size``."""
+        now = time.monotonic()
+        evicted = []
+        with self._cond:
+            kept = deque()
+            for cnx, returned_at in self._idle:
+                if self._expired(cnx, now):
+                    self._metrics['expired'] += 1
+                    evicted.append(cnx)
+                else:
+                    kept.append((cnx, returned_at))
+            self._size -= len(evicted)
+
+            # oldest returns sit on the left
+            while kept and self._size > self.min_size and now - kept[0][1] > self.idle_timeout:
+                evicted.append(kept.popleft()[0])
+                self._size -= 1
+                self._metrics['shrunk'] += 1
+            self._idle = kept
+            if evicted:
+                self._cond.notify_all()
+
+        for cnx in evicted:
+            self._discard(cnx)
+        return len(evicted)
+
+    @property
+    def in_use(self) -> int:
+        with self._cond:
+            return self._size - len(self._idle)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            metrics = dict(self._metrics)
+            idle = len(self._idle)
+            size = self._size
+            waiting = self._waiting
+            recent = sorted(self._recent_waits)
+
+        checkouts = metrics['checkouts']
+        attempts = checkouts + metrics['timeouts']
+        return {
+            'size': size,
+            'in_use': size - idle,
+            'idle': idle,
+            'waiting': waiting,
+            'min_size': self.min_size,
+            'max_size': self.max_size,
+            'checkouts': checkouts,
+            'timeouts': metrics['timeouts'],
+            'exhaustion_rate': metrics['timeouts'] / attempts if attempts else 0.0,
+            'wait_ratio': metrics['waits'] / checkouts if checkouts else 0.0,
+            'avg_checkout_ms': metrics['wait_ms_total'] / checkouts if checkouts else 0.0,
+            'p95_checkout_ms': recent[int(len(recent) * 0.95)] if recent else 0.0,
+            'max_checkout_ms': metrics['wait_ms_max'],
+            'max_waiting': metrics['max_waiting'],
+            'opened': metrics['opened'],
+            'discarded': metrics['discarded'],
+            'shrunk': metrics['shrunk'],
+            'expired': metrics['expired'],
+            'validations': metrics['validations'],
+            'failed_validations': metrics['failed_validations']
+        }
+
+    def _usable(self, cnx: Any, returned_at: float) -> bool:
+        now = time.monotonic()
+        if self._expired(cnx, now):
+            with self._cond:
+                self._metrics['expired'] += 1
+            return False
+        if now - returned_at <= self.validate_after:
+            return True
+
+        # is_connected() pings the server
+        alive = cnx.is_connected()
+        with self._cond:
+            self._metrics['validations'] += 1
+            self._metrics['failed_validations'] += int(not alive)
+        return alive
+
+    def _expired(self, cnx: Any, now: float) -> bool:
+        return now - self._opened_at.get(cnx, now) > self.max_lifetime
+
+    def _maintain(self, prewarm: int) -> None:
+        self._top_up(prewarm)
+        interval = max(1.0, min(self.idle_timeout, self.max_lifetime, self.validate_after) / 2)
+        while not self._stop.wait(interval):
+            try:
+                self.evict()
+                self._top_up(self.min_size)
+            except Exception as e:
+                self.logger.warning(f"Connection pool maintenance failed: {e}")
+
+    def _top_up(self, target: int) -> None:
+        while not self._stop.is_set():
+            with self._cond:
+                if self._closed or self._size >= min(target, self.max_size):
+                    return
+                self._size += 1
+            try:
+                cnx = self._open()
+            except Exception as e:
+                with self._cond:
+                    self._size -= 1
+                self.logger.warning(f"Could not pre-open a pool connection: {e}")
+                return
+            with self._cond:
+                closed = self._closed
+                if closed:
+                    # close_all() ran while this one was connecting
+                    self._size -= 1
+                else:
+                    # newest on the right, like returns, so evict() sees the oldest first
+                    self._idle.append((cnx, time.monotonic()))
+                    self._cond.notify()
+            if closed:
+                self._discard(cnx)
+                return
+
+    def _record_checkout(self, wait_ms: float, waited: bool) -> None:
+        with self._cond:
+            self._metrics['checkouts'] += 1
+            self._metrics['waits'] += int(waited)
+            self._metrics['wait_ms_total'] += wait_ms
+            self._metrics['wait_ms_max'] = max(self._metrics['wait_ms_max'], wait_ms)
+            self._recent_waits.append(wait_ms)
+
+    def _open(self) -> Any:
+        cnx = mysql.connector.connect(**self.config.to_conn_dict())
+        with self._cond:
+            self._metrics['opened'] += 1
+            self._opened_at[cnx] = time.monotonic()
+        return cnx
+
+    def _discard(self, cnx: Any) -> None:
+        with self._cond:
+            self._metrics['discarded'] += 1
+            self._opened_at.pop(cnx, None)
+        try:
+            cnx.close()
+        except Exception:
+            pass
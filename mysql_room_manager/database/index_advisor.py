@@ -0,0 +1,329 @@
+import logging
+import re
+import statistics
+import uuid
+from collections import defaultdict
+from typing import List, Dict, Any, Optional, Tuple, Set
+from ..database.conn_manager import ConnManager
+from ..database.optimizer import Optimizer
+from ..queries.opt_queries import *
+from ..queries.sampling_queries import SAMPLE_BUCKETS
+
+_TABLE_REF = re.compile(
+    r'\b(?:FROM|JOIN)\s+(\w+)'
+    r'(?:\s+(?:AS\s+)?(?!(?:ON|WHERE|GROUP|ORDER|LEFT|RIGHT|INNER|JOIN|LIMIT|HAVING|USE|FORCE)\b)(\w+))?',
+    re.IGNORECASE
+)
+_CLAUSE = re.compile(
+    r'\b(?:GROUP|ORDER)\s+BY\s+(.*?)(?=\bHAVING\b|\bORDER\b|\bLIMIT\b|\)|;|$)',
+    re.IGNORECASE | re.DOTALL
+)
+_CLAUSE_ITEM = re.compile(r'^(?:(\w+)\.)?(\w+)(?:\s+(?:ASC|DESC))?$', re.IGNORECASE)
+# `db`.`alias`.`column` followed by the comparison it takes part in
+_CONDITION_REF = re.compile(
+    r'(?:`\w+`\.)?`(\w+)`\.`(\w+)`\s*(<=>|>=|<=|<>|!=|=|<|>|between\b|in\b|is\b)?',
+    re.IGNORECASE
+)
+_RANGE_OPS = {'>=', '<=', '<', '>', 'between'}
+_CLUSTERED = 'id'
+
+
+class IndexAdvisor:
+    """Proposes indexes from EXPLAIN plans and keeps only those that pay off.
+
+    Every ``table`` node of each workload plan, nested joins and subqueries
+    included, is turned into candidate keys: equality columns first, then
+    GROUP BY/ORDER BY columns, then one range column, optionally followed
+    by the remaining read columns to make the index covering. Candidates
+    already served by an index prefix are dropped.
+
+    The survivors are built one at a time on per-run shadow copies of the
+    tables (students sampled via ``sample_bucket``), and the workload is re-timed
+    against them. Only candidates whose total workload gain reaches
+    ``min_gain`` are recommended.
+    """
+
+    def __init__(self, conn_manager: ConnManager, optimizer: Optimizer,
+                 sample_rate: float = 0.1, min_gain: float = 0.1,
+                 runs: int = 5, max_columns: int = 5):
+        self.conn_manager = conn_manager
+        self.optimizer = optimizer
+        self.sample_rate = sample_rate
+        self.min_gain = min_gain
+        self.runs = runs
+        self.max_columns = max_columns
+        self.logger = logging.getLogger(__name__)
+
+    def propose_candidates(self, workload: List[Tuple[str, str, Optional[tuple]]]) -> List[Dict[str, Any]]:
+        table_columns = self._load_table_columns()
+        existing = self._load_existing_indexes()
+
+        candidates = {}
+        for query_name, query, params in workload:
+            try:
+                plan = self.optimizer.explain_plan(query, params)
+            except Exception as e:
+                self.logger.warning(f"Cannot EXPLAIN {query_name}: {e}")
+                continue
+
+            for candidate in self._candidates_for_plan(query, plan, table_columns):
+                key = (candidate['table'], tuple(candidate['columns']))
+                if key in candidates:
+                    candidates[key]['queries'].append(query_name)
+                    continue
+                if self._is_served(candidate['columns'], existing.get(candidate['table'], [])):
+                    continue
+                candidate['queries'] = [query_name]
+                candidates[key] = candidate
+
+        return list(candidates.values())
+
+    def advise(self, workload: List[Tuple[str, str, Optional[tuple]]]) -> Dict[str, Any]:
+        candidates = self.propose_candidates(workload)
+        result = {
+            'candidates': len(candidates),
+            'sample_rate': self.sample_rate,
+            'baseline_ms': 0.0,
+            'recommendations': [],
+            'rejected': []
+        }
+        if not candidates:
+            self.logger.info("Index advisor found no candidates")
+            return result
+
+        tables = sorted({t for _, q, _ in workload for t, _ in self._table_aliases(q).values()}
+                        & set(self._load_table_columns()))
+        # per-run names, so concurrent runs never drop or overwrite each other's copies
+        run_id = uuid.uuid4().hex[:8]
+        shadows = {table: f"{SHADOW_TABLE_PREFIX}{table}_{run_id}" for table in tables}
+        shadow_workload = [(name, self._shadow_query(query, shadows), params)
+                           for name, query, params in workload]
+
+        try:
+            self._build_shadow_tables(shadows)
+            baseline = self._time_workload(shadow_workload)
+            result['baseline_ms'] = round(sum(baseline.values()), 3)
+
+            for candidate in candidates:
+                timings = self._time_with_index(candidate, shadows, shadow_workload)
+                total_before = sum(baseline.values())
+                total_after = sum(timings.values())
+                gain = (total_before - total_after) / total_before if total_before else 0.0
+
+                entry = {
+                    'table': candidate['table'],
+                    'columns': candidate['columns'],
+                    'covering': candidate['covering'],
+                    'queries': candidate['queries'],
+                    'ddl': CREATE_INDEX_TEMPLATE.format(
+                        index_name=candidate['index_name'],
+                        table=candidate['table'],
+                        columns=', '.join(candidate['columns'])
+                    ),
+                    'workload_gain': round(gain, 4),
+                    'query_gains': {
+                        name: round((baseline[name] - timings[name]) / baseline[name], 4)
+                        if baseline[name] else 0.0
+                        for name in baseline
+                    }
+                }
+
+                if gain >= self.min_gain:
+                    result['recommendations'].append(entry)
+                else:
+                    result['rejected'].append(entry)
+        finally:
+            self._drop_shadow_tables(shadows)
+
+        result['recommendations'].sort(key=lambda e: e['workload_gain'], reverse=True)
+        return result
+
+    def _candidates_for_plan(self, query: str, plan: Dict[str, Any],
+                             table_columns: Dict[str, Set[str]]) -> List[Dict[str, Any]]:
+        aliases = self._table_aliases(query)
+        ordering = self._ordering_columns(query, aliases, table_columns)
+        needs_order = any(node.get('using_filesort') or node.get('using_temporary_table')
+                          for node in self.optimizer.iter_plan_nodes(plan))
+
+        candidates = []
+        for node in self.optimizer.iter_plan_tables(plan):
+            table, _ = aliases.get(node.get('table_name', ''), (None, None))
+            if table not in table_columns:
+                continue
+
+            access_type = node.get('access_type', '')
+            if access_type in ('const', 'eq_ref', 'system'):
+                continue
+            if access_type in ('ref', 'range') and node.get('using_index') and not needs_order:
+                continue
+
+            equality, ranges = self._condition_columns(node, table)
+            key_columns = equality + (ordering.get(table, []) if needs_order else []) + ranges[:1]
+            key_columns = self._dedupe(c for c in key_columns if c != _CLUSTERED)
+            if not key_columns:
+                continue
+
+            read_columns = [c for c in node.get('used_columns', [])
+                            if c in table_columns[table] and c != _CLUSTERED]
+            covering = self._dedupe(key_columns + read_columns)
+
+            for columns in (key_columns, covering):
+                if len(columns) > self.max_columns:
+                    continue
+                candidates.append({
+                    'table': table,
+                    'columns': columns,
+                    'covering': set(read_columns) <= set(columns),
+                    'index_name': self._index_name(table, columns)
+                })
+
+        return candidates
+
+    @staticmethod
+    def _table_aliases(query: str) -> Dict[str, Tuple[str, str]]:
+        aliases = {}
+        for table, alias in _TABLE_REF.findall(query):
+            aliases[alias or table] = (table, alias or table)
+            aliases.setdefault(table, (table, table))
+        return aliases
+
+    @staticmethod
+    def _ordering_columns(query: str, aliases: Dict[str, Tuple[str, str]],
+                          table_columns: Dict[str, Set[str]]) -> Dict[str, List[str]]:
+        ordering = defaultdict(list)
+        for clause in _CLAUSE.findall(query):
+            for item in clause.split(','):
+                match = _CLAUSE_ITEM.match(item.strip())
+                if not match:
+                    continue
+                alias, column = match.groups()
+                if alias:
+                    table = aliases.get(alias, (None, None))[0]
+                    tables = [table] if table else []
+                else:
+                    tables = [t for t, _ in set(aliases.values())
+                              if column in table_columns.get(t, ())]
+                for table in tables:
+                    if column in table_columns.get(table, ()):
+                        ordering[table].append(column)
+        return ordering
+
+    @staticmethod
+    def _condition_columns(node: Dict[str, Any], table: str) -> Tuple[List[str], List[str]]:
+        equality = list(node.get('used_key_parts', [])) if node.get('access_type') == 'ref' else []
+        ranges = []
+        condition = node.get('attached_condition', '')
+        alias = node.get('table_name', table)
+        for ref_alias, column, op in _CONDITION_REF.findall(condition):
+            if ref_alias != alias:
+                continue
+            op = op.lower()
+            if op in ('=', '<=>', 'in', 'is'):
+                equality.append(column)
+            elif op in _RANGE_OPS:
+                ranges.append(column)
+        return equality, ranges
+
+    @staticmethod
+    def _is_served(columns: List[str], indexes: List[List[str]]) -> bool:
+        return any(index[:len(columns)] == columns for index in indexes)
+
+    @staticmethod
+    def _dedupe(columns) -> List[str]:
+        seen = []
+        for column in columns:
+            if column not in seen:
+                seen.append(column)
+        return seen
+
+    @staticmethod
+    def _index_name(table: str, columns: List[str]) -> str:
+        return f"idx_adv_{table}_{'_'.join(columns)}"[:64]
+
+    @staticmethod
+    def _shadow_query(query: str, shadows: Dict[str, str]) -> str:
+        if not shadows:
+            return query
+        by_name = {table.lower(): shadow for table, shadow in shadows.items()}
+        pattern = re.compile(r'\b(FROM|JOIN)\s+(' + '|'.join(map(re.escape, shadows)) + r')\b',
+                             re.IGNORECASE)
+        return pattern.sub(lambda m: f"{m.group(1)} {by_name[m.group(2).lower()]}", query)
+
+    def _load_table_columns(self) -> Dict[str, Set[str]]:
+        columns = defaultdict(set)
+        for row in self.conn_manager.iter_query(TABLE_COLUMNS_QUERY, (self.conn_manager.config.database,)):
+            if not row['table_name'].startswith(SHADOW_TABLE_PREFIX):
+                columns[row['table_name']].add(row['column_name'])
+        return dict(columns)
+
+    def _load_existing_indexes(self) -> Dict[str, List[List[str]]]:
+        indexes = defaultdict(lambda: defaultdict(list))
+        for row in self.conn_manager.iter_query(INDEX_COLUMNS_QUERY, (self.conn_manager.config.database,)):
+            indexes[row['table_name']][row['index_name']].append(row['column_name'])
+        return {table: list(by_name.values()) for table, by_name in indexes.items()}
+
+    def _insertable_columns(self, table: str) -> List[str]:
+        return [
+            row['column_name']
+            for row in self.conn_manager.iter_query(TABLE_COLUMNS_QUERY, (self.conn_manager.config.database,))
+            if row['table_name'] == table and not row['generation_expression']
+        ]
+
+    def _build_shadow_tables(self, shadows: Dict[str, str]) -> None:
+        threshold = max(1, round(self.sample_rate * SAMPLE_BUCKETS))
+        all_columns = self._load_table_columns()
+
+        with self.conn_manager.get_conn() as conn:
+            cursor = conn.cursor()
+            for table, shadow in shadows.items():
+                columns = ', '.join(self._insertable_columns(table))
+                cursor.execute(CREATE_SHADOW_TABLE_TEMPLATE.format(shadow=shadow, table=table))
+
+                if 'sample_bucket' in all_columns.get(table, ()):
+                    cursor.execute(SAMPLED_COPY_SHADOW_TABLE_TEMPLATE.format(
+                        shadow=shadow, table=table, columns=columns), (threshold,))
+                else:
+                    cursor.execute(COPY_SHADOW_TABLE_TEMPLATE.format(
+                        shadow=shadow, table=table, columns=columns))
+                conn.commit()
+
+                cursor.execute(ANALYZE_TABLE_TEMPLATE.format(table=shadow))
+                cursor.fetchall()
+                self.logger.info(f"Built shadow table {shadow}")
+            cursor.close()
+
+    def _drop_shadow_tables(self, shadows: Dict[str, str]) -> None:
+        try:
+            with self.conn_manager.get_conn() as conn:
+                cursor = conn.cursor()
+                for shadow in shadows.values():
+                    cursor.execute(DROP_SHADOW_TABLE_TEMPLATE.format(shadow=shadow))
+                cursor.close()
+        except Exception as e:
+            self.logger.error(f"Failed to drop shadow tables: {e}")
+
+    def _time_workload(self, workload: List[Tuple[str, str, Optional[tuple]]]) -> Dict[str, float]:
+        return {
+            # shadow tables and their trial indexes only exist on the primary
+            name: statistics.median(self.optimizer.time_query(query, params, runs=self.runs, read_only=False))
+            for name, query, params in workload
+        }
+
+    def _time_with_index(self, candidate: Dict[str, Any], shadows: Dict[str, str],
+                         workload: List[Tuple[str, str, Optional[tuple]]]) -> Dict[str, float]:
+        shadow = shadows[candidate['table']]
+        with self.conn_manager.get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute(CREATE_INDEX_TEMPLATE.format(
+                index_name=candidate['index_name'], table=shadow, columns=', '.join(candidate['columns'])))
+            cursor.execute(ANALYZE_TABLE_TEMPLATE.format(table=shadow))
+            cursor.fetchall()
+            cursor.close()
+
+        try:
+            return self._time_workload(workload)
+        finally:
+            with self.conn_manager.get_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute(DROP_INDEX_TEMPLATE.format(index_name=candidate['index_name'], table=shadow))
+                cursor.close()
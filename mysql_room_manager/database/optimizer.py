@@ -1,8 +1,18 @@
 import logging
 import json
-from typing import List, Dict, Any, Optional
+import re
+import hashlib
+import time
+from collections import defaultdict
+from typing import List, Dict, Any, Optional, Iterator
 from ..database.conn_manager import ConnManager
 from ..queries.opt_queries import * 
+from ..queries.schema_queries import TABLE_PARTITIONS_QUERY
+
+_PLAN_COST = re.compile(r'\s*\(cost=[^)]*\)')
+_PLAN_ACTUAL = re.compile(
+    r'\s*\(actual time=([\d.]+)\.\.([\d.]+) rows=([\d.e+]+) loops=(\d+)\)|\s*\(never executed\)'
+)
 
 
 class Optimizer: 
@@ -13,11 +23,11 @@ class Optimizer:
     
     def analyze_query_perf(self, query: str, params: Optional[tuple] = None) -> Dict[str, Any]:
         try:
-            with self.conn_manager.get_conn() as conn:
+            with self.conn_manager.get_conn(read_only=True) as conn:
                 cursor = conn.cursor()
                 
                 explain_query = EXPLAIN_QUERY_TEMPLATE.format(query=query)
-                cursor.execute(explain_query)
+                cursor.execute(explain_query, params)
                 explain_result = cursor.fetchone()
                 
                 if explain_result and explain_result[0]:
@@ -42,52 +52,277 @@ class Optimizer:
                 'optimization_suggestions': []
             }
     
-    def get_table_stats(self) -> List[Dict[str, Any]]: 
+    def explain_plan(self, query: str, params: Optional[tuple] = None) -> Dict[str, Any]:
+        with self.conn_manager.get_conn(read_only=True) as conn:
+            cursor = conn.cursor()
+            cursor.execute(EXPLAIN_QUERY_TEMPLATE.format(query=query), params)
+            explain_result = cursor.fetchone()
+            cursor.close()
+        
+        if explain_result and explain_result[0]:
+            return json.loads(explain_result[0])
+        return {}
+    
+    def explain_analyze(self, query: str, params: Optional[tuple] = None) -> Dict[str, Any]:
+        """Run EXPLAIN ANALYZE and parse its tree into actual timings and a plan fingerprint.
+
+        The fingerprint hashes the plan operations with estimates and actuals
+        stripped, so it only changes when the chosen plan does.
+        """
+        with self.conn_manager.get_conn(read_only=True) as conn:
+            cursor = conn.cursor()
+            cursor.execute(EXPLAIN_ANALYZE_QUERY_TEMPLATE.format(query=query), params)
+            row = cursor.fetchone()
+            cursor.close()
+        
+        plan_text = row[0] if row else ''
+        nodes = []
+        shape = []
+        for line in plan_text.splitlines():
+            if '->' not in line:
+                continue
+            depth = (len(line) - len(line.lstrip())) // 4
+            actual = _PLAN_ACTUAL.search(line)
+            operation = _PLAN_ACTUAL.sub('', _PLAN_COST.sub('', line)).strip().lstrip('-> ').strip()
+            shape.append(f"{depth}:{operation}")
+            
+            node = {'depth': depth, 'operation': operation, 'actual_ms': None, 'rows': 0, 'loops': 0}
+            if actual and actual.group(2):
+                node.update(actual_ms=float(actual.group(2)), rows=int(float(actual.group(3))),
+                            loops=int(actual.group(4)))
+            nodes.append(node)
+        
+        root = nodes[0] if nodes else {}
+        return {
+            'plan_text': plan_text,
+            'fingerprint': hashlib.sha1('\n'.join(shape).encode('utf-8')).hexdigest(),
+            'actual_ms': root.get('actual_ms') or 0.0,
+            'actual_rows': root.get('rows', 0),
+            'nodes': nodes
+        }
+    
+    @staticmethod
+    def iter_plan_nodes(node: Any) -> Iterator[Dict[str, Any]]:
+        """Yield every object of an EXPLAIN FORMAT=JSON plan, depth first."""
+        if isinstance(node, dict):
+            yield node
+            for value in node.values():
+                yield from Optimizer.iter_plan_nodes(value)
+        elif isinstance(node, list):
+            for item in node:
+                yield from Optimizer.iter_plan_nodes(item)
+    
+    @staticmethod
+    def iter_plan_tables(node: Any) -> Iterator[Dict[str, Any]]:
+        """Yield every ``table`` entry of an EXPLAIN FORMAT=JSON plan, at any depth."""
+        for plan_node in Optimizer.iter_plan_nodes(node):
+            table = plan_node.get('table')
+            if isinstance(table, dict):
+                yield table
+    
+    def check_partition_pruning(self, query: str, params: Optional[tuple] = None,
+                                table_name: str = 'students') -> Dict[str, Any]:
         try:
-            with self.conn_manager.get_conn() as conn:
-                cursor = conn.cursor(dictionary=True)
-                cursor.execute(TABLE_SIZE_ANALYSIS_QUERY, (self.conn_manager.config.database,))
-                table_stats = cursor.fetchall()
+            with self.conn_manager.get_conn(read_only=True) as conn:
+                cursor = conn.cursor()
+                cursor.execute(TABLE_PARTITIONS_QUERY, (self.conn_manager.config.database, table_name))
+                all_partitions = [row[0] for row in cursor.fetchall()]
                 cursor.close()
-                return table_stats
+            
+            accessed = set()
+            for table in self.iter_plan_tables(self.explain_plan(query, params)):
+                accessed.update(table.get('partitions', []))
+            
+            return {
+                'partitions_total': len(all_partitions),
+                'partitions_accessed': sorted(accessed, key=all_partitions.index) if all_partitions else [],
+                'pruned': bool(all_partitions) and 0 < len(accessed) < len(all_partitions)
+            }
+            
+        except Exception as e:
+            self.logger.error(f"Partition pruning check failed: {e}")
+            return {'error': str(e), 'partitions_total': 0, 'partitions_accessed': [], 'pruned': False}
+    
+    def time_query(self, query: str, params: Optional[tuple] = None,
+                   runs: int = 5, warmup: int = 1, read_only: bool = True) -> List[float]:
+        """Execute ``query`` and fetch all rows; return per-run latencies in ms."""
+        latencies = []
+        with self.conn_manager.get_conn(read_only) as conn:
+            cursor = conn.cursor()
+            for i in range(warmup + runs):
+                started = time.perf_counter()
+                cursor.execute(query, params)
+                cursor.fetchall()
+                if i >= warmup:
+                    latencies.append((time.perf_counter() - started) * 1000)
+            cursor.close()
+        return latencies
+    
+    def iter_table_stats(self) -> Iterator[Dict[str, Any]]:
+        return self.conn_manager.iter_query(
+            TABLE_SIZE_ANALYSIS_QUERY, (self.conn_manager.config.database,), read_only=True
+        )
+    
+    def get_table_stats(self) -> List[Dict[str, Any]]: 
+        try:
+            return list(self.iter_table_stats())
                 
         except Exception as e:
             self.logger.error(f"Failed to get table statistics: {e}")
             return []
     
+    def iter_index_usage_stats(self) -> Iterator[Dict[str, Any]]:
+        return self.conn_manager.iter_query(
+            INDEX_USAGE_ANALYSIS_QUERY, (self.conn_manager.config.database,), read_only=True
+        )
+    
     def get_index_usage_stats(self) -> List[Dict[str, Any]]:
         try:
-            with self.conn_manager.get_conn() as conn:
-                cursor = conn.cursor(dictionary=True)
-                cursor.execute(INDEX_USAGE_ANALYSIS_QUERY, (self.conn_manager.config.database,))
-                index_stats = cursor.fetchall()
-                cursor.close()
-                return index_stats
+            return list(self.iter_index_usage_stats())
                 
         except Exception as e:
             self.logger.error(f"Failed to get index statistics: {e}")
             return []
     
+    def get_slow_queries(self) -> List[Dict[str, Any]]:
+        """Slowest statement digests by average latency since server start."""
+        try:
+            return list(self.conn_manager.iter_query(
+                SLOW_QUERY_ANALYSIS, (self.conn_manager.config.database,)
+            ))
+                
+        except Exception as e:
+            self.logger.error(f"Failed to get slow queries: {e}")
+            return []
+    
+    def get_index_report(self) -> Dict[str, Any]:
+        """Per-index usage, size and insert cost, with prefix-redundant and unused indexes flagged.
+
+        Read counters come from performance_schema and reset on server restart,
+        so ``uptime_sec`` is returned alongside them. Insert overhead is
+        estimated from index size per row: every inserted row writes one entry
+        of roughly that size into each index.
+        """
+        database = self.conn_manager.config.database
+        
+        try:
+            definitions = defaultdict(dict)
+            for row in self.conn_manager.iter_query(INDEX_COLUMNS_QUERY, (database,)):
+                index = definitions[row['table_name']].setdefault(
+                    row['index_name'], {'columns': [], 'unique': not row['non_unique']}
+                )
+                index['columns'].append(row['column_name'])
+            
+            table_rows = {
+                row['table_name']: row['table_rows'] or 0
+                for row in self.conn_manager.iter_query(TABLE_ROWS_QUERY, (database,))
+            }
+            
+        except Exception as e:
+            self.logger.error(f"Failed to build index report: {e}")
+            return {'error': str(e), 'indexes': []}
+        
+        # Sizes and read counters need privileges beyond information_schema;
+        # without them only their columns are missing from the report.
+        sizes = self._load_index_sizes(database)
+        reads, uptime = self._load_index_reads(database)
+        
+        indexes = []
+        for table, table_indexes in definitions.items():
+            rows = max(table_rows.get(table, 0), 1)
+            total_bytes = None
+            if sizes is not None:
+                total_bytes = sum(sizes.get((table, name), 0) for name in table_indexes) or 1
+            
+            for name, index in table_indexes.items():
+                size_bytes = sizes.get((table, name), 0) if sizes is not None else None
+                redundant_with = [
+                    other for other, other_index in table_indexes.items()
+                    if other != name and not index['unique']
+                    and other_index['columns'][:len(index['columns'])] == index['columns']
+                    and (len(other_index['columns']) > len(index['columns']) or other < name)
+                ]
+                index_reads = reads.get((table, name)) if reads is not None else None
+                droppable = name != 'PRIMARY' and not index['unique']
+                
+                indexes.append({
+                    'table_name': table,
+                    'index_name': name,
+                    'columns': index['columns'],
+                    'unique': index['unique'],
+                    'size_mb': round(size_bytes / 1024 / 1024, 2) if size_bytes is not None else None,
+                    'bytes_per_row': round(size_bytes / rows, 1) if size_bytes is not None else None,
+                    'insert_share': round(size_bytes / total_bytes, 4) if size_bytes is not None else None,
+                    'reads': index_reads,
+                    'redundant_with': redundant_with if droppable else [],
+                    'unused': droppable and index_reads == 0
+                })
+        
+        return {
+            'indexes': indexes,
+            'uptime_sec': uptime,
+            'counters_available': reads is not None,
+            'sizes_available': sizes is not None
+        }
+    
+    def _load_index_sizes(self, database: str):
+        try:
+            sizes = defaultdict(int)
+            for row in self.conn_manager.iter_query(INDEX_SIZE_QUERY, (database,)):
+                # partitions are stored as <table>#p#<partition>
+                sizes[(row['table_name'].split('#')[0], row['index_name'])] += int(row['size_bytes'])
+            return sizes
+            
+        except Exception as e:
+            self.logger.warning(f"mysql.innodb_index_stats sizes unavailable: {e}")
+            return None
+    
+    def _load_index_reads(self, database: str):
+        try:
+            reads = {
+                (row['table_name'], row['index_name']): int(row['read_count'])
+                for row in self.conn_manager.iter_query(INDEX_IO_QUERY, (database,))
+            }
+            with self.conn_manager.get_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute(SERVER_UPTIME_QUERY)
+                row = cursor.fetchone()
+                cursor.close()
+            return reads, int(row[1]) if row else None
+            
+        except Exception as e:
+            self.logger.warning(f"performance_schema index counters unavailable: {e}")
+            return None, None
+    
     def _gen_opt_suggestions(self, exec_plan: Dict[str, Any]) -> List[str]: 
         suggestions = []
         
         try:
-            if 'query_block' in exec_plan:
-                query_block = exec_plan['query_block']
+            for table in self.iter_plan_tables(exec_plan):
+                name = table.get('table_name', '?')
+                access_type = table.get('access_type', '')
+                key = table.get('key')
                 
-                if 'table' in query_block:
-                    access_type = query_block.get('table', {}).get('access_type', '')
-                    if access_type == 'ALL':
-                        suggestions.append("Consider adding indexes - full table scan detected")
-                
-                if 'nested_loop' in query_block:
-                    suggestions.append("Consider optimizing join conditions and adding composite indexes")
-                
-                if query_block.get('using_filesort'):
-                    suggestions.append("Consider adding index for ORDER BY clause to avoid filesort")
-                
-                if query_block.get('using_temporary_table'):
-                    suggestions.append("Query uses temporary table - consider query restructuring")
+                if access_type == 'ALL':
+                    suggestions.append(f"Consider adding indexes - full table scan on `{name}`")
+                elif access_type == 'index':
+                    suggestions.append(f"Full index scan on `{name}` via {key} - consider a more selective index")
+                elif access_type in ('ref', 'range') and key and not table.get('using_index'):
+                    suggestions.append(
+                        f"`{name}` reads rows after {key} - a covering index on "
+                        f"({', '.join(table.get('used_columns', []))}) would avoid the lookups"
+                    )
+            
+            nodes = list(self.iter_plan_nodes(exec_plan))
+            
+            if any('nested_loop' in node for node in nodes):
+                suggestions.append("Consider optimizing join conditions and adding composite indexes")
+            
+            if any(node.get('using_filesort') for node in nodes):
+                suggestions.append("Consider adding index for ORDER BY clause to avoid filesort")
+            
+            if any(node.get('using_temporary_table') for node in nodes):
+                suggestions.append("Query uses temporary table - consider query restructuring")
             
             if not suggestions:
                 suggestions.append("Query execution plan looks optimized")
@@ -97,4 +332,3 @@ class Optimizer:
             suggestions.append("Unable to analyze execution plan")
         
         return suggestions
-
@@ -0,0 +1,198 @@
+import heapq
+import itertools
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from ..config.db_config import DbConfig
+
+ER_QUERY_INTERRUPTED = 1317
+ER_QUERY_TIMEOUT = 3024
+
+_LEADING_SELECT = re.compile(r'^(\s*SELECT)\b', re.IGNORECASE)
+
+# Process-wide deadline of the running command, see command_budget().
+_command_deadline: Optional[float] = None
+
+
+@contextmanager
+def command_budget(seconds: Optional[float]) -> Iterator[None]:
+    """Give every query started inside the block a deadline of at most ``seconds`` from now."""
+    global _command_deadline
+    previous = _command_deadline
+    if seconds:
+        deadline = time.monotonic() + seconds
+        _command_deadline = deadline if previous is None else min(previous, deadline)
+    try:
+        yield
+    finally:
+        _command_deadline = previous
+
+
+def command_deadline() -> Optional[float]:
+    return _command_deadline
+
+
+def with_max_execution_time(query: str, timeout: float) -> str:
+    """Add a MAX_EXECUTION_TIME hint to a top-level SELECT; other statements are returned as is.
+
+    The server enforces the hint itself, so the statement stops even if
+    this process dies before the watchdog gets to it.
+    """
+    ms = max(1, int(timeout * 1000))
+    return _LEADING_SELECT.sub(lambda m: f"{m.group(1)} /*+ MAX_EXECUTION_TIME({ms}) */", query, count=1)
+
+
+def is_timeout_error(error: BaseException) -> bool:
+    """True for a statement stopped by MAX_EXECUTION_TIME.
+
+    ER_QUERY_INTERRUPTED is not one: it also comes from a Ctrl-C
+    ``cancel_all`` or a KILL run by someone else. Watchdog deadline kills
+    are recognised by ``QueryWatchdog.unwatch`` instead.
+    """
+    return getattr(error, 'errno', None) == ER_QUERY_TIMEOUT
+
+
+class QueryWatchdog:
+    """Kills statements that outlive their deadline with ``KILL QUERY``.
+
+    Every checked-out connection is registered with its server-side
+    connection id and an optional deadline. A background thread sleeps
+    until the earliest deadline and then kills whatever that connection is
+    running, over a separate connection to the same server. ``cancel_all``
+    kills everything still registered, which is what a Ctrl-C needs: a
+    statement the client stopped waiting for keeps running on the server
+    otherwise.
+
+    The kill itself runs outside the registry lock, so a slow or
+    unreachable server never stalls ``watch``/``unwatch`` on other
+    connections. A token is marked as being killed under the lock, and
+    ``unwatch`` waits for that one token before the connection goes back
+    to the pool, so a kill can never hit the next borrower.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Condition()
+        # serializes use of the killer connections, not the registry
+        self._kill_lock = threading.Lock()
+        self._watched: Dict[int, Tuple[DbConfig, int, Optional[float]]] = {}
+        self._deadlines = []  # heap of (deadline, token)
+        self._killing = set()
+        self._fired: Dict[int, bool] = {}  # token -> killed for passing its deadline
+        self._killers: Dict[Tuple[str, int], Any] = {}
+        self._tokens = itertools.count(1)
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        self.kills = 0
+
+    def watch(self, config: DbConfig, connection_id: int, deadline: Optional[float] = None) -> int:
+        with self._lock:
+            token = next(self._tokens)
+            self._watched[token] = (config, connection_id, deadline)
+            if deadline is not None:
+                heapq.heappush(self._deadlines, (deadline, token))
+                self._ensure_thread()
+                self._lock.notify()
+            return token
+
+    def unwatch(self, token: int) -> bool:
+        """Stop watching; True when the watchdog killed the statement for passing its deadline."""
+        with self._lock:
+            while token in self._killing:
+                self._lock.wait()
+            self._watched.pop(token, None)
+            return self._fired.pop(token, False)
+
+    def kill(self, token: int) -> bool:
+        return self._kill(token)
+
+    def cancel_all(self) -> int:
+        with self._lock:
+            tokens = list(self._watched)
+        killed = sum(self._kill(token) for token in tokens)
+        if killed:
+            self.logger.warning(f"Cancelled {killed} running queries")
+        return killed
+
+    def stop(self) -> None:
+        with self._lock:
+            self._stopped = True
+            self._lock.notify_all()
+        with self._kill_lock:
+            killers, self._killers = list(self._killers.values()), {}
+        for killer in killers:
+            try:
+                killer.close()
+            except Exception:
+                pass
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name="query-watchdog", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                if self._stopped:
+                    return
+                now = time.monotonic()
+                due = []
+                while self._deadlines and (self._deadlines[0][0] <= now
+                                           or self._deadlines[0][1] not in self._watched):
+                    deadline, token = heapq.heappop(self._deadlines)
+                    if token in self._watched:
+                        due.append((deadline, token))
+                if not due:
+                    self._lock.wait(self._deadlines[0][0] - now if self._deadlines else None)
+                    continue
+
+            for deadline, token in due:
+                if self._kill(token, timed_out=True):
+                    self.logger.warning(f"Query exceeded its time budget by {now - deadline:.2f}s, killed")
+
+    def _kill(self, token: int, timed_out: bool = False) -> bool:
+        with self._lock:
+            entry = self._watched.get(token)
+            if entry is None or token in self._fired or token in self._killing:
+                return False
+            self._killing.add(token)
+        config, connection_id, _ = entry
+
+        killed = False
+        try:
+            with self._kill_lock:
+                cursor = self._killer(config).cursor()
+                cursor.execute(f"KILL QUERY {int(connection_id)}")
+                cursor.close()
+            killed = True
+        except Exception as e:
+            with self._kill_lock:
+                self._killers.pop((config.host, config.port), None)
+            self.logger.error(f"Could not kill query on connection {connection_id}: {e}")
+        finally:
+            with self._lock:
+                self._killing.discard(token)
+                if killed:
+                    self._fired[token] = timed_out
+                    self.kills += 1
+                self._lock.notify_all()
+        return killed
+
+    def _killer(self, config: DbConfig) -> Any:
+        # caller holds the kill lock
+        key = (config.host, config.port)
+        killer = self._killers.get(key)
+        if killer is None or not killer.is_connected():
+            # imported here so command_budget() does not load the driver
+            import mysql.connector
+            settings = config.to_conn_dict()
+            settings['autocommit'] = True
+            killer = mysql.connector.connect(**settings)
+            self._killers[key] = killer
+        return killer
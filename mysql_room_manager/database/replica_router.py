@@ -0,0 +1,100 @@
+import logging
+import threading
+import time
+from itertools import count
+from typing import Any, Callable, Dict, List, Optional
+
+from ..config.db_config import DbConfig
+from .conn_pool import ConnPool, PooledConn
+
+
+class ReplicaRouter:
+    """Spreads read-only checkouts over replica pools.
+
+    Each checkout goes to the healthy replica with the fewest connections in
+    use, ties broken round-robin. A replica whose checkout fails is taken out
+    of rotation for ``retry_interval`` seconds; the first checkout after that
+    doubles as the health probe. ``checkout`` returns None when no replica
+    can serve, and the caller falls back to the primary.
+    """
+
+    def __init__(self, configs: List[DbConfig], pool_factory: Callable[[DbConfig], ConnPool],
+                 retry_interval: float = 5.0):
+        self.retry_interval = retry_interval
+        self.logger = logging.getLogger(__name__)
+        self._pool_factory = pool_factory
+        self._lock = threading.Lock()
+        self._turn = count()
+        self._endpoints = [
+            {
+                'name': f"{config.host}:{config.port}",
+                'config': config,
+                'pool': None,
+                'down_until': 0.0,
+                'failures': 0,
+                'checkouts': 0
+            }
+            for config in configs
+        ]
+
+    def checkout(self) -> Optional[PooledConn]:
+        for endpoint in self._candidates():
+            try:
+                conn = self._pool(endpoint).get_connection()
+            except Exception as e:
+                self._mark_down(endpoint, e)
+                continue
+
+            with self._lock:
+                endpoint['checkouts'] += 1
+                endpoint['down_until'] = 0.0
+            return conn
+        return None
+
+    def close_all(self) -> None:
+        with self._lock:
+            pools = [e['pool'] for e in self._endpoints if e['pool'] is not None]
+            for endpoint in self._endpoints:
+                endpoint['pool'] = None
+        for pool in pools:
+            pool.close_all()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            endpoints = list(self._endpoints)
+        return {
+            e['name']: {
+                'healthy': e['down_until'] <= now,
+                'checkouts': e['checkouts'],
+                'failures': e['failures'],
+                'pool': e['pool'].stats() if e['pool'] is not None else None
+            }
+            for e in endpoints
+        }
+
+    def _candidates(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            healthy = [e for e in self._endpoints if e['down_until'] <= now]
+        if not healthy:
+            return []
+
+        offset = next(self._turn) % len(healthy)
+        rotated = healthy[offset:] + healthy[:offset]
+        # sorted() is stable, so equal loads keep the round-robin order
+        return sorted(rotated, key=lambda e: e['pool'].in_use if e['pool'] is not None else 0)
+
+    def _pool(self, endpoint: Dict[str, Any]) -> ConnPool:
+        with self._lock:
+            if endpoint['pool'] is None:
+                endpoint['pool'] = self._pool_factory(endpoint['config'])
+            return endpoint['pool']
+
+    def _mark_down(self, endpoint: Dict[str, Any], error: Exception) -> None:
+        with self._lock:
+            endpoint['failures'] += 1
+            endpoint['down_until'] = time.monotonic() + self.retry_interval
+        self.logger.warning(
+            f"Replica {endpoint['name']} unavailable, retrying in {self.retry_interval:g}s: {error}"
+        )
@@ -0,0 +1,76 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import mysql.connector
+
+ER_LOCK_WAIT_TIMEOUT = 1205
+ER_LOCK_DEADLOCK = 1213
+
+# InnoDB rolls back the victim's whole transaction on a deadlock (and, with
+# innodb_rollback_on_timeout, on a lock wait timeout), so replaying the
+# transaction from the start is safe.
+RETRYABLE_ERRNOS = frozenset({ER_LOCK_WAIT_TIMEOUT, ER_LOCK_DEADLOCK})
+
+T = TypeVar('T')
+
+
+class RetryPolicy:
+    """Retries transient lock conflicts with jittered exponential backoff.
+
+    Attempt ``n`` (counting retries from 0) sleeps a random time between 0
+    and ``min(max_delay, base_delay * 2 ** n)`` ("full jitter"), so writers
+    that collided do not retry in lockstep and collide again.
+    """
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 0.05, max_delay: float = 1.0,
+                 rng: Optional[random.Random] = None):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.logger = logging.getLogger(__name__)
+        self._rng = rng or random.Random()
+
+    @staticmethod
+    def is_retryable(error: BaseException) -> bool:
+        """True for a deadlock or lock wait timeout anywhere in the exception chain."""
+        while error is not None:
+            if isinstance(error, mysql.connector.Error) and error.errno in RETRYABLE_ERRNOS:
+                return True
+            error = error.__cause__ or error.__context__
+        return False
+
+    def backoff(self, retry: int) -> float:
+        return self._rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** retry))
+
+    def run(self, attempt: Callable[[], T], description: str = "operation") -> T:
+        retry = 0
+        while True:
+            try:
+                return attempt()
+            except Exception as e:
+                if retry >= self.max_retries or not self.is_retryable(e):
+                    raise
+                delay = self.backoff(retry)
+                retry += 1
+                self.logger.warning(
+                    f"Retrying {description} ({retry}/{self.max_retries}) in {delay * 1000:.0f} ms: {e}"
+                )
+                time.sleep(delay)
+
+    async def run_async(self, attempt: Callable[[], Awaitable[T]], description: str = "operation") -> T:
+        retry = 0
+        while True:
+            try:
+                return await attempt()
+            except Exception as e:
+                if retry >= self.max_retries or not self.is_retryable(e):
+                    raise
+                delay = self.backoff(retry)
+                retry += 1
+                self.logger.warning(
+                    f"Retrying {description} ({retry}/{self.max_retries}) in {delay * 1000:.0f} ms: {e}"
+                )
+                await asyncio.sleep(delay)
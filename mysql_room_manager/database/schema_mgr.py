@@ -1,10 +1,10 @@
 import logging
-from typing import List
+from typing import List, Dict, Any
 from ..interfaces.db_interface import SchemaInterface
 from ..database.conn_manager import ConnManager
 from ..queries.schema_queries import *
 from ..config.db_config import DbConfig
-from ..exceptions.exceptions import SchemaError
+from ..exceptions.exceptions import SchemaError, ConfigError
 
 
 class SchemaMgr(SchemaInterface):  
@@ -52,7 +52,11 @@ class SchemaMgr(SchemaInterface):
                 
                 tables = [
                     ("rooms", CREATE_ROOMS_TABLE_QUERY),
-                    ("students", CREATE_STUDENTS_TABLE_QUERY)
+                    ("students", self._students_table_query()),
+                    ("room_age_sketches", CREATE_ROOM_AGE_SKETCHES_TABLE_QUERY),
+                    ("query_variant_choices", CREATE_QUERY_VARIANT_CHOICES_TABLE_QUERY),
+                    ("query_plan_baselines", CREATE_QUERY_PLAN_BASELINES_TABLE_QUERY),
+                    ("data_version", CREATE_DATA_VERSION_TABLE_QUERY)
                 ]
                 
                 for table_name, query in tables:
@@ -60,6 +64,7 @@ class SchemaMgr(SchemaInterface):
                     cursor.execute(query)
                     self.logger.info(f"Table {table_name} created successfully")
                 
+                self._ensure_sample_bucket(cursor)
                 conn.commit()
                 cursor.close()
             
@@ -70,6 +75,76 @@ class SchemaMgr(SchemaInterface):
             self.logger.error(error_msg)
             raise SchemaError(error_msg)
     
+    @property
+    def is_partitioned(self) -> bool:
+        return bool(self.conn_manager.config.students_partitioning)
+    
+    def _students_table_query(self) -> str:
+        config = self.conn_manager.config
+        if not config.students_partitioning:
+            return CREATE_STUDENTS_TABLE_QUERY
+        
+        scheme = STUDENTS_PARTITION_SCHEMES.get(config.students_partitioning)
+        if scheme is None:
+            supported = ', '.join(STUDENTS_PARTITION_SCHEMES)
+            raise ConfigError(
+                f"Unknown students partitioning '{config.students_partitioning}'. Supported: {supported}"
+            )
+        if config.students_partitions < 1:
+            raise ConfigError(f"Partition count must be positive, got: {config.students_partitions}")
+        
+        if scheme['default_width'] is None:
+            clause = scheme['clause'].format(partitions=config.students_partitions)
+        else:
+            width = config.students_partition_width or scheme['default_width']
+            start = scheme.get('range_start', 0)
+            bounds = [str(start + width * (i + 1)) for i in range(config.students_partitions - 1)]
+            bounds.append('MAXVALUE')
+            ranges = ', '.join(
+                PARTITION_RANGE_TEMPLATE.format(index=i, bound=bound) for i, bound in enumerate(bounds)
+            )
+            clause = scheme['clause'].format(ranges=ranges)
+        
+        self.logger.info(f"Students table partitioned: {clause}")
+        return CREATE_PARTITIONED_STUDENTS_TABLE_QUERY.format(
+            partition_column=scheme['column'],
+            partition_clause=clause
+        )
+    
+    def get_partition_info(self, table_name: str = 'students') -> List[Dict[str, Any]]:
+        try:
+            with self.conn_manager.get_conn() as conn:
+                cursor = conn.cursor(dictionary=True)
+                cursor.execute(TABLE_PARTITIONS_QUERY, (self.db_name, table_name))
+                results = cursor.fetchall()
+                cursor.close()
+                return results
+                
+        except Exception as e:
+            self.logger.error(f"Failed to get partition info: {e}")
+            return []
+    
+    def count_orphan_students(self) -> int:
+        """Students pointing at a missing room; what the FK used to prevent."""
+        try:
+            with self.conn_manager.get_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute(ORPHAN_STUDENTS_QUERY)
+                result = cursor.fetchone()
+                cursor.close()
+                return result[0] if result else 0
+                
+        except Exception as e:
+            self.logger.error(f"Failed to count orphan students: {e}")
+            return 0
+    
+    def _ensure_sample_bucket(self, cursor) -> None:
+        """Add the sampling column to students tables created before it existed."""
+        cursor.execute(COLUMN_EXISTS_QUERY, (self.db_name, 'students', 'sample_bucket'))
+        if cursor.fetchone()[0] == 0:
+            self.logger.info("Adding sample_bucket column to students")
+            cursor.execute(ADD_SAMPLE_BUCKET_COLUMN_QUERY)
+    
     def drop_tables(self) -> None:
         try:
             self.logger.info("Dropping database tables")
@@ -78,6 +153,10 @@ class SchemaMgr(SchemaInterface):
                 cursor = conn.cursor()
                 
                 drop_queries = [
+                    DROP_DATA_VERSION_TABLE_QUERY,
+                    DROP_QUERY_PLAN_BASELINES_TABLE_QUERY,
+                    DROP_QUERY_VARIANT_CHOICES_TABLE_QUERY,
+                    DROP_ROOM_AGE_SKETCHES_TABLE_QUERY,
                     DROP_STUDENTS_TABLE_QUERY,
                     DROP_ROOMS_TABLE_QUERY
                 ]
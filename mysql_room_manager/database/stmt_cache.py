@@ -0,0 +1,125 @@
+import logging
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+import mysql.connector
+
+from ..database.conn_manager import ConnManager
+
+ER_UNKNOWN_STMT_HANDLER = 1243
+
+
+class StmtCache:
+    """Cache of server-side prepared cursors, kept per physical connection.
+
+    Entries are keyed on the raw connection behind the pool wrapper, so a
+    statement is prepared once per pooled connection and reused on every
+    later checkout of that connection.
+    """
+    
+    def __init__(self, conn_manager: ConnManager):
+        self.conn_manager = conn_manager
+        self.max_size = conn_manager.config.stmt_cache_size
+        self.logger = logging.getLogger(__name__)
+        self._cursors: "weakref.WeakKeyDictionary[Any, OrderedDict]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+    
+    def fetch_one(self, query: str, params: Optional[tuple] = None,
+                  dictionary: bool = True, read_only: bool = False) -> Optional[Any]:
+        rows = self.fetch_all(query, params, dictionary, read_only)
+        return rows[0] if rows else None
+    
+    def fetch_all(self, query: str, params: Optional[tuple] = None,
+                  dictionary: bool = True, read_only: bool = False) -> List[Any]:
+        with self.conn_manager.get_conn(read_only) as conn:
+            if not self.enabled:
+                cursor = conn.cursor(dictionary=dictionary)
+                try:
+                    cursor.execute(query, params)
+                    return cursor.fetchall()
+                finally:
+                    cursor.close()
+            
+            try:
+                return self._execute_prepared(conn, query, params, dictionary)
+            except mysql.connector.Error as e:
+                if e.errno != ER_UNKNOWN_STMT_HANDLER:
+                    raise
+                # The server dropped the statement (session reset or
+                # reconnect); forget this connection's cache and re-prepare.
+                self.logger.debug("Prepared statement lost, re-preparing")
+                self._drop_conn(conn)
+                return self._execute_prepared(conn, query, params, dictionary)
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'connections': len(self._cursors),
+                'statements': sum(len(c) for c in self._cursors.values()),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0
+            }
+    
+    def clear(self) -> None:
+        with self._lock:
+            for cursors in self._cursors.values():
+                self._close_cursors(cursors.values())
+            self._cursors = weakref.WeakKeyDictionary()
+    
+    def _execute_prepared(self, conn: Any, query: str, params: Optional[tuple],
+                          dictionary: bool) -> List[Any]:
+        cursor = self._get_cursor(conn, query, dictionary)
+        cursor.execute(query, params or ())
+        return cursor.fetchall()
+    
+    def _get_cursor(self, conn: Any, query: str, dictionary: bool) -> Any:
+        raw_conn = getattr(conn, '_cnx', conn)
+        key = (query, dictionary)
+        
+        with self._lock:
+            cursors = self._cursors.get(raw_conn)
+            cursor = cursors.get(key) if cursors is not None else None
+            if cursor is not None:
+                cursors.move_to_end(key)
+                self.hits += 1
+                return cursor
+            self.misses += 1
+        
+        cursor = raw_conn.cursor(prepared=True, dictionary=dictionary)
+        evicted = None
+        with self._lock:
+            # looked up again: _drop_conn or clear() may have run meanwhile
+            cursors = self._cursors.get(raw_conn)
+            if cursors is None:
+                cursors = OrderedDict()
+                self._cursors[raw_conn] = cursors
+            cursors[key] = cursor
+            if len(cursors) > self.max_size:
+                _, evicted = cursors.popitem(last=False)
+        if evicted is not None:
+            self._close_cursors([evicted])
+        return cursor
+    
+    def _drop_conn(self, conn: Any) -> None:
+        raw_conn = getattr(conn, '_cnx', conn)
+        with self._lock:
+            cursors = self._cursors.pop(raw_conn, None)
+        if cursors:
+            self._close_cursors(cursors.values())
+    
+    def _close_cursors(self, cursors: Iterable[Any]) -> None:
+        for cursor in cursors:
+            try:
+                cursor.close()
+            except Exception as e:
+                self.logger.debug(f"Error closing prepared cursor: {e}")
@@ -1,42 +1,62 @@
 import logging
 from contextlib import contextmanager
+from typing import Any, Callable, Optional, TypeVar
 from ..interfaces.db_interface import TxInterface
+from ..config.app_config import APP_CONFIG
 from ..database.conn_manager import ConnManager
+from ..database.retry_policy import RetryPolicy
 from ..exceptions.exceptions import QueryError
 
+T = TypeVar('T')
+
 
 class TxManager(TxInterface):  
     
-    def __init__(self, conn_manager: ConnManager):
+    def __init__(self, conn_manager: ConnManager, retry_policy: Optional[RetryPolicy] = None):
         self.conn_manager = conn_manager  
+        self.retry_policy = retry_policy or RetryPolicy(
+            max_retries=APP_CONFIG.MAX_RETRIES,
+            base_delay=APP_CONFIG.RETRY_BASE_DELAY,
+            max_delay=APP_CONFIG.RETRY_DELAY
+        )
         self.logger = logging.getLogger(__name__)
         self._current_conn = None  
     
     @contextmanager
     def transaction(self):
-        connection = None
-        try:
-            connection = self.conn_manager.connect()
+        # get_conn registers the connection with the watchdog, so the
+        # command budget and cancel_all reach writes as well as reads.
+        with self.conn_manager.get_conn() as connection:
             self._current_conn = connection
-            
-            connection.start_transaction()
-            self.logger.debug("Transaction started")
-            
-            yield connection
-            
-            connection.commit()
-            self.logger.debug("Transaction committed")
-            
-        except Exception as e:
-            if connection and connection.is_connected():
-                connection.rollback()
-                self.logger.warning(f"Transaction rolled back due to error: {e}")
-            raise QueryError(f"Transaction failed: {e}")
-            
-        finally:
-            if connection and connection.is_connected():
-                connection.close()
-            self._current_conn = None
+            try:
+                connection.start_transaction()
+                self.logger.debug("Transaction started")
+                
+                yield connection
+                
+                connection.commit()
+                self.logger.debug("Transaction committed")
+                
+            except Exception as e:
+                if connection.is_connected():
+                    connection.rollback()
+                    self.logger.warning(f"Transaction rolled back due to error: {e}")
+                raise QueryError(f"Transaction failed: {e}") from e
+                
+            finally:
+                self._current_conn = None
+    
+    def run(self, work: Callable[[Any], T], description: str = "transaction") -> T:
+        """Run ``work(connection)`` in a transaction, replaying it on deadlocks and lock wait timeouts.
+
+        ``work`` may run more than once, so it must not have side effects
+        outside the transaction.
+        """
+        def attempt() -> T:
+            with self.transaction() as connection:
+                return work(connection)
+        
+        return self.retry_policy.run(attempt, description)
     
     def begin(self) -> None:
         if self._current_conn:
@@ -0,0 +1,99 @@
+import logging
+import time
+from typing import List, Dict, Any, Callable, Optional
+from ..database.conn_manager import ConnManager
+from ..queries.opt_queries import *
+from ..exceptions.exceptions import QueryError
+
+_COUNTERS = (
+    'exec_count', 'sum_timer_wait', 'rows_examined', 'rows_sent',
+    'tmp_tables', 'tmp_disk_tables', 'sort_rows', 'sort_merge_passes', 'no_index_used'
+)
+
+RANKINGS = {
+    'total_ms': 'Total Latency',
+    'avg_ms': 'Average Latency',
+    'examined_per_sent': 'Rows Examined per Row Sent',
+    'tmp_tables': 'Temporary Tables',
+    'sort_rows': 'Filesort Rows'
+}
+
+
+class WorkloadProfiler:
+    """Diffs two snapshots of performance_schema statement digests.
+
+    The digest table is cumulative since server start (or the last
+    TRUNCATE), so the cost of a window is ``after - before`` per digest.
+    A digest whose counters went backwards was evicted or reset in between;
+    its ``after`` values are taken as the whole window.
+    """
+
+    def __init__(self, conn_manager: ConnManager):
+        self.conn_manager = conn_manager
+        self.logger = logging.getLogger(__name__)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            return {
+                row['digest']: row
+                for row in self.conn_manager.iter_query(
+                    DIGEST_SNAPSHOT_QUERY, (self.conn_manager.config.database,)
+                )
+                if 'performance_schema' not in (row['digest_text'] or '')
+            }
+
+        except Exception as e:
+            self.logger.error(f"Failed to snapshot statement digests: {e}")
+            raise QueryError(f"Failed to snapshot statement digests: {e}")
+
+    def profile(self, action: Callable[[], Any]) -> Dict[str, Any]:
+        before = self.snapshot()
+        started = time.perf_counter()
+        try:
+            action()
+        finally:
+            elapsed = time.perf_counter() - started
+            after = self.snapshot()
+
+        return {'elapsed_sec': round(elapsed, 3), 'digests': self.diff(before, after)}
+
+    def profile_window(self, seconds: float) -> Dict[str, Any]:
+        self.logger.info(f"Profiling workload for {seconds:g} s")
+        return self.profile(lambda: time.sleep(seconds))
+
+    @staticmethod
+    def diff(before: Dict[str, Dict[str, Any]], after: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        digests = []
+        for digest, row in after.items():
+            previous = before.get(digest)
+            if previous is None or int(row['exec_count']) < int(previous['exec_count']):
+                previous = {}
+
+            delta = {key: int(row[key] or 0) - int(previous.get(key) or 0) for key in _COUNTERS}
+            if delta['exec_count'] <= 0:
+                continue
+
+            total_ms = delta['sum_timer_wait'] / PICOSECONDS_PER_MS
+            digests.append({
+                'digest': digest,
+                'digest_text': row['digest_text'],
+                'exec_count': delta['exec_count'],
+                'total_ms': round(total_ms, 3),
+                'avg_ms': round(total_ms / delta['exec_count'], 3),
+                'rows_examined': delta['rows_examined'],
+                'rows_sent': delta['rows_sent'],
+                'examined_per_sent': round(delta['rows_examined'] / max(delta['rows_sent'], 1), 1),
+                'tmp_tables': delta['tmp_tables'],
+                'tmp_disk_tables': delta['tmp_disk_tables'],
+                'sort_rows': delta['sort_rows'],
+                'sort_merge_passes': delta['sort_merge_passes'],
+                'no_index_used': delta['no_index_used']
+            })
+
+        digests.sort(key=lambda d: d['total_ms'], reverse=True)
+        return digests
+
+    @staticmethod
+    def rank(digests: List[Dict[str, Any]], key: str, limit: Optional[int] = 10) -> List[Dict[str, Any]]:
+        ranked = sorted((d for d in digests if d[key]), key=lambda d: d[key], reverse=True)
+        return ranked[:limit] if limit else ranked
@@ -1,9 +1,11 @@
 from .exceptions import (
     StudentRoomError,
     DbConnError,
+    PoolTimeoutError,
     SchemaError,
     ImportError,
     QueryError,
+    QueryTimeoutError,
     ValidationError,
     ConfigError,
     UnsupportedFormatError
@@ -12,9 +14,11 @@ from .exceptions import (
 __all__ = [
     'StudentRoomError',
     'DbConnError', 
+    'PoolTimeoutError',
     'SchemaError',
     'ImportError',
     'QueryError',
+    'QueryTimeoutError',
     'ValidationError',
     'ConfigError',
     'UnsupportedFormatError'
@@ -10,6 +10,10 @@ class DbConnError(StudentRoomError):
         super().__init__(message)
 
 
+class PoolTimeoutError(DbConnError):
+    pass
+
+
 class SchemaError(StudentRoomError): 
     pass
 
@@ -30,6 +34,10 @@ class QueryError(StudentRoomError):
         super().__init__(message)
 
 
+class QueryTimeoutError(QueryError):
+    pass
+
+
 class ValidationError(StudentRoomError):
     pass
 
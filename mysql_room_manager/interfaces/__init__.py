@@ -1,5 +1,6 @@
 from .db_interface import (
     DbConnInterface,
+    AsyncDbConnInterface,
     SchemaInterface, 
     TxInterface
 )
@@ -13,6 +14,7 @@ from .executor_interface import ExecutorInterface
 
 __all__ = [
     'DbConnInterface',
+    'AsyncDbConnInterface',
     'SchemaInterface',
     'TxInterface',
     'StudentRepoInterface', 
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional, Tuple
-from contextlib import contextmanager
+from contextlib import contextmanager, asynccontextmanager
 
 
 class DbConnInterface(ABC): 
@@ -23,6 +23,26 @@ class DbConnInterface(ABC):
         pass
 
 
+class AsyncDbConnInterface(ABC): 
+    
+    @abstractmethod
+    async def connect(self) -> Any:
+        pass
+    
+    @abstractmethod
+    async def disconnect(self) -> None:
+        pass
+    
+    @abstractmethod
+    def is_connected(self) -> bool:
+        pass
+    
+    @abstractmethod
+    @asynccontextmanager
+    async def get_conn(self):
+        yield
+
+
 class SchemaInterface(ABC): 
     
     @abstractmethod
@@ -1,6 +1,6 @@
 """Repository interface definitions."""
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, Iterable, Tuple
 
 
 class StudentRepoInterface(ABC):
@@ -16,6 +16,23 @@ class StudentRepoInterface(ABC):
     def get_students_by_room(self, room_id: int) -> List[Dict[str, Any]]:
         pass
     
+    @abstractmethod
+    def iter_students_by_room(self, room_id: int) -> Iterator[Dict[str, Any]]:
+        pass
+    
+    @abstractmethod
+    def get_students_by_ids(self, student_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        pass
+    
+    @abstractmethod
+    def get_students_by_rooms(self, room_ids: Iterable[int]) -> Dict[int, List[Dict[str, Any]]]:
+        pass
+    
+    @abstractmethod
+    def query(self, filters: Optional[Any] = None,
+              after: Optional[Tuple[int, int]] = None, limit: int = 100) -> Any:
+        pass
+    
     @abstractmethod
     def count_students(self) -> int:
         pass
@@ -30,6 +47,10 @@ class RoomRepoInterface(ABC):
     def get_room_by_id(self, room_id: int) -> Optional[Dict[str, Any]]:
         pass
     
+    @abstractmethod
+    def get_rooms_by_ids(self, room_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        pass
+    
     @abstractmethod
     def count_rooms(self) -> int:
         pass
@@ -52,3 +73,19 @@ class AnalyticsRepoInterface(ABC):
     @abstractmethod
     def get_mixed_gender_rooms(self) -> List[Dict[str, Any]]:
         pass
+    
+    @abstractmethod
+    def iter_rooms_with_student_count(self) -> Iterator[Dict[str, Any]]:
+        pass
+    
+    @abstractmethod
+    def iter_top_rooms_by_avg_age(self, limit: int = 5) -> Iterator[Dict[str, Any]]:
+        pass
+    
+    @abstractmethod
+    def iter_top_rooms_by_age_diff(self, limit: int = 5) -> Iterator[Dict[str, Any]]:
+        pass
+    
+    @abstractmethod
+    def iter_mixed_gender_rooms(self) -> Iterator[Dict[str, Any]]:
+        pass
@@ -1,17 +1,24 @@
 from .student import Student
 from .room import Room
 from .result import (
+    ResultRow,
     RoomStudentCount,
     RoomAvgAge, 
     RoomAgeDiff,
     MixedGenderRoom
 )
+from .query import StudentFilter, StudentPage
+from .sketch import AgeHistogram
 
 __all__ = [
     'Student',
     'Room',
+    'ResultRow',
     'RoomStudentCount',
     'RoomAvgAge',
     'RoomAgeDiff', 
-    'MixedGenderRoom'
+    'MixedGenderRoom',
+    'StudentFilter',
+    'StudentPage',
+    'AgeHistogram'
 ]
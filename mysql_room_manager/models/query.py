@@ -0,0 +1,57 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from ..utils.validation import validate_positive_integer
+from ..exceptions.exceptions import ValidationError
+
+
+@dataclass
+class StudentFilter:
+    room_id: Optional[int] = None
+    sex: Optional[str] = None
+    min_age: Optional[int] = None
+    max_age: Optional[int] = None
+    
+    def __post_init__(self):
+        if self.room_id is not None:
+            validate_positive_integer(self.room_id, "Room ID")
+        
+        if self.sex is not None and self.sex not in ('M', 'F'):
+            raise ValidationError(f"Sex must be 'M' or 'F', got: {self.sex}")
+        
+        if self.min_age is not None:
+            validate_positive_integer(self.min_age, "Minimum age")
+        if self.max_age is not None:
+            validate_positive_integer(self.max_age, "Maximum age")
+        if self.min_age is not None and self.max_age is not None and self.min_age > self.max_age:
+            raise ValidationError(f"Minimum age {self.min_age} is greater than maximum age {self.max_age}")
+    
+    @property
+    def has_age_range(self) -> bool:
+        return self.min_age is not None or self.max_age is not None
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'StudentFilter':
+        return cls(
+            room_id=data.get('room_id'),
+            sex=data.get('sex'),
+            min_age=data.get('min_age'),
+            max_age=data.get('max_age')
+        )
+
+
+@dataclass
+class StudentPage:
+    students: List[Dict[str, Any]] = field(default_factory=list)
+    next_cursor: Optional[Tuple[int, int]] = None
+    index_name: str = ""
+    
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'students': self.students,
+            'next_cursor': list(self.next_cursor) if self.next_cursor else None,
+            'index_name': self.index_name
+        }
@@ -1,71 +1,54 @@
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from collections import namedtuple
+from operator import itemgetter
+from typing import Any, Callable, Dict, Sequence
 
 
-@dataclass
-class RoomStudentCount:
-    room_id: int
-    room_name: str
-    student_count: int
-    
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            'room_id': self.room_id,
-            'room_name': self.room_name,
-            'student_count': self.student_count
-        }
+class ResultRow:
+    """Mixin for analytics result rows: slotted namedtuples built straight from tuple cursors.
 
+    ``row_factory`` resolves the column positions once per result set, so
+    each row costs a single tuple allocation; ``to_dict`` is only paid for
+    rows that are actually serialized.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def row_factory(cls, column_names: Sequence[str]) -> Callable[[tuple], 'ResultRow']:
+        missing = [field for field in cls._fields if field not in column_names]
+        if missing:
+            raise ValueError(f"{cls.__name__} needs columns missing from the result: {', '.join(missing)}")
+
+        positions = [list(column_names).index(field) for field in cls._fields]
+        if positions == list(range(len(column_names))):
+            return cls._make
+        getter = itemgetter(*positions)
+        return lambda row: cls._make(getter(row))
 
-@dataclass
-class RoomAvgAge:
-    room_id: int
-    room_name: str
-    average_age: float
-    student_count: int
-    
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            'room_id': self.room_id,
-            'room_name': self.room_name,
-            'average_age': round(self.average_age, 2),
-            'student_count': self.student_count
-        }
+        return dict(zip(self._fields, self))
+
 
+class RoomStudentCount(ResultRow, namedtuple('RoomStudentCount', 'room_id room_name student_count')):
+    __slots__ = ()
+
+
+class RoomAvgAge(ResultRow, namedtuple('RoomAvgAge', 'room_id room_name average_age student_count')):
+    __slots__ = ()
 
-@dataclass
-class RoomAgeDiff:
-    room_id: int
-    room_name: str
-    age_difference: int
-    min_age: int
-    max_age: int
-    student_count: int
-    
     def to_dict(self) -> Dict[str, Any]:
         return {
             'room_id': self.room_id,
             'room_name': self.room_name,
-            'age_difference': self.age_difference,
-            'min_age': self.min_age,
-            'max_age': self.max_age,
+            'average_age': round(float(self.average_age), 2),
             'student_count': self.student_count
         }
 
 
-@dataclass
-class MixedGenderRoom:
-    room_id: int
-    room_name: str
-    male_count: int
-    female_count: int
-    total_students: int
-    
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            'room_id': self.room_id,
-            'room_name': self.room_name,
-            'male_count': self.male_count,
-            'female_count': self.female_count,
-            'total_students': self.total_students
-        }
+class RoomAgeDiff(ResultRow, namedtuple(
+        'RoomAgeDiff', 'room_id room_name age_difference min_age max_age student_count')):
+    __slots__ = ()
+
 
+class MixedGenderRoom(ResultRow, namedtuple(
+        'MixedGenderRoom', 'room_id room_name male_count female_count total_students')):
+    __slots__ = ()
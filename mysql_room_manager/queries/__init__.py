@@ -1,6 +1,12 @@
 from .schema_queries import *
 from .analytics_queries import *
 from .opt_queries import *
+from .sketch_queries import *
+from .sampling_queries import *
+from .variant_queries import *
+from .baseline_queries import *
+from .entity_queries import *
+from .data_version_queries import *
 
 __all__ = [
     'CREATE_DATABASE_QUERY',
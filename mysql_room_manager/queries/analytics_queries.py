@@ -109,4 +109,117 @@ PERFORMANCE_TEST_QUERIES = {
     GROUP BY r.id, r.name
     ORDER BY total_students DESC;
     """
-}
\ No newline at end of file
+}
+
+ROOMS_WITH_STUDENT_COUNT_PLAIN_JOIN_QUERY = """
+SELECT 
+    r.id as room_id,
+    r.name as room_name,
+    COUNT(s.id) as student_count
+FROM rooms r
+LEFT JOIN students s ON s.room_id = r.id
+GROUP BY r.id, r.name
+ORDER BY student_count DESC, r.id;
+"""
+
+ROOMS_WITH_STUDENT_COUNT_COVERING_QUERY = """
+SELECT 
+    r.id as room_id,
+    r.name as room_name,
+    (SELECT COUNT(*) FROM students s WHERE s.room_id = r.id) as student_count
+FROM rooms r
+ORDER BY student_count DESC, r.id;
+"""
+
+ROOMS_WITH_STUDENT_COUNT_WINDOW_QUERY = """
+SELECT DISTINCT
+    r.id as room_id,
+    r.name as room_name,
+    COUNT(s.id) OVER (PARTITION BY r.id) as student_count
+FROM rooms r
+LEFT JOIN students s ON s.room_id = r.id
+ORDER BY student_count DESC, r.id;
+"""
+
+TOP_ROOMS_BY_AVG_AGE_DERIVED_QUERY = """
+SELECT 
+    r.id as room_id,
+    r.name as room_name,
+    room_ages.average_age,
+    room_ages.student_count
+FROM (
+    SELECT 
+        room_id,
+        AVG(age_years) as average_age,
+        COUNT(*) as student_count
+    FROM students
+    WHERE room_id IS NOT NULL
+    GROUP BY room_id
+) room_ages
+INNER JOIN rooms r ON r.id = room_ages.room_id
+ORDER BY room_ages.average_age ASC, room_ages.student_count DESC
+LIMIT %s;
+"""
+
+TOP_ROOMS_BY_AGE_DIFFERENCE_DERIVED_QUERY = """
+SELECT 
+    r.id as room_id,
+    r.name as room_name,
+    room_ages.age_difference,
+    room_ages.min_age,
+    room_ages.max_age,
+    room_ages.student_count
+FROM (
+    SELECT 
+        room_id,
+        (MAX(age_years) - MIN(age_years)) as age_difference,
+        MIN(age_years) as min_age,
+        MAX(age_years) as max_age,
+        COUNT(*) as student_count
+    FROM students
+    WHERE room_id IS NOT NULL
+    GROUP BY room_id
+    HAVING student_count > 1
+) room_ages
+INNER JOIN rooms r ON r.id = room_ages.room_id
+ORDER BY room_ages.age_difference DESC, room_ages.student_count DESC
+LIMIT %s;
+"""
+
+MIXED_GENDER_ROOMS_PLAIN_JOIN_QUERY = """
+SELECT 
+    r.id as room_id,
+    r.name as room_name,
+    SUM(CASE WHEN s.sex = 'M' THEN 1 ELSE 0 END) as male_count,
+    SUM(CASE WHEN s.sex = 'F' THEN 1 ELSE 0 END) as female_count,
+    COUNT(*) as total_students
+FROM rooms r
+INNER JOIN students s ON s.room_id = r.id
+GROUP BY r.id, r.name
+HAVING male_count > 0 AND female_count > 0
+ORDER BY total_students DESC, r.id;
+"""
+
+# Equivalent formulations of each analytics query. Every variant returns the
+# same columns in the same order; the first entry is the default until
+# `optimize --calibrate` stores a measured winner.
+ANALYTICS_QUERY_VARIANTS = {
+    'rooms_with_student_count': {
+        'derived_join': ROOMS_WITH_STUDENT_COUNT_QUERY,
+        'plain_join': ROOMS_WITH_STUDENT_COUNT_PLAIN_JOIN_QUERY,
+        'covering_index': ROOMS_WITH_STUDENT_COUNT_COVERING_QUERY,
+        'window': ROOMS_WITH_STUDENT_COUNT_WINDOW_QUERY
+    },
+    'top_rooms_by_avg_age': {
+        'plain_join': TOP_ROOMS_BY_AVG_AGE_QUERY,
+        'derived_table': TOP_ROOMS_BY_AVG_AGE_DERIVED_QUERY
+    },
+    'top_rooms_by_age_diff': {
+        'plain_join': TOP_ROOMS_BY_AGE_DIFFERENCE_QUERY,
+        'derived_table': TOP_ROOMS_BY_AGE_DIFFERENCE_DERIVED_QUERY
+    },
+    'mixed_gender_rooms': {
+        'derived_table': MIXED_GENDER_ROOMS_QUERY,
+        'plain_join': MIXED_GENDER_ROOMS_PLAIN_JOIN_QUERY
+    }
+}
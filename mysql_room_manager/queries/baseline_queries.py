@@ -0,0 +1,14 @@
+SELECT_PLAN_BASELINES_QUERY = """
+SELECT query_name, fingerprint, plan_text, actual_ms, actual_rows, captured_at
+FROM query_plan_baselines;
+"""
+
+UPSERT_PLAN_BASELINE_QUERY = """
+INSERT INTO query_plan_baselines (query_name, fingerprint, plan_text, actual_ms, actual_rows)
+VALUES (%s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE
+    fingerprint = VALUES(fingerprint),
+    plan_text = VALUES(plan_text),
+    actual_ms = VALUES(actual_ms),
+    actual_rows = VALUES(actual_rows);
+"""
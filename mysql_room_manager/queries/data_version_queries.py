@@ -0,0 +1,10 @@
+# data_version holds a single row; its counter goes up after every import.
+DATA_VERSION_ROW_ID = 1
+
+SELECT_DATA_VERSION_QUERY = f"SELECT version FROM data_version WHERE id = {DATA_VERSION_ROW_ID};"
+
+BUMP_DATA_VERSION_QUERY = f"""
+INSERT INTO data_version (id, version)
+VALUES ({DATA_VERSION_ROW_ID}, 1)
+ON DUPLICATE KEY UPDATE version = version + 1;
+"""
@@ -0,0 +1,38 @@
+STUDENT_COLUMNS = "id, name, birthday, sex, room_id, age_years"
+
+UPSERT_ROOMS_QUERY = """
+INSERT INTO rooms (id, name)
+VALUES (%s, %s)
+ON DUPLICATE KEY UPDATE name = VALUES(name)
+"""
+
+UPSERT_STUDENTS_QUERY = """
+INSERT INTO students (id, name, birthday, sex, room_id)
+VALUES (%s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE
+    name = VALUES(name),
+    birthday = VALUES(birthday),
+    sex = VALUES(sex),
+    room_id = VALUES(room_id)
+"""
+
+SELECT_ROOM_BY_ID_QUERY = "SELECT * FROM rooms WHERE id = %s"
+
+# {placeholders} is expanded by ConnManager.iter_in_chunks
+SELECT_ROOMS_BY_IDS_QUERY = "SELECT * FROM rooms WHERE id IN ({placeholders})"
+
+COUNT_ROOMS_QUERY = "SELECT COUNT(*) FROM rooms"
+
+SELECT_STUDENT_BY_ID_QUERY = f"SELECT {STUDENT_COLUMNS} FROM students WHERE id = %s"
+
+SELECT_STUDENTS_BY_IDS_QUERY = f"SELECT {STUDENT_COLUMNS} FROM students WHERE id IN ({{placeholders}})"
+
+SELECT_STUDENTS_BY_ROOM_QUERY = f"SELECT {STUDENT_COLUMNS} FROM students WHERE room_id = %s"
+
+SELECT_STUDENTS_BY_ROOMS_QUERY = f"SELECT {STUDENT_COLUMNS} FROM students WHERE room_id IN ({{placeholders}})"
+
+COUNT_STUDENTS_QUERY = "SELECT COUNT(*) FROM students"
+
+LOCK_ROOMS_BY_IDS_QUERY = "SELECT id FROM rooms WHERE id IN ({placeholders}) LOCK IN SHARE MODE"
+
+DELETE_STUDENTS_BY_IDS_QUERY = "DELETE FROM students WHERE id IN ({placeholders})"
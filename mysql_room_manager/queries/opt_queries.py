@@ -26,10 +26,12 @@ ORDER BY table_name, index_name;
 
 EXPLAIN_QUERY_TEMPLATE = "EXPLAIN FORMAT=JSON {query}"
 
+EXPLAIN_ANALYZE_QUERY_TEMPLATE = "EXPLAIN ANALYZE {query}"
+
 SLOW_QUERY_ANALYSIS = """
 SELECT 
-    sql_text,
-    exec_count,
+    digest_text AS sql_text,
+    count_star AS exec_count,
     avg_timer_wait/1000000000000 as avg_exec_time_sec,
     max_timer_wait/1000000000000 as max_exec_time_sec,
     sum_timer_wait/1000000000000 as total_exec_time_sec
@@ -39,3 +41,88 @@ ORDER BY avg_timer_wait DESC
 LIMIT 10;
 """
 
+
+INDEX_COLUMNS_QUERY = """
+SELECT 
+    table_name AS table_name,
+    index_name AS index_name,
+    column_name AS column_name,
+    non_unique AS non_unique
+FROM information_schema.statistics 
+WHERE table_schema = %s
+ORDER BY table_name, index_name, seq_in_index;
+"""
+
+TABLE_COLUMNS_QUERY = """
+SELECT 
+    table_name AS table_name,
+    column_name AS column_name,
+    generation_expression AS generation_expression
+FROM information_schema.columns 
+WHERE table_schema = %s
+ORDER BY table_name, ordinal_position;
+"""
+
+SHADOW_TABLE_PREFIX = 'shadow_'
+
+CREATE_SHADOW_TABLE_TEMPLATE = "CREATE TABLE {shadow} LIKE {table}"
+
+COPY_SHADOW_TABLE_TEMPLATE = "INSERT INTO {shadow} ({columns}) SELECT {columns} FROM {table}"
+
+SAMPLED_COPY_SHADOW_TABLE_TEMPLATE = COPY_SHADOW_TABLE_TEMPLATE + " WHERE sample_bucket < %s"
+
+DROP_SHADOW_TABLE_TEMPLATE = "DROP TABLE IF EXISTS {shadow}"
+
+CREATE_INDEX_TEMPLATE = "CREATE INDEX {index_name} ON {table} ({columns})"
+
+DROP_INDEX_TEMPLATE = "DROP INDEX {index_name} ON {table}"
+
+ANALYZE_TABLE_TEMPLATE = "ANALYZE TABLE {table}"
+
+INDEX_IO_QUERY = """
+SELECT 
+    object_name AS table_name,
+    index_name AS index_name,
+    count_read AS read_count,
+    count_fetch AS fetches
+FROM performance_schema.table_io_waits_summary_by_index_usage
+WHERE object_schema = %s AND index_name IS NOT NULL;
+"""
+
+INDEX_SIZE_QUERY = """
+SELECT 
+    table_name AS table_name,
+    index_name AS index_name,
+    stat_value * @@innodb_page_size AS size_bytes
+FROM mysql.innodb_index_stats
+WHERE database_name = %s AND stat_name = 'size';
+"""
+
+TABLE_ROWS_QUERY = """
+SELECT table_name AS table_name, table_rows AS table_rows
+FROM information_schema.tables
+WHERE table_schema = %s;
+"""
+
+SERVER_UPTIME_QUERY = "SHOW GLOBAL STATUS LIKE 'Uptime'"
+
+SERVER_VERSION_QUERY = "SELECT VERSION()"
+
+DIGEST_SNAPSHOT_QUERY = """
+SELECT 
+    digest AS digest,
+    digest_text AS digest_text,
+    count_star AS exec_count,
+    sum_timer_wait AS sum_timer_wait,
+    sum_rows_examined AS rows_examined,
+    sum_rows_sent AS rows_sent,
+    sum_created_tmp_tables AS tmp_tables,
+    sum_created_tmp_disk_tables AS tmp_disk_tables,
+    sum_sort_rows AS sort_rows,
+    sum_sort_merge_passes AS sort_merge_passes,
+    sum_no_index_used AS no_index_used
+FROM performance_schema.events_statements_summary_by_digest
+WHERE schema_name = %s AND digest IS NOT NULL;
+"""
+
+PICOSECONDS_PER_MS = 1000000000
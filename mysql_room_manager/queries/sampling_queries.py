@@ -0,0 +1,26 @@
+SAMPLE_BUCKETS = 10000
+
+# Deterministic hash sample: students.sample_bucket is CRC32(id) % 10000,
+# indexed so a sample only reads its own rows.
+SAMPLED_STUDENTS_TEMPLATE = """(
+    SELECT id, name, birthday, sex, room_id, age_years
+    FROM students
+    WHERE sample_bucket < {threshold}
+)"""
+
+# TOP_ROOMS_BY_AVG_AGE_QUERY plus the spread the interval on the mean needs;
+# `students` is swapped for the sample like in the other analytics queries.
+SAMPLED_TOP_ROOMS_BY_AVG_AGE_QUERY = """
+SELECT 
+    r.id as room_id,
+    r.name as room_name,
+    AVG(s.age_years) as average_age,
+    STDDEV_SAMP(s.age_years) as age_stddev,
+    COUNT(s.id) as student_count
+FROM rooms r
+INNER JOIN students s ON r.id = s.room_id
+GROUP BY r.id, r.name
+HAVING student_count > 0
+ORDER BY average_age ASC, student_count DESC
+LIMIT %s;
+"""
@@ -24,6 +24,7 @@ CREATE TABLE IF NOT EXISTS students (
     age_years INT GENERATED ALWAYS AS (
         TIMESTAMPDIFF(YEAR, birthday, CURDATE())
     ) STORED,
+    sample_bucket SMALLINT GENERATED ALWAYS AS (CRC32(id) % 10000) STORED,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     
@@ -34,6 +35,7 @@ CREATE TABLE IF NOT EXISTS students (
     INDEX idx_students_age (age_years),
     INDEX idx_students_room_sex (room_id, sex),
     INDEX idx_students_room_age (room_id, age_years),
+    INDEX idx_students_sample (sample_bucket, room_id, sex, age_years),
     
     CONSTRAINT fk_students_room 
         FOREIGN KEY (room_id) REFERENCES rooms(id)
@@ -42,6 +44,116 @@ CREATE TABLE IF NOT EXISTS students (
 ) ENGINE=InnoDB CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
 """
 
+# Partitioned tables cannot carry foreign keys, and every unique key must
+# contain the partitioning columns, so the primary key is widened with
+# {partition_column} and room integrity is enforced by StudentRepo.
+CREATE_PARTITIONED_STUDENTS_TABLE_QUERY = """
+CREATE TABLE IF NOT EXISTS students (
+    id INT NOT NULL,
+    name VARCHAR(255) NOT NULL,
+    birthday DATE NOT NULL,
+    sex ENUM('M', 'F') NOT NULL,
+    room_id INT NULL,
+    room_key INT GENERATED ALWAYS AS (COALESCE(room_id, 0)) STORED NOT NULL,
+    age_years INT GENERATED ALWAYS AS (
+        TIMESTAMPDIFF(YEAR, birthday, CURDATE())
+    ) STORED,
+    sample_bucket SMALLINT GENERATED ALWAYS AS (CRC32(id) % 10000) STORED,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    
+    PRIMARY KEY (id, {partition_column}),
+    INDEX idx_students_id (id),
+    INDEX idx_students_name (name),
+    INDEX idx_students_birthday (birthday),
+    INDEX idx_students_sex (sex),
+    INDEX idx_students_room_id (room_id),
+    INDEX idx_students_age (age_years),
+    INDEX idx_students_room_sex (room_id, sex),
+    INDEX idx_students_room_age (room_id, age_years),
+    INDEX idx_students_sample (sample_bucket, room_id, sex, age_years)
+) ENGINE=InnoDB CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci
+{partition_clause};
+"""
+
+STUDENTS_PARTITION_SCHEMES = {
+    'hash_room': {
+        'column': 'room_key',
+        'clause': "PARTITION BY HASH (room_key) PARTITIONS {partitions}",
+        'default_width': None
+    },
+    'range_room': {
+        'column': 'room_key',
+        'clause': "PARTITION BY RANGE (room_key) ({ranges})",
+        'default_width': 1000
+    },
+    'range_birthday': {
+        'column': 'birthday',
+        'clause': "PARTITION BY RANGE (YEAR(birthday)) ({ranges})",
+        'default_width': 10,
+        'range_start': 1900
+    }
+}
+
+PARTITION_RANGE_TEMPLATE = "PARTITION p{index} VALUES LESS THAN ({bound})"
+
+TABLE_PARTITIONS_QUERY = """
+SELECT partition_name AS partition_name, partition_method AS partition_method,
+       partition_expression AS partition_expression, table_rows AS table_rows
+FROM information_schema.partitions
+WHERE table_schema = %s AND table_name = %s AND partition_name IS NOT NULL
+ORDER BY partition_ordinal_position;
+"""
+
+ORPHAN_STUDENTS_QUERY = """
+SELECT COUNT(*) as orphan_count
+FROM students s
+LEFT JOIN rooms r ON r.id = s.room_id
+WHERE s.room_id IS NOT NULL AND r.id IS NULL;
+"""
+
+CREATE_ROOM_AGE_SKETCHES_TABLE_QUERY = """
+CREATE TABLE IF NOT EXISTS room_age_sketches (
+    room_id INT PRIMARY KEY,
+    student_count INT NOT NULL,
+    age_counts JSON NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+"""
+
+CREATE_QUERY_VARIANT_CHOICES_TABLE_QUERY = """
+CREATE TABLE IF NOT EXISTS query_variant_choices (
+    query_name VARCHAR(64) PRIMARY KEY,
+    variant VARCHAR(64) NOT NULL,
+    median_ms DOUBLE NOT NULL,
+    student_rows BIGINT NOT NULL,
+    calibrated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+"""
+
+CREATE_QUERY_PLAN_BASELINES_TABLE_QUERY = """
+CREATE TABLE IF NOT EXISTS query_plan_baselines (
+    query_name VARCHAR(64) PRIMARY KEY,
+    fingerprint CHAR(40) NOT NULL,
+    plan_text TEXT NOT NULL,
+    actual_ms DOUBLE NOT NULL,
+    actual_rows BIGINT NOT NULL,
+    captured_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+"""
+
+CREATE_DATA_VERSION_TABLE_QUERY = """
+CREATE TABLE IF NOT EXISTS data_version (
+    id TINYINT UNSIGNED PRIMARY KEY,
+    version BIGINT UNSIGNED NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+"""
+
+DROP_DATA_VERSION_TABLE_QUERY = "DROP TABLE IF EXISTS data_version;"
+DROP_QUERY_PLAN_BASELINES_TABLE_QUERY = "DROP TABLE IF EXISTS query_plan_baselines;"
+DROP_QUERY_VARIANT_CHOICES_TABLE_QUERY = "DROP TABLE IF EXISTS query_variant_choices;"
+DROP_ROOM_AGE_SKETCHES_TABLE_QUERY = "DROP TABLE IF EXISTS room_age_sketches;"
 DROP_STUDENTS_TABLE_QUERY = "DROP TABLE IF EXISTS students;"
 DROP_ROOMS_TABLE_QUERY = "DROP TABLE IF EXISTS rooms;"
 
@@ -51,6 +163,18 @@ FROM information_schema.tables
 WHERE table_schema = %s AND table_name = %s;
 """
 
+COLUMN_EXISTS_QUERY = """
+SELECT COUNT(*) as column_count
+FROM information_schema.columns
+WHERE table_schema = %s AND table_name = %s AND column_name = %s;
+"""
+
+ADD_SAMPLE_BUCKET_COLUMN_QUERY = """
+ALTER TABLE students
+    ADD COLUMN sample_bucket SMALLINT GENERATED ALWAYS AS (CRC32(id) % 10000) STORED,
+    ADD INDEX idx_students_sample (sample_bucket, room_id, sex, age_years);
+"""
+
 OPTIMIZATION_INDEXES = [
     """
     CREATE INDEX IF NOT EXISTS idx_students_composite_analytics 
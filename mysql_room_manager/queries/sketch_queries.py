@@ -0,0 +1,28 @@
+UNASSIGNED_ROOM_ID = -1
+
+AGE_SKETCH_SOURCE_QUERY = f"""
+SELECT 
+    COALESCE(room_id, {UNASSIGNED_ROOM_ID}) as room_id,
+    age_years,
+    COUNT(*) as student_count
+FROM students
+GROUP BY room_id, age_years;
+"""
+
+CLEAR_AGE_SKETCHES_QUERY = "DELETE FROM room_age_sketches;"
+
+INSERT_AGE_SKETCH_QUERY = """
+INSERT INTO room_age_sketches (room_id, student_count, age_counts)
+VALUES (%s, %s, %s);
+"""
+
+SELECT_AGE_SKETCHES_QUERY = """
+SELECT 
+    s.room_id,
+    r.name as room_name,
+    s.student_count,
+    s.age_counts
+FROM room_age_sketches s
+LEFT JOIN rooms r ON r.id = s.room_id
+ORDER BY s.room_id;
+"""
@@ -0,0 +1,13 @@
+SELECT_VARIANT_CHOICES_QUERY = """
+SELECT query_name, variant, median_ms, student_rows, calibrated_at
+FROM query_variant_choices;
+"""
+
+UPSERT_VARIANT_CHOICE_QUERY = """
+INSERT INTO query_variant_choices (query_name, variant, median_ms, student_rows)
+VALUES (%s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE
+    variant = VALUES(variant),
+    median_ms = VALUES(median_ms),
+    student_rows = VALUES(student_rows);
+"""
@@ -0,0 +1,7 @@
+from .http_server import AnalyticsServer
+from .result_cache import ResultCache
+
+__all__ = [
+    'AnalyticsServer',
+    'ResultCache'
+]
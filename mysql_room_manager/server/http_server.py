@@ -0,0 +1,282 @@
+import asyncio
+import json
+import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from decimal import Decimal
+from functools import partial
+from http import HTTPStatus
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from ..database.conn_manager import ConnManager
+from ..services.analytics_svc import AnalyticsSvc
+from ..interfaces.repo_interface import StudentRepoInterface, RoomRepoInterface
+from ..data.repositories.data_version_repo import DataVersionRepo
+from ..exceptions.exceptions import StudentRoomError
+from .result_cache import ResultCache
+
+MAX_LIMIT = 1000
+MAX_IDS = 1000
+MAX_HEADER_LINES = 100
+KEEP_ALIVE_TIMEOUT = 15.0
+
+
+class HttpError(Exception):
+
+    def __init__(self, status: HTTPStatus, message: str):
+        self.status = status
+        super().__init__(message)
+
+
+class AnalyticsServer:
+    """JSON-over-HTTP front for AnalyticsSvc and the student/room lookups.
+
+    A single asyncio loop handles the sockets; the synchronous services run
+    on a thread pool no larger than the connection pool, so requests beyond
+    that wait in the loop rather than on ``pool_checkout_timeout``. GET
+    results go through a ResultCache, which coalesces identical concurrent
+    requests and is cleared when an import bumps the data version;
+    ``on_invalidate`` runs at the same moment for caches kept elsewhere.
+    """
+
+    def __init__(self, conn_manager: ConnManager, analytics_svc: AnalyticsSvc,
+                 student_repo: StudentRepoInterface, room_repo: RoomRepoInterface,
+                 data_version_repo: Optional[DataVersionRepo] = None,
+                 host: str = '127.0.0.1', port: int = 8080, cache_ttl: float = 300.0,
+                 cache_size: int = 1024, version_check_interval: float = 1.0,
+                 workers: Optional[int] = None, on_invalidate: Optional[Callable[[], None]] = None):
+        self.conn_manager = conn_manager
+        self.analytics_svc = analytics_svc
+        self.student_repo = student_repo
+        self.room_repo = room_repo
+        self.host = host
+        self.port = port
+        self.workers = workers or conn_manager.config.pool_size
+        self.logger = logging.getLogger(__name__)
+
+        self.cache = ResultCache(
+            ttl=cache_ttl,
+            max_entries=cache_size,
+            version_fn=partial(self._call, data_version_repo.get_version) if data_version_repo else None,
+            version_check_interval=version_check_interval,
+            on_invalidate=on_invalidate
+        )
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._started_at = time.monotonic()
+        self._requests = 0
+        self._errors = 0
+
+        # (pattern, handler, cacheable); handlers get the path groups and the query string
+        self.routes: List[Tuple[re.Pattern, Callable, bool]] = [
+            (re.compile(r'/health'), self._health, False),
+            (re.compile(r'/stats'), self._stats, False),
+            (re.compile(r'/analytics/report'), self._report, True),
+            (re.compile(r'/analytics/room-counts'), self._room_counts, True),
+            (re.compile(r'/analytics/youngest-rooms'), self._youngest_rooms, True),
+            (re.compile(r'/analytics/age-gaps'), self._age_gaps, True),
+            (re.compile(r'/analytics/mixed-gender'), self._mixed_gender, True),
+            (re.compile(r'/analytics/age-percentiles'), self._age_percentiles, True),
+            (re.compile(r'/rooms'), self._rooms_by_ids, True),
+            (re.compile(r'/rooms/(\d+)'), self._room, True),
+            (re.compile(r'/rooms/(\d+)/students'), self._room_students, True),
+            (re.compile(r'/students'), self._students_by_ids, True),
+            (re.compile(r'/students/(\d+)'), self._student, True)
+        ]
+
+    def run(self) -> None:
+        asyncio.run(self.serve_forever())
+
+    async def serve_forever(self) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='analytics-http')
+        server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.logger.info(f"Serving analytics on http://{self.host}:{self.port} with {self.workers} workers")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self._executor.shutdown(wait=False)
+
+    async def dispatch(self, path: str, query: Dict[str, List[str]]) -> Any:
+        for pattern, handler, cacheable in self.routes:
+            match = pattern.fullmatch(path)
+            if match is None:
+                continue
+            if not cacheable:
+                return await handler(*match.groups(), query=query)
+            key = (path, tuple(sorted((k, tuple(v)) for k, v in query.items())))
+            return await self.cache.get_or_compute(key, lambda: handler(*match.groups(), query=query))
+        raise HttpError(HTTPStatus.NOT_FOUND, f"No route for {path}")
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), KEEP_ALIVE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if request is None:
+                    break
+
+                method, target, keep_alive = request
+                status, body = await self._respond(method, target)
+                self._write_response(writer, status, body, keep_alive, head_only=method == 'HEAD')
+                await writer.drain()
+                if not keep_alive:
+                    break
+
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except HttpError as e:
+            self._write_response(writer, e.status, self._encode({'error': str(e)}), False)
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple[str, str, bool]]:
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        try:
+            method, target, version = request_line.decode('latin-1').split()
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+
+        headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise HttpError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Too many headers")
+
+        # bodies are ignored, but must be consumed to keep the connection in sync
+        length = int(headers.get('content-length') or 0)
+        if length:
+            await reader.readexactly(length)
+
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+        return method.upper(), target, keep_alive
+
+    async def _respond(self, method: str, target: str) -> Tuple[HTTPStatus, bytes]:
+        self._requests += 1
+        started = time.perf_counter()
+        url = urlsplit(target)
+        try:
+            if method not in ('GET', 'HEAD'):
+                raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} not supported")
+            result = await self.dispatch(url.path.rstrip('/') or '/', parse_qs(url.query))
+            if result is None:
+                raise HttpError(HTTPStatus.NOT_FOUND, f"Nothing found at {url.path}")
+            status, body = HTTPStatus.OK, self._encode(result)
+
+        except HttpError as e:
+            status, body = e.status, self._encode({'error': str(e)})
+        except StudentRoomError as e:
+            self._errors += 1
+            self.logger.error(f"{method} {target} failed: {e}")
+            status, body = HTTPStatus.INTERNAL_SERVER_ERROR, self._encode({'error': str(e)})
+        except Exception as e:
+            self._errors += 1
+            self.logger.exception(f"{method} {target} failed")
+            status, body = HTTPStatus.INTERNAL_SERVER_ERROR, self._encode({'error': 'Internal server error'})
+
+        self.logger.debug(f"{method} {target} → {status.value} in {(time.perf_counter() - started) * 1000:.1f} ms")
+        return status, body
+
+    @staticmethod
+    def _write_response(writer: asyncio.StreamWriter, status: HTTPStatus, body: bytes,
+                        keep_alive: bool, head_only: bool = False) -> None:
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + (b'' if head_only else body))
+
+    @staticmethod
+    def _encode(payload: Any) -> bytes:
+        def default(value):
+            if isinstance(value, (date, datetime)):
+                return value.isoformat()
+            if isinstance(value, Decimal):
+                return float(value)
+            return str(value)
+        return json.dumps(payload, default=default).encode('utf-8')
+
+    async def _call(self, fn: Callable, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, partial(fn, *args))
+
+    @staticmethod
+    def _int_param(query: Dict[str, List[str]], name: str, default: int, maximum: int) -> int:
+        raw = query.get(name, [str(default)])[-1]
+        try:
+            value = int(raw)
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, f"{name} must be an integer, got: {raw}")
+        if not 1 <= value <= maximum:
+            raise HttpError(HTTPStatus.BAD_REQUEST, f"{name} must be between 1 and {maximum}")
+        return value
+
+    @staticmethod
+    def _ids_param(query: Dict[str, List[str]]) -> List[int]:
+        raw = ','.join(query.get('ids', []))
+        try:
+            ids = [int(part) for part in raw.split(',') if part.strip()]
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, f"ids must be comma-separated integers, got: {raw}")
+        if not ids or len(ids) > MAX_IDS:
+            raise HttpError(HTTPStatus.BAD_REQUEST, f"Pass between 1 and {MAX_IDS} ids")
+        return ids
+
+    async def _health(self, query) -> Dict[str, Any]:
+        return {'status': 'ok', 'uptime_sec': round(time.monotonic() - self._started_at, 1)}
+
+    async def _stats(self, query) -> Dict[str, Any]:
+        return {
+            'requests': self._requests,
+            'errors': self._errors,
+            'cache': self.cache.stats(),
+            'pool': self.conn_manager.pool_stats(),
+            'replicas': self.conn_manager.replica_stats()
+        }
+
+    async def _report(self, query):
+        return await self._call(self.analytics_svc.gen_analytics_report)
+
+    async def _room_counts(self, query):
+        return await self._call(self.analytics_svc.get_room_student_counts)
+
+    async def _youngest_rooms(self, query):
+        return await self._call(self.analytics_svc.get_youngest_rooms, self._int_param(query, 'limit', 5, MAX_LIMIT))
+
+    async def _age_gaps(self, query):
+        return await self._call(
+            self.analytics_svc.get_rooms_with_largest_age_gaps, self._int_param(query, 'limit', 5, MAX_LIMIT)
+        )
+
+    async def _mixed_gender(self, query):
+        return await self._call(self.analytics_svc.get_mixed_gender_rooms)
+
+    async def _age_percentiles(self, query):
+        return await self._call(self.analytics_svc.get_age_percentiles)
+
+    async def _room(self, room_id, query):
+        return await self._call(self.room_repo.get_room_by_id, int(room_id))
+
+    async def _rooms_by_ids(self, query):
+        return list((await self._call(self.room_repo.get_rooms_by_ids, self._ids_param(query))).values())
+
+    async def _room_students(self, room_id, query):
+        return await self._call(self.student_repo.get_students_by_room, int(room_id))
+
+    async def _student(self, student_id, query):
+        return await self._call(self.student_repo.get_student_by_id, int(student_id))
+
+    async def _students_by_ids(self, query):
+        return list((await self._call(self.student_repo.get_students_by_ids, self._ids_param(query))).values())
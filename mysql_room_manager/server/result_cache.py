@@ -0,0 +1,114 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from ..utils.lru_cache import LruCache
+
+
+class ResultCache:
+    """Async result cache with request coalescing, dropped whenever the data version changes.
+
+    Concurrent calls for a key that is being computed await the same
+    future instead of running the query again. Entries expire after
+    ``ttl`` seconds; independently, the data version (bumped after every
+    import) is polled at most every ``version_check_interval`` seconds and
+    a change clears the whole cache and calls ``on_invalidate``, so state
+    derived from the old data outside this cache is dropped with it.
+    ``ttl=0`` disables caching but keeps coalescing.
+    """
+
+    def __init__(self, ttl: float = 300.0, max_entries: int = 1024,
+                 version_fn: Optional[Callable[[], Awaitable[Optional[int]]]] = None,
+                 version_check_interval: float = 1.0,
+                 on_invalidate: Optional[Callable[[], None]] = None):
+        self.ttl = ttl
+        self.version_fn = version_fn
+        self.on_invalidate = on_invalidate
+        self.version_check_interval = version_check_interval
+        self.logger = logging.getLogger(__name__)
+        self._entries = LruCache(max_entries)
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._version: Optional[int] = None
+        self._version_checked_at = float('-inf')
+        self._version_check: Optional[asyncio.Future] = None
+        self.coalesced = 0
+        self.computed = 0
+        self.invalidations = 0
+
+    async def get_or_compute(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        await self._check_version()
+
+        if self.ttl > 0:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            # shield: one waiter being cancelled must not cancel the shared computation
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        version = self._version
+        try:
+            result = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # retrieved here so an error nobody else awaited is not logged as unhandled
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            self.computed += 1
+            # a result computed across a version change may predate the new data
+            if self.ttl > 0 and version == self._version:
+                self._entries.put(key, (time.monotonic() + self.ttl, result))
+            return result
+        finally:
+            del self._inflight[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self._entries.stats()
+        return {
+            'entries': stats['size'],
+            'max_entries': stats['max_size'],
+            'hits': stats['hits'],
+            'misses': stats['misses'],
+            'hit_ratio': stats['hit_ratio'],
+            'computed': self.computed,
+            'coalesced': self.coalesced,
+            'inflight': len(self._inflight),
+            'invalidations': self.invalidations,
+            'data_version': self._version
+        }
+
+    async def _check_version(self) -> None:
+        if self.version_fn is None or time.monotonic() - self._version_checked_at < self.version_check_interval:
+            return
+        if self._version_check is None:
+            self._version_check = asyncio.ensure_future(self._refresh_version())
+        await asyncio.shield(self._version_check)
+
+    async def _refresh_version(self) -> None:
+        try:
+            version = await self.version_fn()
+            self._version_checked_at = time.monotonic()
+            if version is not None and version != self._version:
+                if self._version is not None:
+                    self.invalidations += 1
+                    self.logger.info(f"Data version {self._version} → {version}, clearing result cache")
+                    if self.on_invalidate is not None:
+                        self.on_invalidate()
+                self._entries.clear()
+                self._version = version
+        finally:
+            self._version_check = None
@@ -1,9 +1,15 @@
 from .import_svc import ImportSvc
 from .analytics_svc import AnalyticsSvc
 from .opt_svc import OptSvc
+from .sampling_svc import SamplingSvc
+from .calibration_svc import CalibrationSvc
+from .benchmark_svc import BenchmarkSvc
 
 __all__ = [
     'ImportSvc',
     'AnalyticsSvc',
-    'OptSvc'
+    'OptSvc',
+    'SamplingSvc',
+    'CalibrationSvc',
+    'BenchmarkSvc'
 ]
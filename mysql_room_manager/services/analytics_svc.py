@@ -1,15 +1,21 @@
 import logging
-from typing import List, Dict, Any
+import time
+from typing import List, Dict, Any, Iterator, Iterable
 from ..interfaces.repo_interface import AnalyticsRepoInterface
 from ..database.optimizer import Optimizer
+from ..data.repositories.sketch_repo import SketchRepo
+from ..models.sketch import AgeHistogram
+from ..queries.sketch_queries import UNASSIGNED_ROOM_ID
+from ..constants import AGE_PERCENTILES
 from ..exceptions.exceptions import QueryError
 
 class AnalyticsSvc: 
     
     def __init__(self, analytics_repo: AnalyticsRepoInterface,
-                 optimizer: Optimizer = None):
+                 optimizer: Optimizer = None, sketch_repo: SketchRepo = None):
         self.analytics_repo = analytics_repo  
         self.optimizer = optimizer
+        self.sketch_repo = sketch_repo
         self.logger = logging.getLogger(__name__)
     
     def get_room_student_counts(self) -> List[Dict[str, Any]]:
@@ -60,6 +66,67 @@ class AnalyticsSvc:
             self.logger.error(f"Failed to get mixed gender rooms: {e}")
             raise QueryError(f"Analytics query failed: {e}")
     
+    def iter_room_student_counts(self) -> Iterator[Dict[str, Any]]:
+        self.logger.info("Streaming room student counts")
+        return self.analytics_repo.iter_rooms_with_student_count()
+    
+    def iter_youngest_rooms(self, limit: int = 5) -> Iterator[Dict[str, Any]]:
+        self.logger.info(f"Streaming top {limit} youngest rooms")
+        return self.analytics_repo.iter_top_rooms_by_avg_age(limit)
+    
+    def iter_rooms_with_largest_age_gaps(self, limit: int = 5) -> Iterator[Dict[str, Any]]:
+        self.logger.info(f"Streaming top {limit} rooms with largest age gaps")
+        return self.analytics_repo.iter_top_rooms_by_age_diff(limit)
+    
+    def iter_mixed_gender_rooms(self) -> Iterator[Dict[str, Any]]:
+        self.logger.info("Streaming mixed gender rooms")
+        return self.analytics_repo.iter_mixed_gender_rooms()
+    
+    def build_age_sketches(self) -> int:
+        if self.sketch_repo is None:
+            raise QueryError("Age sketches are not configured")
+        return self.sketch_repo.rebuild_age_sketches()
+    
+    def get_age_percentiles(self, percentiles: Iterable[int] = AGE_PERCENTILES) -> Dict[str, Any]:
+        """Per-room and global age percentiles merged from stored sketches.
+
+        Sketches are exact per-year histograms, so figures are exact as of
+        the last sketch rebuild (run after every import).
+        """
+        if self.sketch_repo is None:
+            raise QueryError("Age sketches are not configured")
+        
+        try:
+            self.logger.info("Computing age percentiles from sketches")
+            started = time.perf_counter()
+            percentiles = tuple(percentiles)
+            
+            room_sketches = self.sketch_repo.load_age_sketches()
+            rooms = [
+                {
+                    'room_id': r['room_id'],
+                    'room_name': r['room_name'],
+                    'student_count': r['student_count'],
+                    **r['sketch'].percentiles(percentiles)
+                }
+                for r in room_sketches if r['room_id'] != UNASSIGNED_ROOM_ID
+            ]
+            
+            global_sketch = AgeHistogram.merge_all(r['sketch'] for r in room_sketches)
+            
+            return {
+                'rooms': rooms,
+                'global': {
+                    'student_count': global_sketch.total,
+                    **global_sketch.percentiles(percentiles)
+                },
+                'elapsed_ms': (time.perf_counter() - started) * 1000
+            }
+            
+        except Exception as e:
+            self.logger.error(f"Failed to compute age percentiles: {e}")
+            raise QueryError(f"Analytics query failed: {e}")
+    
     def gen_analytics_report(self) -> Dict[str, Any]:
         try:
             self.logger.info("Generating comprehensive analytics report")
@@ -0,0 +1,198 @@
+import json
+import logging
+import math
+import statistics
+import threading
+import time
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Tuple, Sequence
+
+from ..database.conn_manager import ConnManager
+from ..queries.analytics_queries import ANALYTICS_QUERY_VARIANTS, PERFORMANCE_TEST_QUERIES
+from ..queries.opt_queries import TABLE_ROWS_QUERY, SERVER_VERSION_QUERY
+from ..exceptions.exceptions import QueryError
+from .calibration_svc import CALIBRATION_PARAMS
+
+# one connection per worker; keep well below the server's max_connections
+MAX_CONCURRENCY = 64
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class BenchmarkSvc:
+    """Repeatable latency benchmark over every query in analytics_queries.
+
+    Each concurrency level gets its own pool sized to the level, and every
+    worker holds one connection for the whole run, so pool checkout is not
+    part of the measured latency. Each worker runs ``warmup`` unmeasured
+    executions followed by ``iterations`` measured ones.
+    """
+
+    def __init__(self, conn_manager: ConnManager):
+        self.conn_manager = conn_manager
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def get_suite() -> List[Tuple[str, str, Optional[tuple]]]:
+        suite = [
+            (f"{query_name}/{variant}", query, CALIBRATION_PARAMS.get(query_name))
+            for query_name, variants in ANALYTICS_QUERY_VARIANTS.items()
+            for variant, query in variants.items()
+        ]
+        suite.extend((f"perf/{name}", query, None) for name, query in PERFORMANCE_TEST_QUERIES.items())
+        return suite
+
+    def run(self, iterations: int = 20, warmup: int = 3,
+            concurrency: Sequence[int] = (1,)) -> Dict[str, Any]:
+        levels = sorted(set(concurrency))
+        if not levels or levels[0] < 1 or levels[-1] > MAX_CONCURRENCY:
+            raise ValueError(f"Concurrency levels must be between 1 and {MAX_CONCURRENCY}")
+        if iterations < 1:
+            raise ValueError("Benchmark needs at least one iteration")
+
+        report = {
+            'meta': self._collect_meta(iterations, warmup, levels),
+            'results': []
+        }
+
+        for level in levels:
+            conn_manager = ConnManager(replace(
+                self.conn_manager.config,
+                pool_name=f"benchmark_pool_{level}",
+                pool_size=level,
+                pool_min_size=level
+            ))
+            try:
+                for name, query, params in self.get_suite():
+                    self.logger.info(f"Benchmarking {name} at concurrency {level}")
+                    report['results'].append(
+                        self._run_query(conn_manager, name, query, params, iterations, warmup, level)
+                    )
+                report.setdefault('pool_stats', {})[level] = conn_manager.pool_stats()
+            finally:
+                conn_manager.disconnect()
+
+        return report
+
+    def _run_query(self, conn_manager: ConnManager, name: str, query: str, params: Optional[tuple],
+                   iterations: int, warmup: int, level: int) -> Dict[str, Any]:
+        latencies = []
+        row_counts = []
+        lock = threading.Lock()
+        # the barrier releases all workers after their warmup and marks the start of the measured window
+        measure_start = []
+        start_barrier = threading.Barrier(level, action=lambda: measure_start.append(time.perf_counter()))
+
+        def worker():
+            local_latencies = []
+            rows = 0
+            with ExitStack() as stack:
+                # a worker that cannot check out or warm up must release the others from the barrier
+                try:
+                    conn = stack.enter_context(conn_manager.get_conn())
+                    cursor = conn.cursor()
+                    for _ in range(warmup):
+                        cursor.execute(query, params)
+                        cursor.fetchall()
+                except Exception:
+                    start_barrier.abort()
+                    raise
+                start_barrier.wait()
+                for _ in range(iterations):
+                    started = time.perf_counter()
+                    cursor.execute(query, params)
+                    rows += len(cursor.fetchall())
+                    local_latencies.append((time.perf_counter() - started) * 1000)
+                cursor.close()
+            with lock:
+                latencies.extend(local_latencies)
+                row_counts.append(rows)
+
+        try:
+            with ThreadPoolExecutor(max_workers=level) as executor:
+                futures = [executor.submit(worker) for _ in range(level)]
+            # report the worker that failed, not the ones it released from the barrier
+            errors = [future.exception() for future in futures if future.exception() is not None]
+            errors.sort(key=lambda error: isinstance(error, threading.BrokenBarrierError))
+            if errors:
+                raise errors[0]
+            wall = max(time.perf_counter() - measure_start[0], 1e-9)
+
+        except Exception as e:
+            error_msg = f"Benchmark of {name} failed: {e}"
+            self.logger.error(error_msg)
+            raise QueryError(error_msg, query)
+
+        latencies.sort()
+        total_rows = sum(row_counts)
+        return {
+            'query': name,
+            'concurrency': level,
+            'executions': len(latencies),
+            'rows_per_execution': total_rows // max(len(latencies), 1),
+            'mean_ms': round(statistics.mean(latencies), 3),
+            'p50_ms': round(percentile(latencies, 50), 3),
+            'p95_ms': round(percentile(latencies, 95), 3),
+            'p99_ms': round(percentile(latencies, 99), 3),
+            'throughput_qps': round(len(latencies) / wall, 2),
+            'rows_per_sec': round(total_rows / wall, 1)
+        }
+
+    def _collect_meta(self, iterations: int, warmup: int, levels: List[int]) -> Dict[str, Any]:
+        with self.conn_manager.get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute(SERVER_VERSION_QUERY)
+            server_version = cursor.fetchone()[0]
+            cursor.close()
+
+        return {
+            'started_at': datetime.now(timezone.utc).isoformat(),
+            'server_version': server_version,
+            'database': self.conn_manager.config.database,
+            'table_rows': {
+                row['table_name']: row['table_rows']
+                for row in self.conn_manager.iter_query(TABLE_ROWS_QUERY, (self.conn_manager.config.database,))
+            },
+            'iterations': iterations,
+            'warmup': warmup,
+            'concurrency': levels
+        }
+
+    @staticmethod
+    def save(report: Dict[str, Any], path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, default=str)
+
+    @staticmethod
+    def load(path: str) -> Dict[str, Any]:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    @staticmethod
+    def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Pair results by (query, concurrency) and give the relative change of each metric."""
+        previous = {(r['query'], r['concurrency']): r for r in baseline.get('results', [])}
+        comparison = []
+        for result in current.get('results', []):
+            before = previous.get((result['query'], result['concurrency']))
+            if before is None:
+                continue
+            comparison.append({
+                'query': result['query'],
+                'concurrency': result['concurrency'],
+                **{
+                    f"{metric}_change": round((result[metric] - before[metric]) / before[metric], 4)
+                    if before[metric] else 0.0
+                    for metric in ('p50_ms', 'p95_ms', 'p99_ms', 'throughput_qps')
+                }
+            })
+        return comparison
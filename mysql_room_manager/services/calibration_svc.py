@@ -0,0 +1,75 @@
+import logging
+import statistics
+from typing import Dict, Any, Optional
+
+from ..database.optimizer import Optimizer
+from ..data.repositories.variant_repo import VariantRepo
+from ..interfaces.repo_interface import StudentRepoInterface
+from ..queries.analytics_queries import ANALYTICS_QUERY_VARIANTS
+from ..exceptions.exceptions import QueryError
+
+CALIBRATION_PARAMS = {
+    'top_rooms_by_avg_age': (5,),
+    'top_rooms_by_age_diff': (5,)
+}
+
+
+class CalibrationSvc:
+    """Times every registered variant of each analytics query and stores the fastest."""
+    
+    def __init__(self, optimizer: Optimizer, variant_repo: VariantRepo,
+                 student_repo: StudentRepoInterface, runs: int = 5,
+                 recalibrate_ratio: float = 0.5):
+        self.optimizer = optimizer
+        self.variant_repo = variant_repo
+        self.student_repo = student_repo
+        self.runs = runs
+        self.recalibrate_ratio = recalibrate_ratio
+        self.logger = logging.getLogger(__name__)
+    
+    def calibrate(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            student_rows = self.student_repo.count_students()
+            self.logger.info(f"Calibrating analytics query variants on {student_rows} students")
+            results = {}
+            
+            for query_name, variants in ANALYTICS_QUERY_VARIANTS.items():
+                params = CALIBRATION_PARAMS.get(query_name)
+                timings = {}
+                for variant, query in variants.items():
+                    # Timed on the primary: a replica's load and cache would pick the winner.
+                    with self.optimizer.conn_manager.pin_primary():
+                        latencies = self.optimizer.time_query(query, params, runs=self.runs)
+                    timings[variant] = statistics.median(latencies)
+                    self.logger.debug(f"{query_name}/{variant}: {timings[variant]:.2f} ms")
+                
+                winner = min(timings, key=timings.get)
+                self.variant_repo.save_choice(query_name, winner, timings[winner], student_rows)
+                results[query_name] = {'winner': winner, 'timings_ms': timings}
+            
+            self.logger.info("Query variant calibration completed")
+            return results
+            
+        except Exception as e:
+            self.logger.error(f"Variant calibration failed: {e}")
+            raise QueryError(f"Variant calibration failed: {e}")
+    
+    def needs_recalibration(self, student_rows: Optional[int] = None) -> bool:
+        choices = self.variant_repo.load_choices()
+        if set(choices) != set(ANALYTICS_QUERY_VARIANTS):
+            return True
+        # a stored variant that was renamed or removed since
+        if any(choice['variant'] not in ANALYTICS_QUERY_VARIANTS[name] for name, choice in choices.items()):
+            return True
+        
+        if student_rows is None:
+            student_rows = self.student_repo.count_students()
+        calibrated_rows = min(choice['student_rows'] for choice in choices.values())
+        baseline = max(calibrated_rows, 1)
+        return abs(student_rows - calibrated_rows) / baseline > self.recalibrate_ratio
+    
+    def recalibrate_if_needed(self) -> bool:
+        if not self.needs_recalibration():
+            return False
+        self.calibrate()
+        return True
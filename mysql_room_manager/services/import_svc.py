@@ -1,8 +1,12 @@
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Iterable
 from ..interfaces.repo_interface import StudentRepoInterface, RoomRepoInterface
 from ..data.loaders.loader_factory import LoaderFactory
 from ..database.schema_mgr import SchemaMgr
+from ..data.repositories.sketch_repo import SketchRepo
+from ..data.repositories.data_version_repo import DataVersionRepo
+from .calibration_svc import CalibrationSvc
+from ..utils.batching import chunked
 from ..exceptions.exceptions import ImportError
 
 
@@ -11,10 +15,16 @@ class ImportSvc:
     def __init__(self, 
                  schema_mgr: SchemaMgr,
                  student_repo: StudentRepoInterface,
-                 room_repo: RoomRepoInterface):
+                 room_repo: RoomRepoInterface,
+                 sketch_repo: SketchRepo = None,
+                 calibration_svc: CalibrationSvc = None,
+                 data_version_repo: DataVersionRepo = None):
         self.schema_mgr = schema_mgr  
         self.student_repo = student_repo  
         self.room_repo = room_repo  
+        self.sketch_repo = sketch_repo
+        self.calibration_svc = calibration_svc
+        self.data_version_repo = data_version_repo
         self.logger = logging.getLogger(__name__)
     
     def import_data(self, students_file: str, rooms_file: str, 
@@ -35,23 +45,73 @@ class ImportSvc:
             self.logger.info("Importing students data")  
             students_inserted = self.student_repo.insert_students(students_data)
             
-            self.schema_mgr.create_indexes()
+            return self._finish_import(rooms_inserted, students_inserted)
             
-            results = {
-                'success': True,
-                'rooms_imported': rooms_inserted,
-                'students_imported': students_inserted,
-                'total_records': rooms_inserted + students_inserted
-            }
+        except Exception as e:
+            error_msg = f"Data import failed: {e}"
+            self.logger.error(error_msg)
+            raise ImportError(error_msg)
+    
+    def import_records(self, rooms: Iterable[Dict[str, Any]], students: Iterable[Dict[str, Any]],
+                       batch_size: int = 10000) -> Dict[str, Any]:
+        """Import record streams through the bulk insert path, one batch per transaction."""
+        try:
+            self.logger.info("Starting streamed data import")
+            self._init_schema()
+            
+            rooms_inserted = sum(self.room_repo.insert_rooms(batch) for batch in chunked(rooms, batch_size))
+            
+            students_inserted = 0
+            for batch in chunked(students, batch_size):
+                students_inserted += self.student_repo.insert_students(batch)
+                self.logger.info(f"Imported {students_inserted} students so far")
             
-            self.logger.info(f"Data import completed successfully: {results}")
-            return results
+            return self._finish_import(rooms_inserted, students_inserted)
             
         except Exception as e:
             error_msg = f"Data import failed: {e}"
             self.logger.error(error_msg)
             raise ImportError(error_msg)
     
+    def _finish_import(self, rooms_inserted: int, students_inserted: int) -> Dict[str, Any]:
+        self.schema_mgr.create_indexes()
+        
+        results = {
+            'success': True,
+            'rooms_imported': rooms_inserted,
+            'students_imported': students_inserted,
+            'total_records': rooms_inserted + students_inserted
+        }
+        
+        if self.sketch_repo is not None:
+            self.logger.info("Rebuilding age sketches")
+            results['age_sketches'] = self.sketch_repo.rebuild_age_sketches()
+        
+        if self.calibration_svc is not None:
+            results['recalibrated'] = self._recalibrate_variants()
+        
+        if self.data_version_repo is not None:
+            # last, so caches never pick up a version whose sketches are not rebuilt yet
+            self._bump_data_version()
+        
+        self.logger.info(f"Data import completed successfully: {results}")
+        return results
+    
+    def _recalibrate_variants(self) -> bool:
+        # A stale variant choice only costs speed, so never fail the import.
+        try:
+            return self.calibration_svc.recalibrate_if_needed()
+        except Exception as e:
+            self.logger.warning(f"Query variant recalibration skipped: {e}")
+            return False
+    
+    def _bump_data_version(self) -> None:
+        # Caches then only refresh on their TTL, so never fail the import.
+        try:
+            self.data_version_repo.bump()
+        except Exception as e:
+            self.logger.warning(f"Data version not bumped: {e}")
+    
     def _init_schema(self) -> None:
         try:
             self.logger.info("Initializing db schema")
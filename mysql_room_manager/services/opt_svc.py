@@ -1,30 +1,52 @@
 import logging
-from typing import List, Dict, Any
+import statistics
+from typing import List, Dict, Any, Optional, Tuple, Callable
 from ..database.optimizer import Optimizer
+from ..database.index_advisor import IndexAdvisor
+from ..database.workload_profiler import WorkloadProfiler, RANKINGS
+from ..data.repositories.baseline_repo import BaselineRepo
+from ..data.repositories.analytics_repo import AnalyticsRepo
 from ..queries.analytics_queries import *
+from ..queries.opt_queries import DROP_INDEX_TEMPLATE
+from ..queries.entity_queries import SELECT_STUDENTS_BY_ROOM_QUERY
+from ..queries.schema_queries import STUDENTS_PARTITION_SCHEMES
 
 class OptSvc:
     
-    def __init__(self, optimizer: Optimizer):
+    def __init__(self, optimizer: Optimizer, index_advisor: Optional[IndexAdvisor] = None,
+                 workload_profiler: Optional[WorkloadProfiler] = None,
+                 baseline_repo: Optional[BaselineRepo] = None,
+                 analytics_repo: Optional[AnalyticsRepo] = None):
         self.optimizer = optimizer 
+        self.index_advisor = index_advisor
+        self.workload_profiler = workload_profiler
+        self.baseline_repo = baseline_repo
+        self.analytics_repo = analytics_repo
         self.logger = logging.getLogger(__name__)
     
+    def get_workload(self) -> List[Tuple[str, str, Optional[tuple]]]:
+        """The analytics queries as (name, query, params), in the calibrated variant the app runs."""
+        return [
+            ("Room Student Count", self._get_query('rooms_with_student_count'), None),
+            ("Top Rooms by Average Age", self._get_query('top_rooms_by_avg_age'), (5,)),
+            ("Top Rooms by Age Difference", self._get_query('top_rooms_by_age_diff'), (5,)),
+            ("Mixed Gender Rooms", self._get_query('mixed_gender_rooms'), None)
+        ]
+    
+    def _get_query(self, query_name: str) -> str:
+        if self.analytics_repo is not None:
+            return self.analytics_repo.get_query(query_name)
+        return next(iter(ANALYTICS_QUERY_VARIANTS[query_name].values()))
+    
     def analyze_query_perf(self) -> Dict[str, Any]:
         try:
             self.logger.info("Analyzing query performance")
             
-            queries_to_analyze = [
-                ("Room Student Count", ROOMS_WITH_STUDENT_COUNT_QUERY),
-                ("Top Rooms by Average Age", TOP_ROOMS_BY_AVG_AGE_QUERY.replace("%s", "5")),
-                ("Top Rooms by Age Difference", TOP_ROOMS_BY_AGE_DIFFERENCE_QUERY.replace("%s", "5")),
-                ("Mixed Gender Rooms", MIXED_GENDER_ROOMS_QUERY)
-            ]
-            
             analysis_results = {}
             
-            for query_name, query in queries_to_analyze:
+            for query_name, query, params in self.get_workload():
                 self.logger.debug(f"Analyzing query: {query_name}")
-                analysis = self.optimizer.analyze_query_perf(query)
+                analysis = self.optimizer.analyze_query_perf(query, params)
                 analysis_results[query_name] = analysis
             
             return {
@@ -37,6 +59,164 @@ class OptSvc:
             self.logger.error(f"Query performance analysis failed: {e}")
             return {'error': str(e)}
     
+    def check_partition_pruning(self) -> Dict[str, Any]:
+        """EXPLAIN each analytics query and report which students partitions it touches."""
+        queries_to_check = self.get_workload()
+        
+        # A point query on the partitioning column only exists under the room schemes.
+        scheme = STUDENTS_PARTITION_SCHEMES.get(self.optimizer.conn_manager.config.students_partitioning)
+        if scheme and scheme['column'] == 'room_key':
+            queries_to_check.append((
+                "Students in One Room",
+                SELECT_STUDENTS_BY_ROOM_QUERY + f" AND {scheme['column']} = %s", (1, 1)
+            ))
+        
+        results = {}
+        for query_name, query, params in queries_to_check:
+            self.logger.debug(f"Checking partition pruning: {query_name}")
+            results[query_name] = self.optimizer.check_partition_pruning(query, params)
+        return results
+    
+    def get_index_report(self) -> Dict[str, Any]:
+        report = self.optimizer.get_index_report()
+        if 'error' in report:
+            return report
+        
+        drops = []
+        for index in report['indexes']:
+            if index['redundant_with']:
+                reason = f"prefix of {', '.join(index['redundant_with'])}"
+            elif index['unused']:
+                reason = "never read since server start"
+            else:
+                continue
+            drops.append({
+                'table_name': index['table_name'],
+                'index_name': index['index_name'],
+                'reason': reason,
+                'size_mb': index['size_mb'],
+                'insert_share': index['insert_share'],
+                'ddl': DROP_INDEX_TEMPLATE.format(index_name=index['index_name'], table=index['table_name'])
+            })
+        
+        report['drop_candidates'] = drops
+        self.logger.info(f"Index report: {len(drops)} of {len(report['indexes'])} indexes can be dropped")
+        return report
+    
+    def profile_workload(self, seconds: Optional[float] = None,
+                         action: Optional[Callable[[], Any]] = None) -> Dict[str, Any]:
+        """Diff statement digests around ``action``, or around a ``seconds`` long window."""
+        if self.workload_profiler is None:
+            return {'error': 'Workload profiler is not configured'}
+        
+        try:
+            if action is not None:
+                profile = self.workload_profiler.profile(action)
+            else:
+                profile = self.workload_profiler.profile_window(seconds)
+            
+            profile['rankings'] = {
+                key: self.workload_profiler.rank(profile['digests'], key)
+                for key in RANKINGS
+            }
+            self.logger.info(f"Profiled {len(profile['digests'])} statement digests "
+                             f"over {profile['elapsed_sec']:.1f} s")
+            return profile
+            
+        except Exception as e:
+            self.logger.error(f"Workload profiling failed: {e}")
+            return {'error': str(e)}
+    
+    def capture_baselines(self, runs: int = 3) -> Dict[str, Any]:
+        """Store the current EXPLAIN ANALYZE plan and median actual time of every workload query."""
+        if self.baseline_repo is None:
+            return {'error': 'Baseline storage is not configured'}
+        
+        try:
+            captured = {}
+            for query_name, query, params in self.get_workload():
+                measured = self._measure_plan(query, params, runs)
+                self.baseline_repo.save_baseline(
+                    query_name, measured['fingerprint'], measured['plan_text'],
+                    measured['actual_ms'], measured['actual_rows']
+                )
+                captured[query_name] = measured
+            
+            self.logger.info(f"Captured plan baselines for {len(captured)} queries")
+            return {'baselines': captured}
+            
+        except Exception as e:
+            self.logger.error(f"Baseline capture failed: {e}")
+            return {'error': str(e)}
+    
+    def check_regressions(self, threshold: float = 0.25, runs: int = 3,
+                          min_delta_ms: float = 1.0) -> Dict[str, Any]:
+        """Compare each workload query against its baseline.
+
+        A latency regression needs both a relative slowdown above ``threshold``
+        and an absolute one above ``min_delta_ms``, so sub-millisecond noise
+        on small tables is not reported.
+        """
+        if self.baseline_repo is None:
+            return {'error': 'Baseline storage is not configured'}
+        
+        try:
+            baselines = self.baseline_repo.load_baselines()
+            results = {}
+            for query_name, query, params in self.get_workload():
+                baseline = baselines.get(query_name)
+                measured = self._measure_plan(query, params, runs)
+                if baseline is None:
+                    results[query_name] = {'status': 'no baseline', 'actual_ms': measured['actual_ms']}
+                    continue
+                
+                baseline_ms = float(baseline['actual_ms'])
+                change = (measured['actual_ms'] - baseline_ms) / baseline_ms if baseline_ms else 0.0
+                plan_changed = measured['fingerprint'] != baseline['fingerprint']
+                regressed = change > threshold and measured['actual_ms'] - baseline_ms > min_delta_ms
+                
+                results[query_name] = {
+                    'status': 'regressed' if regressed else ('plan changed' if plan_changed else 'ok'),
+                    'plan_changed': plan_changed,
+                    'regressed': regressed,
+                    'baseline_ms': baseline_ms,
+                    'actual_ms': measured['actual_ms'],
+                    'change': round(change, 4),
+                    'baseline_rows': baseline['actual_rows'],
+                    'actual_rows': measured['actual_rows'],
+                    'baseline_plan': baseline['plan_text'] if plan_changed else None,
+                    'plan_text': measured['plan_text'] if plan_changed else None
+                }
+            
+            regressions = sum(1 for r in results.values() if r.get('regressed') or r.get('plan_changed'))
+            self.logger.info(f"Plan regression check: {regressions} of {len(results)} queries flagged")
+            return {'results': results, 'threshold': threshold}
+            
+        except Exception as e:
+            self.logger.error(f"Regression check failed: {e}")
+            return {'error': str(e)}
+    
+    def _measure_plan(self, query: str, params: Optional[tuple], runs: int) -> Dict[str, Any]:
+        samples = [self.optimizer.explain_analyze(query, params) for _ in range(max(runs, 1))]
+        measured = dict(samples[-1])
+        measured['actual_ms'] = round(statistics.median(s['actual_ms'] for s in samples), 3)
+        return measured
+    
+    def get_slow_queries(self) -> List[Dict[str, Any]]:
+        return self.optimizer.get_slow_queries()
+    
+    def advise_indexes(self) -> Dict[str, Any]:
+        if self.index_advisor is None:
+            return {'error': 'Index advisor is not configured'}
+        
+        try:
+            self.logger.info("Running index advisor on the analytics workload")
+            return self.index_advisor.advise(self.get_workload())
+            
+        except Exception as e:
+            self.logger.error(f"Index advice failed: {e}")
+            return {'error': str(e)}
+    
     def get_opt_recommendations(self) -> List[str]:
         try:
             recommendations = [
@@ -0,0 +1,68 @@
+import logging
+import time
+from typing import Dict, Any
+
+from ..data.repositories.sampled_analytics_repo import SampledAnalyticsRepo
+from ..queries.sampling_queries import SAMPLE_BUCKETS
+from ..exceptions.exceptions import QueryError
+
+REPORT_QUERY_COUNT = 4
+
+
+class SamplingSvc:
+    
+    def __init__(self, sampled_repo: SampledAnalyticsRepo):
+        self.sampled_repo = sampled_repo
+        self.logger = logging.getLogger(__name__)
+    
+    def choose_rate(self, target_ms: float, pilot_rate: float = 0.01) -> float:
+        """Pick the largest sample rate expected to finish a report within ``target_ms``.
+
+        Two pilot runs fit ``latency = fixed + per_rate * rate`` for one
+        query; the report runs ``REPORT_QUERY_COUNT`` of them.
+        """
+        low_rate = self.sampled_repo.effective_rate(pilot_rate)
+        high_rate = self.sampled_repo.effective_rate(pilot_rate * 2)
+        low_ms = self._time_pilot(low_rate)
+        high_ms = self._time_pilot(high_rate)
+        
+        per_rate_ms = (high_ms - low_ms) / (high_rate - low_rate)
+        fixed_ms = max(0.0, low_ms - per_rate_ms * low_rate)
+        budget_ms = target_ms / REPORT_QUERY_COUNT
+        
+        if per_rate_ms <= 0:
+            rate = 1.0
+        else:
+            rate = (budget_ms - fixed_ms) / per_rate_ms
+        
+        rate = self.sampled_repo.effective_rate(min(1.0, max(1 / SAMPLE_BUCKETS, rate)))
+        self.logger.info(
+            f"Chose sample rate {rate:.4f} for {target_ms:.0f} ms target "
+            f"(fixed {fixed_ms:.1f} ms, {per_rate_ms:.1f} ms per unit rate)"
+        )
+        return rate
+    
+    def gen_sampled_report(self, rate: float, limit: int = 5) -> Dict[str, Any]:
+        try:
+            rate = self.sampled_repo.effective_rate(rate)
+            self.logger.info(f"Generating sampled analytics report at rate {rate:.4f}")
+            started = time.perf_counter()
+            
+            report = {
+                'sample_rate': rate,
+                'room_student_counts': self.sampled_repo.get_rooms_with_student_count(rate),
+                'youngest_rooms': self.sampled_repo.get_top_rooms_by_avg_age(rate, limit),
+                'rooms_with_age_gaps': self.sampled_repo.get_top_rooms_by_age_diff(rate, limit),
+                'mixed_gender_rooms': self.sampled_repo.get_mixed_gender_rooms(rate)
+            }
+            report['elapsed_ms'] = (time.perf_counter() - started) * 1000
+            return report
+            
+        except Exception as e:
+            self.logger.error(f"Failed to generate sampled report: {e}")
+            raise QueryError(f"Sampled report generation failed: {e}")
+    
+    def _time_pilot(self, rate: float) -> float:
+        started = time.perf_counter()
+        self.sampled_repo.get_rooms_with_student_count(rate)
+        return (time.perf_counter() - started) * 1000
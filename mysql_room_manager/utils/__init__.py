@@ -13,6 +13,9 @@ from .date_utils import (
     datetime_to_mysql_string
 )
 from .logging_config import setup_logging
+from .batching import chunked, unique_ids
+from .lru_cache import LruCache
+from .lazy_import import lazy_exports
 
 __all__ = [
     'validate_positive_integer',
@@ -23,5 +26,9 @@ __all__ = [
     'parse_iso_datetime',
     'calculate_age', 
     'datetime_to_mysql_string',
-    'setup_logging'
+    'setup_logging',
+    'chunked',
+    'unique_ids',
+    'LruCache',
+    'lazy_exports'
 ]
\ No newline at end of file
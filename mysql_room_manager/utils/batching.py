@@ -0,0 +1,21 @@
+from itertools import islice
+from typing import Iterable, Iterator, List, TypeVar
+
+T = TypeVar('T')
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    if size < 1:
+        raise ValueError(f"Chunk size must be positive, got: {size}")
+    
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def unique_ids(ids: Iterable[int]) -> List[int]:
+    """De-duplicate ids, keeping first-seen order."""
+    return list(dict.fromkeys(ids))
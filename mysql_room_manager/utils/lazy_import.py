@@ -0,0 +1,25 @@
+import importlib
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Module ``__getattr__``/``__dir__`` pair (PEP 562) for re-exports imported on first use.
+
+    ``exports`` maps each name to the module defining it, relative to
+    ``package``. Package ``__init__`` files use this so that importing,
+    say, the CLI does not drag in mysql.connector and every service.
+    """
+    def __getattr__(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        # later lookups find the name directly and skip __getattr__
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
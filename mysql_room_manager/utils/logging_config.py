@@ -1,10 +1,10 @@
 import logging
 import sys
-from typing import Optional
+from typing import Optional, TextIO
 
 
 def setup_logging(level: str = "INFO", log_file: Optional[str] = None, 
-                 format_string: str = None) -> logging.Logger:
+                 format_string: str = None, stream: Optional[TextIO] = None) -> logging.Logger:
     if format_string is None:
         format_string = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     
@@ -13,7 +13,7 @@ def setup_logging(level: str = "INFO", log_file: Optional[str] = None,
     
     logger.handlers.clear()
     
-    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler = logging.StreamHandler(stream or sys.stdout)
     console_formatter = logging.Formatter(format_string)
     console_handler.setFormatter(console_formatter)
     logger.addHandler(console_handler)
@@ -10,6 +10,10 @@ setup(
         "mysql-connector-python>=8.0.33",
         "tabulate>=0.9.0"
     ],
+    extras_require={
+        # mysql.connector.aio, used by the Async* connection manager and repositories
+        'async': ["mysql-connector-python>=9.0"],
+    },
     python_requires=">=3.8",
     entry_points={
         'console_scripts': [